@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the base64 decoding of the dependent variable components.
+
+Compares the peak memory and the time of the single-pass decoder, which decodes
+every component straight into a preallocated (p, N) array, against the decoding of
+the individual components followed by a copy into a new array.
+
+Usage:
+    python benchmarks/decode_base64.py
+"""
+import base64
+import time
+import tracemalloc
+
+import numpy as np
+
+from csdmpy.dependent_variables.decoder import Decoder
+from csdmpy.utils import QuantityType
+
+
+def decode_base64_two_pass(components, dtype, component_len=None):
+    """The decoder before the single-pass implementation."""
+    return np.asarray(
+        [np.frombuffer(base64.b64decode(item), dtype=dtype) for item in components]
+    )
+
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(quantity_type, size, dtype="<f8"):
+    q_type = QuantityType(quantity_type)
+    array = np.random.rand(q_type.p, size).astype(dtype)
+    components = [base64.b64encode(item.tobytes()).decode() for item in array]
+    del array
+
+    methods = [
+        ("two-pass", decode_base64_two_pass),
+        ("single-pass", Decoder.decode_base64),
+    ]
+    print(f"\n{quantity_type}, {size} points per component, {np.dtype(dtype)}")
+    print(f"{'method':>12} {'time (ms)':>10} {'peak (MB)':>10}")
+    for name, method in methods:
+        _, elapsed, peak = measure(method, components, np.dtype(dtype))
+        print(f"{name:>12} {elapsed * 1e3:10.1f} {peak / 2 ** 20:10.1f}")
+
+
+if __name__ == "__main__":
+    run("scalar", 4_000_000)
+    run("vector_3", 2_000_000)
+    run("symmetric_matrix_3", 1_000_000)
+    run("pixel_4", 2_000_000, "<u1")
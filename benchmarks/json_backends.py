@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the JSON backends of the serialization methods.
+
+Compares the time of ``cp.load``, ``cp.loads``, ``CSDM.dumps``, and ``CSDM.save``
+with every installed JSON backend, on a metadata-heavy dataset, with the coordinates
+of a monotonic dimension and a large application metadata, and on a component-heavy
+dataset, with large `none` encoded components.
+
+Usage:
+    python benchmarks/json_backends.py
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import csdmpy as cp
+from csdmpy.json_backend import FACTORIES
+from csdmpy.json_backend import get_json_backend
+
+
+def metadata_heavy():
+    dimensions = [
+        cp.as_dimension(np.arange(2_000) ** 1.5),
+        cp.LabeledDimension(labels=[f"label {i}" for i in range(5)]),
+    ]
+    data = cp.CSDM(
+        dimensions=dimensions,
+        dependent_variables=[cp.as_dependent_variable(np.zeros(10_000))],
+    )
+    data.y[0].encoding = "base64"
+    data.application = {
+        "com.example": {f"key {i}": {"value": i, "name": str(i)} for i in range(50_000)}
+    }
+    return data
+
+
+def component_heavy():
+    data = cp.as_csdm(np.random.rand(2_000_000))
+    data.y[0].encoding = "none"
+    return data
+
+
+def measure(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def run(name, data):
+    backends = []
+    for backend in FACTORIES:
+        try:
+            get_json_backend(backend)
+            backends.append(backend)
+        except ImportError:
+            print(f"{backend} is not installed.")
+
+    print(f"\n{name}")
+    print(
+        f"{'backend':>8} {'save (ms)':>10} {'load (ms)':>10} {'dumps (ms)':>11} "
+        f"{'loads (ms)':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in backends:
+            filename = os.path.join(directory, f"{backend}.csdf")
+            _, save = measure(data.save, filename, json_backend=backend)
+            _, load = measure(
+                cp.load, filename, application=True, json_backend=backend
+            )
+            string, dumps = measure(data.dumps, json_backend=backend)
+            _, loads = measure(cp.loads, string, json_backend=backend)
+            print(
+                f"{backend:>8} {save * 1e3:10.1f} {load * 1e3:10.1f} "
+                f"{dumps * 1e3:11.1f} {loads * 1e3:11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    run("metadata-heavy", metadata_heavy())
+    run("component-heavy", component_heavy())
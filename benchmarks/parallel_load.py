@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the loading of datasets with many dependent variables.
+
+Saves datasets with an increasing number of dependent variables over shared
+dimensions, and compares the time of `cp.load` with the components decoded in the
+calling thread against a pool of `workers` threads.
+
+Usage:
+    python benchmarks/parallel_load.py
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import csdmpy as cp
+
+
+def make_dataset(count, shape):
+    data = cp.new()
+    for size in shape:
+        data.add_dimension(cp.Dimension(type="linear", count=size, increment="1"))
+    for _ in range(count):
+        components = np.random.rand(int(np.prod(shape))).astype(np.float32)
+        data.add_dependent_variable(
+            type="internal",
+            quantity_type="scalar",
+            numeric_type="float32",
+            components=components,
+        )
+    return data
+
+
+def measure(filename, workers, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cp.load(filename, workers=workers)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(encoding, counts, shape, workers=(None, 2, 4, 8)):
+    extension = ".csdfe" if encoding == "raw" else ".csdf"
+    print(f"\n{encoding} encoding, {shape} points per dependent variable")
+    print(f"{'variables':>10}" + "".join(f"{f'workers={n}':>12}" for n in workers))
+    with tempfile.TemporaryDirectory() as folder:
+        for count in counts:
+            data = make_dataset(count, shape)
+            for variable in data.dependent_variables:
+                variable.encoding = encoding
+            filename = os.path.join(folder, f"{count}{extension}")
+            data.save(filename)
+            times = [measure(filename, n) for n in workers]
+            print(f"{count:>10}" + "".join(f"{t * 1e3:12.1f}" for t in times))
+
+
+if __name__ == "__main__":
+    counts = [1, 4, 16, 32]
+    run("base64", counts, (512, 1024))
+    run("none", counts, (256, 256))
+    run("raw", counts, (512, 1024))
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the serialization of the sparse sampled dependent variables.
+
+Compares the file size and the time of saving and loading a 2D dataset, sparsely
+sampled along both dimensions, written as sparse, with the sampled values and the
+grid vertexes only, against the same dataset written as dense.
+
+Usage:
+    python benchmarks/sparse_save.py
+"""
+import base64
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import csdmpy as cp
+
+
+def sparse_dataset(shape, fraction, encoding):
+    """Return a 2D{2} dataset with a `fraction` of the grid vertexes sampled."""
+    size = shape[0] * shape[1]
+    count = int(size * fraction)
+    flat = np.sort(np.random.choice(size, count, replace=False))
+    vertexes = np.stack(np.unravel_index(flat, shape), axis=-1).astype("<u4")
+    vertexes = base64.b64encode(vertexes).decode()
+    components = np.random.rand(2, count).astype("<c8")
+    csdm = cp.parse_dict(
+        {
+            "csdm": {
+                "version": "1.0",
+                "dimensions": [
+                    {"type": "linear", "count": n, "increment": "1"} for n in shape
+                ],
+                "dependent_variables": [
+                    {
+                        "type": "internal",
+                        "numeric_type": "complex64",
+                        "quantity_type": "vector_2",
+                        "components": [components[0], components[1]],
+                        "sparse_sampling": {
+                            "dimension_indexes": [0, 1],
+                            "sparse_grid_vertexes": vertexes,
+                            "encoding": "base64",
+                            "unsigned_integer_type": "uint32",
+                        },
+                    }
+                ],
+            }
+        }
+    )
+    csdm.y[0].encoding = encoding
+    return csdm
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def file_size(filename):
+    size = os.path.getsize(filename)
+    directory = os.path.dirname(filename)
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    for item in os.listdir(directory):
+        if item.startswith(stem) and item.endswith(".dat"):
+            size += os.path.getsize(os.path.join(directory, item))
+    return size
+
+
+def run(shape, fraction, encoding, extension):
+    sparse = sparse_dataset(shape, fraction, encoding)
+    dense = sparse.copy()
+    dense.y[0].subtype._components = dense.y[0].components.todense()
+
+    print(f"\n{shape} grid, {fraction:.0%} sampled, {encoding}, {extension}")
+    print(f"{'method':>8} {'save (ms)':>10} {'load (ms)':>10} {'size (MB)':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, csdm in [("dense", dense), ("sparse", sparse)]:
+            filename = os.path.join(directory, name + extension)
+            _, save = measure(csdm.save, filename)
+            _, load = measure(cp.load, filename)
+            size = file_size(filename) / 2 ** 20
+            print(f"{name:>8} {save * 1e3:10.1f} {load * 1e3:10.1f} {size:10.2f}")
+
+
+if __name__ == "__main__":
+    run((512, 512), 0.05, "base64", ".csdf")
+    run((512, 512), 0.05, "raw", ".csdfe")
+    run((512, 512), 0.05, "raw", ".csdfb")
+    run((128, 128), 0.05, "none", ".csdf")
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the validation of the CSDM documents.
+
+Compares the time of the single-pass validation of a parsed document, with the
+``validate_document`` method, against the time of parsing the document, and the time
+of ``cp.validate_file`` against ``cp.load`` and ``cp.load_header``, for a dataset
+with many dependent variables.
+
+Usage:
+    python benchmarks/validation.py
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import csdmpy as cp
+from csdmpy.schema import validate_document
+
+
+def dataset(count):
+    dimensions = [cp.LinearDimension(count=256, increment="1")]
+    dependent_variables = [
+        cp.as_dependent_variable(np.random.rand(256), name=f"{i}") for i in range(count)
+    ]
+    return cp.CSDM(dimensions=dimensions, dependent_variables=dependent_variables)
+
+
+def measure(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def run(count):
+    data = dataset(count)
+    print(f"\n{count} dependent variables")
+    document = data.dict()
+    for name, function in [
+        ("validate_document", validate_document),
+        ("parse_dict", cp.parse_dict),
+    ]:
+        print(f"{name:>17} {measure(function, document) * 1e3:8.2f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "data.csdf")
+        data.save(filename)
+        for name, function in [
+            ("validate_file", cp.validate_file),
+            ("load_header", cp.load_header),
+            ("load", cp.load),
+        ]:
+            print(f"{name:>17} {measure(function, filename) * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    run(100)
+    run(1000)
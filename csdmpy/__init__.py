@@ -3,11 +3,16 @@
 from __future__ import division
 from __future__ import print_function
 
-import json
+import asyncio
+from functools import partial
 from urllib.parse import urlparse
 
 import numpy as np
 
+from .batch import load_many  # lgtm [py/import-own-module] # NOQA
+from .batch import save_many  # lgtm [py/import-own-module] # NOQA
+from . import catalog  # lgtm [py/import-own-module] # NOQA
+from . import container  # lgtm [py/import-own-module] # NOQA
 from .csdm import as_dependent_variable  # lgtm [py/import-own-module] # NOQA
 from .csdm import as_dimension  # lgtm [py/import-own-module] # NOQA
 from .csdm import CSDM  # lgtm [py/import-own-module] # NOQA
@@ -17,13 +22,22 @@ from .csdm import LabeledDimension  # lgtm [py/import-own-module] # NOQA
 from .csdm import LinearDimension  # lgtm [py/import-own-module] # NOQA
 from .csdm import MonotonicDimension  # lgtm [py/import-own-module] # NOQA
 from .dependent_variables import download  # lgtm [py/import-own-module] # NOQA
+from .dependent_variables.integrity import check_verify  # lgtm [py/import-own-module] # NOQA
+from . import streaming  # lgtm [py/import-own-module] # NOQA
 from .helper_functions import _preview  # lgtm [py/import-own-module] # NOQA
+from .json_backend import get_json_backend  # lgtm [py/import-own-module] # NOQA
+from .json_backend import register_json_backend  # lgtm [py/import-own-module] # NOQA
+from .json_backend import set_json_backend  # lgtm [py/import-own-module] # NOQA
 from .numpy_wrapper import apodize  # lgtm [py/import-own-module] # NOQA
+from .schema import validate_document  # lgtm [py/import-own-module] # NOQA
+from . import sources  # lgtm [py/import-own-module] # NOQA
 from .tests import *  # lgtm [py/import-own-module] # NOQA
 from .units import ScalarQuantity  # lgtm [py/import-own-module] # NOQA
 from .units import string_to_quantity  # lgtm [py/import-own-module] # NOQA
+from .utils import parallel_map  # lgtm [py/import-own-module] # NOQA
 from .utils import QuantityType  # lgtm [py/import-own-module] # NOQA
 from .utils import validate  # lgtm [py/import-own-module] # NOQA
+from .writer import CSDMWriter  # lgtm [py/import-own-module] # NOQA
 
 __author__ = "Deepansh J. Srivastava"
 __email__ = "srivastava.89@osu.edu"
@@ -37,71 +51,72 @@ __version__ = "0.3.5"
 __all__ = [
     "parse_dict",
     "load",
+    "load_header",
+    "validate_file",
     "loads",
+    "load_many",
+    "save_many",
+    "load_async",
+    "load_many_async",
+    "CSDMWriter",
     "new",
     "as_csdm",
+    "empty",
     "as_dependent_variable",
     "as_dimension",
     "plot",
+    "set_json_backend",
+    "register_json_backend",
 ]
 
 
-def _import_json(filename, verbose=False):
+def _import_json(
+    filename,
+    verbose=False,
+    stream=True,
+    components=True,
+    workers=None,
+    mmap=False,
+    json_backend=None,
+):
     res = urlparse(filename)
     if res[0] not in ["file", ""]:
-        filename = download.download_file_from_url(filename, verbose)
-    with open(filename, "rb") as f:
-        content = f.read()
-        return json.loads(str(content, encoding="UTF-8"))
-
-
-def _check_csdm_root_key_value(dictionary):
-    """Check the root level key and value type of the csdm object"""
-    key_list_root = dictionary.keys()
-    if "CSDM" in key_list_root:
-        raise KeyError(
-            "'CSDM' is not a valid keyword for the CSD model. Did you mean 'csdm'?"
-        )
-
-    if "csdm" not in key_list_root:
-        raise KeyError("Missing a required `csdm` key from the data model.")
-
-    # inside csdm object
-    optional_keys = [
-        "read_only",
-        "timestamp",
-        "geographic_coordinate",
-        "application",
-        "tags",
-        "description",
-    ]
-    required_keys = ["version"]
-    all_keys = optional_keys + required_keys
-
-    key_list_csdm = list(dictionary["csdm"].keys())
-    key_list_csdm_lower_case = [item.lower() for item in key_list_csdm]
+        # the cached file is read before it may be evicted.
+        with download.cached_file(filename, verbose) as local:
+            return _read_file(local, stream, components, workers, mmap, json_backend)
+    return _read_file(filename, stream, components, workers, mmap, json_backend)
 
-    for i, item in enumerate(key_list_csdm):
-        if item not in all_keys and key_list_csdm_lower_case[i] in all_keys:
-            raise KeyError(
-                f"{item} is an invalid key for the CSDM object. "
-                f"Did you mean '{key_list_csdm_lower_case[i]}'?"
-            )
-
-    for item in required_keys:
-        if item not in key_list_csdm:
-            raise KeyError(f"Missing a required `{item}` key from the CSDM object.")
 
-    _version = dictionary["csdm"]["version"]
-    validate(_version, "version", str)
+def _read_file(filename, stream, components, workers, mmap, json_backend):
+    if container.is_container_file(filename):
+        return container.load_container(filename, components, mmap)
+    if stream:
+        return streaming.load_json(filename, components, workers, json_backend)
+    with open(filename, "rb") as f:
+        content = f.read()
+        return get_json_backend(json_backend).loads(str(content, encoding="UTF-8"))
 
 
-def parse_dict(dictionary):
+def parse_dict(
+    dictionary, mmap=False, lazy=False, components=True, workers=None, verify="none"
+):
     """Parse a CSDM compliant python dictionary and return a CSDM object.
 
     Args:
         dictionary: A CSDM compliant python dictionary.
+        mmap (bool): If true, the local external components files are memory-mapped
+                instead of being read into memory.
+        lazy (bool): If true, the components of the dependent variables are decoded
+                on first access.
+        components (bool): If false, the components of the dependent variables are
+                neither decoded nor stored.
+        workers (int): The number of threads used for decoding and reshaping the
+                components of the dependent variables. Default is None, that is,
+                the components are decoded in the calling thread.
+        verify (str): The verification of the external components files, one of
+                `none`, `size`, or `full`. See the ``cp.load`` method.
     """
+    check_verify(verify)
     optional_keys = [
         "read_only",
         "timestamp",
@@ -111,7 +126,9 @@ def parse_dict(dictionary):
         "description",
     ]
 
-    _check_csdm_root_key_value(dictionary)
+    # the document is checked in a single pass, and the objects are not checked
+    # again on instantiation.
+    validate_document(dictionary)
 
     _version = dictionary["csdm"]["version"]
 
@@ -123,17 +140,32 @@ def parse_dict(dictionary):
 
     keys = dictionary["csdm"].keys()
     if "timestamp" in keys:
-        _timestamp = dictionary["csdm"]["timestamp"]
-        validate(_timestamp, "timestamp", str)
-        csdm._timestamp = _timestamp
+        csdm._timestamp = dictionary["csdm"]["timestamp"]
 
     if "dimensions" in keys:
         for dim in dictionary["csdm"]["dimensions"]:
-            csdm.add_dimension(dim)
+            csdm.add_dimension(Dimension._from_validated(dim))
 
     if "dependent_variables" in keys:
+        # the metadata is parsed in order, while the decoding of the components is
+        # deferred and run on the pool of workers.
+        deferred = lazy or workers not in [None, 1]
         for dat in dictionary["csdm"]["dependent_variables"]:
-            csdm.add_dependent_variable(dat)
+            dependent_variable = DependentVariable._from_validated(
+                dat,
+                filename=csdm.filename,
+                mmap=mmap,
+                lazy=deferred,
+                load_components=components,
+                verify=verify,
+            )
+            # as in `add_dependent_variable`, the components are serialized as
+            # internal base64 encoded components by default.
+            dependent_variable.encoding = "base64"
+            dependent_variable.type = "internal"
+            csdm.add_dependent_variable(dependent_variable)
+        if not lazy and components:
+            parallel_map(_materialize, csdm.dependent_variables, workers)
 
     for key in optional_keys:
         if key in keys:
@@ -142,55 +174,350 @@ def parse_dict(dictionary):
     return csdm
 
 
-def load(filename=None, application=False, verbose=False):
+def _materialize(dependent_variable):
+    """Decode the deferred components of the dependent variable, if any."""
+    dependent_variable.subtype._components
+
+
+def load(
+    filename=None,
+    application=False,
+    verbose=False,
+    mmap=False,
+    lazy=False,
+    components=True,
+    workers=None,
+    verify="none",
+    json_backend=None,
+    member=None,
+):
     r"""
-    Loads a .csdf/.csdfe file and returns an instance of the :ref:`csdm_api` class.
+    Loads a .csdf/.csdfe/.csdfb file and returns an instance of the :ref:`csdm_api`
+    class.
 
-    The file must be a JSON serialization of the CSD Model.
+    The file must be a JSON serialization of the CSD Model, or a `.csdfb` single-file
+    binary container, detected from the extension or the leading magic bytes. The
+    components of a `.csdfb` file are numpy arrays over the read file, or over the
+    memory-map of the file with the `mmap` option, without copies.
+
+    The file is also loaded from memory, without temporary files, from a bytes-like
+    object, a file-like object, or a zip archive. For a file in a zip archive, the
+    relative `components_url` of the external dependent variables refer to the
+    sibling members of the archive. The stored, that is, uncompressed, members of an
+    in-memory archive are read as views of the archive, and the stored members of an
+    archive file are memory-mapped with the `mmap` option, without copies.
 
     Example:
         >>> data1 = cp.load('local_address/file.csdf') # doctest: +SKIP
         >>> data2 = cp.load('url_address/file.csdf') # doctest: +SKIP
+        >>> data3 = cp.load(payload_bytes) # doctest: +SKIP
+        >>> data4 = cp.load('bundle.zip', member='file.csdfe') # doctest: +SKIP
 
     Args:
-        filename (str): A local or a remote address to the `.csdf or `.csdfe` file.
+        filename: A local or a remote address to the `.csdf or `.csdfe` file, the
+                local address of a `.zip` file, a bytes-like object or a file-like
+                object with the content of the file or of a zip archive, or a
+                zipfile.ZipFile instance.
         application (bool): If true, the application metadata from application that
                 last serialized the file will be imported. Default is False.
         verbose (bool): If the filename is a URL, this option will show the progress
                 bar for the file download status, when True.
+        mmap (bool): If true, the components of the external dependent variables
+                stored in local `.dat` files, or of the local `.csdfb` files, are
+                memory-mapped as read-only numpy arrays. The data is only read from
+                the disk when accessed. Default is False.
+        lazy (bool): If true, the encoded components of the dependent variables are
+                kept as is and only decoded when the `components` attribute of the
+                respective dependent variable is first accessed. Default is False.
+        components (bool): If false, only the metadata of the dataset is loaded. The
+                components of the dependent variables are neither decoded nor
+                stored, and the external components files are not read. Default is
+                True.
+        workers (int): The number of threads used for decoding the components of
+                the dependent variables, one dependent variable per thread. The order
+                of the dependent variables is preserved. Default is None, that is,
+                the components are decoded in the calling thread.
+        verify (str): The verification of the external components files against
+                the byte length and the SHA-256 checksum recorded in the file on
+                save. With `size`, the length of the file is compared. With `full`,
+                the checksum is also computed while the file is read or mapped.
+                The files without a recorded checksum are not verified. When
+                `lazy` is true, the size of the file is verified before the
+                sections of the components are read, while with `full`, the
+                complete file is read and verified on the first access. The
+                allowed values are `none`, `size`, and `full`. Default is `none`.
+        json_backend (str): The JSON library parsing the file, `auto`, `json`,
+                `orjson`, `ujson`, or a backend registered with the
+                ``cp.register_json_backend`` method. Default is None, that is, the
+                backend set with the ``cp.set_json_backend`` method.
+        member (str): The name of the file in the zip archive. Default is None, that
+                is, the only `.csdf`, `.csdfe`, or `.csdfb` member of the archive.
 
     Returns:
         A CSDM instance.
     """
     if filename is None:
         raise Exception("Missing the value for the required `filename` attribute.")
+    check_verify(verify)
 
-    dictionary = _import_json(filename, verbose)
-    dictionary["filename"] = filename
-    csdm_object = parse_dict(dictionary)
+    # the encoded components are kept as is for lazy decoding.
+    if sources.is_source(filename):
+        dictionary = sources.load_source(
+            filename, member, not lazy, components, workers, mmap, json_backend
+        )
+    else:
+        dictionary = _import_json(
+            filename, verbose, not lazy, components, workers, mmap, json_backend
+        )
+        dictionary["filename"] = filename
+    try:
+        csdm_object = parse_dict(
+            dictionary,
+            mmap=mmap,
+            lazy=lazy,
+            components=components,
+            workers=workers,
+            verify=verify,
+        )
+    finally:
+        # the archive opened by `load_source` is closed, once the components are
+        # read, unless the components are read on demand.
+        if not lazy:
+            sources.close_archive(filename, dictionary["filename"])
 
     if application is False:
-        csdm_object.application = {}
-        for dim in csdm_object.dimensions:
-            dim.application = {}
-            if hasattr(dim, "reciprocal") and dim.type != "label":
-                dim.reciprocal.application = {}
-        for dim in csdm_object.dependent_variables:
-            dim.application = {}
-            # if hasattr(dim., 'dimension indexes'):
-            #     dim.reciprocal.application = {}
+        _remove_application_metadata(csdm_object)
     # csdm_objects = []
     # for file_ in csdm_files:
     #     csdm_objects.append(_load(file_, application=application))
     return csdm_object
 
 
-def loads(string):
+def _remove_application_metadata(csdm_object):
+    csdm_object.application = {}
+    for dim in csdm_object.dimensions:
+        dim.application = {}
+        if hasattr(dim, "reciprocal") and dim.type != "label":
+            dim.reciprocal.application = {}
+    for dim in csdm_object.dependent_variables:
+        dim.application = {}
+        # if hasattr(dim., 'dimension indexes'):
+        #     dim.reciprocal.application = {}
+
+
+def load_header(filename=None, application=False, verbose=False):
+    r"""
+    Loads the metadata of a .csdf/.csdfe file without the components.
+
+    The returned :ref:`csdm_api` instance holds the dimensions and the metadata of
+    the dependent variables, such as the `numeric_type`, `quantity_type`, `unit`, and
+    `shape`, however, accessing the `components` of any dependent variable raises a
+    ValueError. The method is an alias of ``cp.load(filename, components=False)``.
+
+    Example:
+        >>> header = cp.load_header('local_address/file.csdf') # doctest: +SKIP
+        >>> header.dependent_variables[0].shape # doctest: +SKIP
+        (1, 10)
+
+    Args:
+        filename (str): A local or a remote address to the `.csdf or `.csdfe` file.
+        application (bool): If true, the application metadata from application that
+                last serialized the file will be imported. Default is False.
+        verbose (bool): If the filename is a URL, this option will show the progress
+                bar for the file download status, when True.
+
+    Returns:
+        A CSDM instance.
+    """
+    return load(filename, application=application, verbose=verbose, components=False)
+
+
+def validate_file(filename=None, verbose=False, json_backend=None, member=None):
+    r"""
+    Validates the metadata of a .csdf/.csdfe/.csdfb file against the CSD model.
+
+    The file is streamed and checked in a single pass, with the same errors as the
+    ``cp.load`` method. The components arrays are skipped, and neither the
+    components nor the external components files are read, and no CSDM object is
+    created.
+
+    Example:
+        >>> cp.validate_file('local_address/file.csdf') # doctest: +SKIP
+
+    Args:
+        filename: A local or a remote address to the file, or an in-memory source,
+                see the ``cp.load`` method.
+        verbose (bool): If the filename is a URL, this option will show the progress
+                bar for the file download status, when True.
+        json_backend (str): The JSON library parsing the file. See the ``cp.load``
+                method.
+        member (str): The name of the file in the zip archive. See the ``cp.load``
+                method.
+
+    Raises:
+        KeyError: When a required key is missing or a key is invalid.
+        ValueError: When the value of an enumerated key is invalid.
+        TypeError: When the value of a key is of an invalid type.
+    """
+    if filename is None:
+        raise Exception("Missing the value for the required `filename` attribute.")
+    if sources.is_source(filename):
+        dictionary = sources.load_source(
+            filename, member, components=False, json_backend=json_backend
+        )
+        sources.close_archive(filename, dictionary["filename"])
+    else:
+        dictionary = _import_json(
+            filename, verbose, components=False, json_backend=json_backend
+        )
+    validate_document(dictionary)
+
+
+async def load_async(filename, application=False, stats=None, client=None, **kwargs):
+    r"""
+    Loads a .csdf/.csdfe file asynchronously and returns an instance of the
+    :ref:`csdm_api` class.
+
+    The file and the external components files of the `.csdfe` file are fetched
+    concurrently over a shared pool of HTTP connections. The relative
+    `components_url` of the external dependent variables are resolved relative to
+    the url of the file. Unlike ``cp.load``, the remote files are not cached. The
+    connections are pooled across the calls by a shared
+    ``csdmpy.download.AsyncClient``, unless a client is provided.
+
+    Example:
+        >>> data = await cp.load_async('url_address/file.csdfe') # doctest: +SKIP
+
+    Args:
+        filename (str): A local or a remote address to the `.csdf or `.csdfe` file.
+        application (bool): If true, the application metadata from application that
+                last serialized the file will be imported. Default is False.
+        stats (TransferStats): If provided, the byte and latency counters of every
+                transfer are recorded in the `csdmpy.download.TransferStats`
+                instance.
+        client (AsyncClient): The client fetching the files. Default is None, that
+                is, the client shared by the calls, see
+                ``csdmpy.download.get_default_client``.
+        kwargs: The `lazy`, `components`, and `workers` keyword arguments of the
+                ``cp.load`` method.
+
+    Returns:
+        A CSDM instance.
+    """
+    if client is None:
+        # the transfers are not accumulated in the stats of the shared client.
+        client = download.get_default_client()
+        stats = download.TransferStats() if stats is None else stats
+    return await _load_async(client, filename, application, stats, **kwargs)
+
+
+async def load_many_async(
+    filenames, concurrency=8, application=False, stats=None, client=None, **kwargs
+):
+    r"""
+    Loads a list of .csdf/.csdfe files asynchronously.
+
+    The files and their external components files are fetched over a shared pool of
+    HTTP connections, with up to `concurrency` transfers at a time. Errors are
+    reported per file. When a file fails to load, the respective item of the returned
+    list is the raised exception instead of a CSDM object.
+
+    Example:
+        >>> urls = ['url_address/file1.csdf', 'url_address/file2.csdfe']
+        >>> datasets = await cp.load_many_async(urls, concurrency=4) # doctest: +SKIP
+
+    Args:
+        filenames: A list of local or remote addresses to the files.
+        concurrency (int): The maximum number of concurrent transfers. Default is 8.
+        application (bool): If true, the application metadata from application that
+                last serialized the file will be imported. Default is False.
+        stats (TransferStats): If provided, the byte and latency counters of every
+                transfer are recorded in the `csdmpy.download.TransferStats`
+                instance.
+        client (AsyncClient): The client fetching the files. Default is None, that
+                is, a new client with `concurrency` connections, closed on return.
+                The `concurrency` of a provided client is its own.
+        kwargs: The `lazy`, `components`, and `workers` keyword arguments of the
+                ``cp.load`` method.
+
+    Returns:
+        A list of CSDM objects or exceptions, in the order of the filenames.
+    """
+    if client is not None:
+        return await _load_many_async(client, filenames, application, stats, **kwargs)
+    async with download.AsyncClient(concurrency) as client:
+        return await _load_many_async(client, filenames, application, stats, **kwargs)
+
+
+async def _load_many_async(client, filenames, application, stats, **kwargs):
+    tasks = [
+        _load_async(client, filename, application, stats, **kwargs)
+        for filename in filenames
+    ]
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _load_async(
+    client,
+    filename,
+    application=False,
+    stats=None,
+    lazy=False,
+    components=True,
+    workers=None,
+):
+    loop = asyncio.get_running_loop()
+    content = await client.fetch(filename, stats)
+    dictionary = await loop.run_in_executor(
+        None, _parse_json, content, not lazy, components, workers
+    )
+
+    # the external components are fetched concurrently and decoded as internal.
+    variables = dictionary.get("csdm", {}).get("dependent_variables", [])
+    external = [
+        item
+        for item in variables
+        if item.get("type") == "external" and "components_url" in item
+    ]
+    if components and external != []:
+        urls = [
+            download.resolve_url(item["components_url"], filename) for item in external
+        ]
+        contents = await asyncio.gather(*[client.fetch(url, stats) for url in urls])
+        for item, data in zip(external, contents):
+            del item["components_url"]
+            item.update(type="internal", encoding="raw", components=data)
+
+    dictionary["filename"] = filename
+    csdm_object = await loop.run_in_executor(
+        None,
+        partial(
+            parse_dict, dictionary, lazy=lazy, components=components, workers=workers
+        ),
+    )
+    if application is False:
+        _remove_application_metadata(csdm_object)
+    return csdm_object
+
+
+def _parse_json(content, stream=True, components=True, workers=None):
+    if container.is_container(content):
+        return container.parse_container(content, components)
+    if stream:
+        return streaming.parse_json(content, components, workers)
+    return get_json_backend().loads(str(content, encoding="UTF-8"))
+
+
+def loads(string, workers=None, json_backend=None):
     """
     Loads a JSON serialized string as a CSDM object.
 
     Args:
         string: A JSON serialized CSDM string.
+        workers (int): The number of threads used for decoding the components of
+                the dependent variables. Default is None.
+        json_backend (str): The JSON library parsing the string. See the
+                ``cp.load`` method. Default is None.
     Returns:
         A CSDM object.
 
@@ -207,8 +534,8 @@ def loads(string):
           }
         }
     """
-    dictionary = json.loads(string)
-    csdm_object = parse_dict(dictionary)
+    dictionary = get_json_backend(json_backend).loads(string)
+    csdm_object = parse_dict(dictionary, workers=workers)
     return csdm_object
 
 
@@ -290,6 +617,62 @@ def as_csdm(array, unit="", quantity_type="scalar"):
     return csdm
 
 
+def empty(dimensions, dtype="float64", quantity_type="scalar", backing=None, **kwargs):
+    r"""
+    Create a CSDM object with one dependent variable of uninitialized components over
+    the given dimensions.
+
+    When `backing` is given, the components are preallocated as a writable numpy
+    memmap of the backing file, such that the dataset may be larger than the
+    memory. The components are then filled slice by slice through the indexing of
+    the CSDM object, and only the pages of the written slices are held in memory.
+    The encoding of the dependent variable is set to `raw`, and saving the CSDM
+    object as a .csdfe file refers to the backing file as the external components
+    file, without copying the components.
+
+    Example:
+        >>> dims = [cp.LinearDimension(count=n, increment="1") for n in (64, 32, 16)]
+        >>> data = cp.empty(dims, dtype="float32", backing="sim.dat")
+        >>> data[:, :, 0] = 1.0
+        >>> data.save("sim.csdfe")
+
+    .. testcleanup::
+        import os
+        os.remove('sim.csdfe')
+        os.remove('sim.dat')
+
+    Args:
+        dimensions: A list of Dimension objects or python dictionaries.
+        dtype: The numpy dtype of the components. Default is float64.
+        quantity_type (str): The quantity type of the dependent variable. Default is
+                `scalar`.
+        backing (str): The local address of the backing file, created or
+                overwritten. Default is None, that is, the components are held in
+                memory.
+        kwargs: The keyword arguments of the DependentVariable object, such as
+                `unit`, `name`, or `description`.
+
+    Returns:
+        A CSDM instance.
+    """
+    csdm = new()
+    for dimension in dimensions:
+        csdm.add_dimension(dimension)
+
+    shape = (QuantityType(quantity_type).p, int(np.prod(csdm.shape, dtype=int)))
+    if backing is None:
+        components = np.empty(shape, dtype=dtype)
+    else:
+        components = np.memmap(backing, dtype=dtype, mode="w+", shape=shape)
+
+    csdm.add_dependent_variable(
+        type="internal", quantity_type=quantity_type, components=components, **kwargs
+    )
+    if backing is not None:
+        csdm.dependent_variables[0].encoding = "raw"
+    return csdm
+
+
 def plot(csdm_object, reverse_axis=None, range=None, **kwargs):
     """
     A supplementary function for plotting basic 1D and 2D datasets only.
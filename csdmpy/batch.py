@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""Load and save many CSDM files on a pool of processes or threads."""
+import os
+import pickle
+import tempfile
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+import csdmpy as cp  # lgtm [py/import-own-module]
+from csdmpy.utils import validate
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["load_many", "save_many"]
+
+EXECUTORS = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+# The total size in bytes of the numpy arrays of an object, above which the arrays
+# are handed over between the processes through a temporary file.
+SPILL_SIZE = 2 ** 20
+
+# The number of the pending items per worker. The items are pickled as they are
+# submitted, such that at most this many pickled objects per worker are in memory.
+PENDING_PER_WORKER = 2
+
+
+def load_many(filenames, workers=None, executor="process", **kwargs):
+    r"""
+    Load a list of .csdf/.csdfe files on a pool of workers.
+
+    Errors are reported per file. When a file fails to load, the respective item of
+    the returned list is the raised exception instead of a CSDM object, and the rest
+    of the files are still loaded.
+
+    Example:
+        >>> datasets = cp.load_many(['file1.csdf', 'file2.csdf']) # doctest: +SKIP
+
+    Args:
+        filenames: A list of local or remote addresses to the .csdf/.csdfe files.
+        workers (int): The maximum number of workers. Default is None, that is, the
+                number of processors on the machine.
+        executor (str): The pool of workers, either `process` or `thread`. Default is
+                `process`. A process pool side-steps the global interpreter lock,
+                while a thread pool avoids the serialization of the loaded objects.
+        kwargs: The keyword arguments of the ``cp.load`` method, such as
+                `application`, `mmap`, or `lazy`.
+
+    Returns:
+        A list of CSDM objects or exceptions, in the order of the filenames.
+    """
+    validate(filenames, "filenames", (list, tuple))
+    _check_executor(executor)
+    if executor == "thread":
+        items = [(cp.load, (filename,), kwargs) for filename in filenames]
+        return _run(items, workers, executor)
+
+    # the spill files are written to a private directory, removed along with any
+    # spill file left over by a failed worker.
+    with tempfile.TemporaryDirectory(prefix="csdmpy-") as directory:
+        items = [
+            (_load_pickled, (filename, directory), kwargs) for filename in filenames
+        ]
+        return [_unpickle_result(item) for item in _run(items, workers, executor)]
+
+
+def save_many(csdm_objects, filenames, workers=None, executor="process", **kwargs):
+    r"""
+    Save a list of CSDM objects to the respective files on a pool of workers.
+
+    Errors are reported per file. When an object fails to save, the respective item
+    of the returned list is the raised exception, and the rest of the objects are
+    still saved.
+
+    Example:
+        >>> files = ['file1.csdf', 'file2.csdf']
+        >>> errors = cp.save_many([data1, data2], files) # doctest: +SKIP
+
+    Args:
+        csdm_objects: A list of CSDM objects.
+        filenames: A list of the local addresses of the files, one for each object.
+        workers (int): The maximum number of workers. Default is None, that is, the
+                number of processors on the machine.
+        executor (str): The pool of workers, either `process` or `thread`. Default is
+                `process`.
+        kwargs: The keyword arguments of the ``save`` method of the CSDM object, such
+                as `read_only` or `version`.
+
+    Returns:
+        A list of None or exceptions, in the order of the filenames.
+    """
+    validate(csdm_objects, "csdm_objects", (list, tuple))
+    validate(filenames, "filenames", (list, tuple))
+    _check_executor(executor)
+    if len(csdm_objects) != len(filenames):
+        raise ValueError(
+            f"The number of CSDM objects, {len(csdm_objects)}, is not equal to the "
+            f"number of filenames, {len(filenames)}."
+        )
+
+    items = zip(csdm_objects, filenames)
+    if executor == "thread":
+        items = [(_save, (obj, filename), kwargs) for obj, filename in items]
+        return _run(items, workers, executor)
+
+    with tempfile.TemporaryDirectory(prefix="csdmpy-") as directory:
+        # the objects are pickled one at a time, as the items are submitted.
+        items = (
+            (_save_pickled, (_pickle(obj, directory), name), kwargs)
+            for obj, name in items
+        )
+        return _run(items, workers, executor)
+
+
+def _check_executor(executor):
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"`{executor}` is an invalid executor. The allowed values are "
+            f"{list(EXECUTORS)}."
+        )
+
+
+def _run(items, workers, executor):
+    """Call every (function, args, kwargs) item of the iterable on the pool of workers
+    and return the list of results or exceptions, in order. The items are consumed
+    as the workers become available."""
+    workers = os.cpu_count() if workers is None else workers
+    futures = []
+    pending = set()
+    with EXECUTORS[executor](max_workers=workers) as pool:
+        for function, args, kw in items:
+            if len(pending) >= PENDING_PER_WORKER * workers:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            future = pool.submit(function, *args, **kw)
+            futures.append(future)
+            pending.add(future)
+        return [_result(future) for future in futures]
+
+
+def _result(future):
+    try:
+        return future.result()
+    except Exception as error:
+        return error
+
+
+def _pickle(obj, directory=None):
+    """Serialize the object with the pickle protocol 5, holding the numpy arrays as
+    out-of-band buffers. Large buffers are written to a temporary file in the
+    directory, which is faster to hand over to another process than the pipe of the
+    pool.
+
+    Returns a (payload, buffers, spill) tuple, where buffers is either the list of
+    the buffers, or the list of the buffer sizes in the `spill` file.
+    """
+    buffers = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    buffers = [buffer.raw() for buffer in buffers]
+    if sum(item.nbytes for item in buffers) < SPILL_SIZE:
+        return payload, [bytearray(item) for item in buffers], None
+
+    with tempfile.NamedTemporaryFile(
+        prefix="csdmpy-", dir=directory, delete=False
+    ) as file:
+        for item in buffers:
+            file.write(item)
+    return payload, [item.nbytes for item in buffers], file.name
+
+
+def _unpickle(item):
+    """Deserialize an item from `_pickle`. The numpy arrays are views of the
+    writable out-of-band buffers. The spill file, if any, is removed."""
+    payload, buffers, spill = item
+    if spill is not None:
+        buffers = _read_spill(spill, buffers)
+    return pickle.loads(payload, buffers=buffers)
+
+
+def _read_spill(filename, sizes):
+    buffers = [bytearray(size) for size in sizes]
+    try:
+        with open(filename, "rb") as file:
+            for buffer in buffers:
+                if file.readinto(buffer) != len(buffer):
+                    raise EOFError(f"The spill file, {filename}, is truncated.")
+    finally:
+        os.remove(filename)
+    return buffers
+
+
+def _unpickle_result(item):
+    if isinstance(item, Exception):
+        return item
+    try:
+        return _unpickle(item)
+    except Exception as error:
+        return error
+
+
+def _load_pickled(filename, directory, **kwargs):
+    return _pickle(cp.load(filename, **kwargs), directory)
+
+
+def _save(obj, filename, **kwargs):
+    obj.save(filename, **kwargs)
+
+
+def _save_pickled(item, filename, **kwargs):
+    _save(_unpickle(item), filename, **kwargs)
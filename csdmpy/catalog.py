@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+"""A SQLite catalog of the metadata of the CSDM files in a directory tree.
+
+The ``build`` method scans the headers of the `.csdf`, `.csdfe`, and `.csdfb` files
+under a root directory and records the type, count, and unit of every dimension,
+the quantity type, numeric type, and unit of every dependent variable, the tags,
+the timestamp, and a fingerprint of every file in a local SQLite database. The
+``query`` method returns the paths of the files matching the given metadata from
+the database, without opening any file.
+
+Example:
+    >>> cp.catalog.build('data', workers=8) # doctest: +SKIP
+    >>> cp.catalog.query('data', ndim=2, unit='ppm', tags='X') # doctest: +SKIP
+    ['data/run1/spectrum.csdf', 'data/run2/spectrum.csdfe']
+"""
+import contextlib
+import datetime
+import hashlib
+import json
+import mmap
+import os
+import re
+import sqlite3
+from functools import partial
+
+from csdmpy.container import is_container  # lgtm [py/import-own-module]
+from csdmpy.container import parse_container  # lgtm [py/import-own-module]
+from csdmpy.container import PREFIX  # lgtm [py/import-own-module]
+from csdmpy.schema import validate_document  # lgtm [py/import-own-module]
+from csdmpy.streaming import parse_json  # lgtm [py/import-own-module]
+from csdmpy.units import scalar_quantity_format  # lgtm [py/import-own-module]
+from csdmpy.units import string_to_quantity  # lgtm [py/import-own-module]
+from csdmpy.utils import parallel_map  # lgtm [py/import-own-module]
+from csdmpy.utils import validate  # lgtm [py/import-own-module]
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["build", "query"]
+
+# The default filename of the database, in the root directory.
+DATABASE = ".csdmpy_catalog.sqlite"
+
+EXTENSIONS = (".csdf", ".csdfe", ".csdfb")
+
+# The version of the database schema. A database of another version is rebuilt.
+SCHEMA_VERSION = 2
+
+# An ISO 8601 timestamp, with the optional month, day, time, and UTC offset.
+TIMESTAMP = re.compile(
+    r"(\d{4})(?:-(\d{2})(?:-(\d{2})(?:[T ](\d{2}):(\d{2})"
+    r"(?::(\d{2})(?:\.(\d{1,6})\d*)?)?)?)?)?"
+    r"(Z|[+-]\d{2}:?\d{2})?"
+)
+
+SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT,
+    version TEXT,
+    timestamp TEXT,
+    description TEXT,
+    ndim INTEGER,
+    shape TEXT,
+    error TEXT
+);
+CREATE TABLE dimensions (
+    path TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    type TEXT,
+    count INTEGER,
+    unit TEXT,
+    quantity_name TEXT,
+    label TEXT
+);
+CREATE TABLE dependent_variables (
+    path TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    name TEXT,
+    type TEXT,
+    quantity_type TEXT,
+    numeric_type TEXT,
+    unit TEXT,
+    quantity_name TEXT
+);
+CREATE TABLE tags (path TEXT NOT NULL, tag TEXT NOT NULL);
+CREATE INDEX dimensions_path ON dimensions (path);
+CREATE INDEX dependent_variables_path ON dependent_variables (path);
+CREATE INDEX tags_path ON tags (path);
+CREATE INDEX tags_tag ON tags (tag);
+"""
+
+TABLES = ("files", "dimensions", "dependent_variables", "tags")
+
+
+def build(root, database=None, workers=None):
+    r"""
+    Build or update the catalog of the CSDM files under the root directory.
+
+    Only the headers of the files are read. The components arrays of the `.csdf`
+    files are skipped, and neither the external components files of the `.csdfe`
+    files nor the components blocks of the `.csdfb` files are read. The rebuilds
+    are incremental: the files whose modification time and size are unchanged since
+    the last build are not read again, and the files removed from the directory
+    tree are removed from the catalog.
+
+    Along with the metadata, the modification time, the size, and the SHA-256
+    checksum of the header, that is, of the JSON document of the `.csdf`/`.csdfe`
+    files, or of the JSON header of the `.csdfb` files, are recorded for every file.
+    The files failing to parse or to validate are recorded with the error, and are
+    not returned by the ``query`` method.
+
+    Example:
+        >>> summary = cp.catalog.build('data', workers=8) # doctest: +SKIP
+
+    Args:
+        root (str): The root directory.
+        database (str): The address of the SQLite database. Default is None, that
+                is, the `.csdmpy_catalog.sqlite` file in the root directory.
+        workers (int): The number of threads reading the headers. Default is None,
+                that is, the headers are read in the calling thread.
+
+    Returns:
+        A dictionary with the number of `scanned`, `unchanged`, and `removed` files,
+        and the `errors` of the files failing to parse, keyed by the path.
+    """
+    validate(root, "root", str)
+    files = _walk(root)
+    with contextlib.closing(_connect(root, database)) as connection:
+        recorded = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in connection.execute(
+                "SELECT path, mtime_ns, size FROM files"
+            )
+        }
+        stale = [path for path, stat in files.items() if recorded.get(path) != stat]
+        removed = [path for path in recorded if path not in files]
+
+        records = parallel_map(partial(_scan, root), stale, workers)
+        with connection:
+            _delete(connection, stale + removed)
+            for record in records:
+                _insert(connection, record)
+
+    errors = {
+        _join(root, record["path"]): record["error"]
+        for record in records
+        if record["error"] is not None
+    }
+    return {
+        "scanned": len(stale),
+        "unchanged": len(files) - len(stale),
+        "removed": len(removed),
+        "errors": errors,
+    }
+
+
+def query(
+    root,
+    ndim=None,
+    shape=None,
+    dimension_type=None,
+    unit=None,
+    quantity_type=None,
+    tags=None,
+    since=None,
+    until=None,
+    database=None,
+):
+    r"""
+    Return the paths of the cataloged files matching the given metadata.
+
+    Only the catalog database is read. The filters are combined, and the filters
+    left as None are ignored.
+
+    Example:
+        >>> cp.catalog.query('data', ndim=2, unit='ppm', tags='X') # doctest: +SKIP
+        ['data/run1/spectrum.csdf', 'data/run2/spectrum.csdfe']
+
+    Args:
+        root (str): The root directory of the catalog.
+        ndim (int): The number of dimensions.
+        shape (tuple): The counts of the dimensions, in the order of the dimensions.
+        dimension_type (str): A dimension type, `linear`, `monotonic`, or `labeled`,
+                of at least one dimension.
+        unit (str): The unit of at least one dimension, for example, `ppm`. The
+                unit is matched irrespective of the notation, that is, `m/s` matches
+                `m * s^-1`.
+        quantity_type (str): The quantity type of at least one dependent variable.
+        tags: A tag, or a list of tags, all of which are tags of the file.
+        since (str): The earliest timestamp, in ISO 8601 format, inclusive.
+        until (str): The latest timestamp, in ISO 8601 format, inclusive. The
+                timestamps without a UTC offset are in UTC, and a partial timestamp,
+                such as `2021` or `2021-06`, is the start of the period.
+        database (str): The address of the SQLite database. Default is None, that
+                is, the `.csdmpy_catalog.sqlite` file in the root directory.
+
+    Returns:
+        A sorted list of the paths of the matching files, joined with the root.
+    """
+    database = _database(root, database)
+    if not os.path.isfile(database):
+        raise FileNotFoundError(
+            f"No catalog at {database}. Build the catalog with the "
+            "``cp.catalog.build`` method first."
+        )
+
+    clauses = ["f.error IS NULL"]
+    parameters = []
+
+    def where(clause, *values):
+        clauses.append(clause)
+        parameters.extend(values)
+
+    def exists(table, condition, value):
+        subquery = f"SELECT 1 FROM {table} t WHERE t.path = f.path AND {condition}"
+        where(f"EXISTS ({subquery})", value)
+
+    if ndim is not None:
+        where("f.ndim = ?", validate(ndim, "ndim", int))
+    if shape is not None:
+        where("f.shape = ?", json.dumps([int(item) for item in shape]))
+    if dimension_type is not None:
+        exists("dimensions", "t.type = ?", dimension_type)
+    if unit is not None:
+        exists("dimensions", "t.unit = ?", _unit(unit))
+    if quantity_type is not None:
+        exists("dependent_variables", "t.quantity_type = ?", quantity_type)
+    if tags is not None:
+        for tag in [tags] if isinstance(tags, str) else tags:
+            exists("tags", "t.tag = ?", tag)
+    if since is not None:
+        where("f.timestamp >= ?", _utc(validate(since, "since", str), "since"))
+    if until is not None:
+        where("f.timestamp <= ?", _utc(validate(until, "until", str), "until"))
+
+    statement = f"SELECT f.path FROM files f WHERE {' AND '.join(clauses)}"
+    with contextlib.closing(sqlite3.connect(database)) as connection:
+        paths = [row[0] for row in connection.execute(statement, parameters)]
+    return sorted(_join(root, path) for path in paths)
+
+
+def _database(root, database):
+    return os.path.join(root, DATABASE) if database is None else database
+
+
+def _connect(root, database):
+    """Open the database, and create the tables of a new database or of a database
+    of another schema version."""
+    connection = sqlite3.connect(_database(root, database))
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        with connection:
+            for table in TABLES:
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+            connection.executescript(SCHEMA)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return connection
+
+
+def _walk(root):
+    """Return the {path: (mtime_ns, size)} of the CSDM files under the root, where
+    the path is relative to the root, with `/` separators."""
+    files = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if os.path.splitext(filename)[1].lower() not in EXTENSIONS:
+                continue
+            full_path = os.path.join(directory, filename)
+            stat = os.stat(full_path)
+            path = os.path.relpath(full_path, root).replace(os.sep, "/")
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def _join(root, path):
+    return os.path.join(root, *path.split("/"))
+
+
+def _read_header(filename):
+    """Return the dictionary, without the components, and the SHA-256 checksum of
+    the header of the file."""
+    with open(filename, "rb") as f:
+        prefix = f.read(PREFIX.size)
+        if len(prefix) == PREFIX.size and is_container(prefix):
+            buffer = prefix + f.read(PREFIX.unpack_from(prefix)[1])
+            return parse_container(buffer, False), hashlib.sha256(buffer).hexdigest()
+
+        f.seek(0, 2)
+        if f.tell() == 0:
+            raise ValueError("Empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            digest = hashlib.sha256(buffer).hexdigest()
+            return parse_json(buffer, False), digest
+
+
+def _scan(root, path):
+    """Read the header of the file and return the record of the catalog. The errors
+    are recorded instead of raised."""
+    full_path = _join(root, path)
+    stat = os.stat(full_path)
+    record = {
+        "path": path,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": None,
+        "error": None,
+    }
+    try:
+        dictionary, record["sha256"] = _read_header(full_path)
+        validate_document(dictionary)
+        record.update(_metadata(dictionary["csdm"]))
+    except Exception as error:
+        record["error"] = f"{type(error).__name__}: {error}"
+    return record
+
+
+def _metadata(csdm):
+    """Return the catalog metadata of the csdm object of a validated document."""
+    dimensions = [_dimension(item) for item in csdm.get("dimensions", [])]
+    dependent_variables = [
+        (
+            item.get("name", ""),
+            item["type"],
+            item["quantity_type"],
+            item.get("numeric_type", None),
+            _unit(item.get("unit", "")),
+            item.get("quantity_name", None),
+        )
+        for item in csdm.get("dependent_variables", [])
+    ]
+    return {
+        "version": csdm["version"],
+        "timestamp": _timestamp(csdm.get("timestamp", None)),
+        "description": csdm.get("description", ""),
+        "ndim": len(dimensions),
+        "shape": json.dumps([item[1] for item in dimensions]),
+        "dimensions": dimensions,
+        "dependent_variables": dependent_variables,
+        "tags": list(csdm.get("tags", [])),
+    }
+
+
+def _timestamp(value):
+    """Return the timestamp of the file in UTC, or None, when the file has no valid
+    timestamp."""
+    try:
+        return _utc(value, "timestamp")
+    except (TypeError, ValueError):
+        return None
+
+
+def _utc(value, name):
+    """Return the ISO 8601 timestamp as a UTC timestamp of a fixed width, such that
+    the timestamps are ordered as strings."""
+    match = TIMESTAMP.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(f"`{value}` is an invalid ISO 8601 timestamp for `{name}`.")
+    *fields, fraction, offset = match.groups()
+    # the missing month and day are the first of the period.
+    fields = [
+        int(item) if item else default
+        for item, default in zip(fields, [0, 1, 1, 0, 0, 0])
+    ]
+    microsecond = int(fraction.ljust(6, "0")) if fraction else 0
+    utc = datetime.timezone.utc
+    try:
+        if offset not in [None, "Z"]:
+            hours, minutes = int(offset[1:3]), int(offset[-2:])
+            delta = datetime.timedelta(hours=hours, minutes=minutes)
+            utc = datetime.timezone(-delta if offset[0] == "-" else delta)
+        timestamp = datetime.datetime(*fields, microsecond, tzinfo=utc)
+        timestamp = timestamp.astimezone(datetime.timezone.utc)
+    except (ValueError, OverflowError) as error:
+        raise ValueError(
+            f"`{value}` is an invalid ISO 8601 timestamp for `{name}`, {error}."
+        )
+    return timestamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _dimension(dimension):
+    """Return the (type, count, unit, quantity_name, label) of a dimension."""
+    type_ = dimension["type"]
+    if type_ == "linear":
+        count, unit = dimension["count"], _unit(dimension["increment"])
+    elif type_ == "monotonic":
+        coordinates = dimension["coordinates"]
+        count, unit = len(coordinates), _unit(coordinates[0] if coordinates else "")
+    else:
+        count, unit = len(dimension["labels"]), ""
+    return (
+        type_,
+        count,
+        unit,
+        dimension.get("quantity_name", None),
+        dimension.get("label", ""),
+    )
+
+
+def _unit(quantity):
+    """Return the unit of a quantity string in the canonical notation of the CSD
+    model, or an empty string for the dimensionless quantities."""
+    if not isinstance(quantity, str) or quantity.strip() == "":
+        return ""
+    return scalar_quantity_format(string_to_quantity(quantity), numerical_value=False)
+
+
+def _delete(connection, paths):
+    parameters = [(path,) for path in paths]
+    for table in TABLES:
+        connection.executemany(f"DELETE FROM {table} WHERE path = ?", parameters)
+
+
+def _insert(connection, record):
+    path = record["path"]
+    connection.execute(
+        "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            path,
+            record["mtime_ns"],
+            record["size"],
+            record["sha256"],
+            record.get("version", None),
+            record.get("timestamp", None),
+            record.get("description", None),
+            record.get("ndim", None),
+            record.get("shape", None),
+            record["error"],
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO dimensions VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(path, i) + item for i, item in enumerate(record.get("dimensions", []))],
+    )
+    connection.executemany(
+        "INSERT INTO dependent_variables VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (path, i) + item
+            for i, item in enumerate(record.get("dependent_variables", []))
+        ],
+    )
+    connection.executemany(
+        "INSERT INTO tags VALUES (?, ?)",
+        [(path, tag) for tag in record.get("tags", [])],
+    )
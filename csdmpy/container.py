@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Single-file binary container of the CSDM objects, the `.csdfb` files.
+
+A `.csdfb` file holds the JSON metadata and the components of every dependent
+variable in one file. All the integers are little-endian.
+
+=======  ===========  =======================================================
+Offset   Type         Description
+=======  ===========  =======================================================
+0        8 bytes      The magic bytes, ``\\x89CSDMFB\\n``.
+8        uint64       The size n of the JSON header in bytes.
+16       n bytes      The UTF-8 encoded JSON header.
+start    ...          The components blocks, where `start` is 16 + n rounded
+                      up to the next multiple of 64.
+=======  ===========  =======================================================
+
+The JSON header is the CSDM dictionary without the `components` of the dependent
+variables, along with a `blocks` list, one {"offset", "size"} object per dependent
+variable. The components of the i-th dependent variable are stored as a C-order
+(p, N) array of the `numeric_type` of the dependent variable, from the byte
+`start + offset` of the file. Every block starts at a multiple of 64 bytes from the
+start of the file, such that the components are mapped as numpy arrays without
+copies.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from csdmpy.utils import NumericType
+from csdmpy.utils import QuantityType
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["dump_container", "load_container", "parse_container"]
+
+MAGIC = b"\x89CSDMFB\n"
+PREFIX = struct.Struct("<8sQ")
+EXTENSION = ".csdfb"
+
+# The alignment in bytes of the components blocks.
+ALIGNMENT = 64
+
+
+def is_container(buffer):
+    """Return True if the bytes-like buffer starts with the magic bytes."""
+    size = len(MAGIC)
+    return bytes(buffer[:size]) == MAGIC
+
+
+def is_container_file(filename):
+    """Return True if the local file has the `.csdfb` extension or starts with the
+    magic bytes."""
+    if os.path.splitext(filename)[1].lower() == EXTENSION:
+        return True
+    with open(filename, "rb") as f:
+        return is_container(f.read(len(MAGIC)))
+
+
+def _align(position):
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def dump_container(dictionary, dependent_variables, output_device):
+    """
+    Serialize the CSDM dictionary and the components of the dependent variables to
+    the output_device, a binary file-like object, as a `.csdfb` file.
+
+    Args:
+        dictionary: A python dictionary of the CSDM object, generated without the
+            components, see the `encode_components` argument of the `_dict` method
+            of the CSDM object.
+        dependent_variables: A list of the DependentVariable objects.
+        output_device: A binary file-like object.
+    """
+    rows = [variable.subtype.ravel_data() for variable in dependent_variables]
+    blocks = []
+    offset = 0
+    for item in rows:
+        blocks.append({"offset": offset, "size": item.nbytes})
+        offset = _align(offset + item.nbytes)
+
+    header = dict(dictionary, blocks=blocks)
+    header = json.dumps(
+        header, ensure_ascii=False, sort_keys=False, allow_nan=False
+    ).encode("utf-8")
+
+    position = PREFIX.size + len(header)
+    output_device.write(PREFIX.pack(MAGIC, len(header)))
+    output_device.write(header)
+    output_device.write(bytes(_align(position) - position))
+    position = 0
+    for item, block in zip(rows, blocks):
+        output_device.write(bytes(block["offset"] - position))
+        output_device.write(memoryview(item).cast("B"))
+        position = block["offset"] + block["size"]
+    del rows
+
+
+def parse_container(buffer, components=True):
+    """
+    Parse the content of a `.csdfb` file and return a python dictionary.
+
+    The `components` of the dependent variables are numpy arrays over the buffer,
+    without copies. When `components` is False, the components are replaced with a
+    list of None, one for each component.
+
+    Args:
+        buffer: A bytes-like object or a numpy memmap of the file.
+        components: If False, skip the components.
+
+    Returns:
+        A python dictionary.
+    """
+    if len(buffer) < PREFIX.size or not is_container(buffer):
+        raise ValueError("Invalid header of the .csdfb file.")
+
+    begin = PREFIX.size
+    end = begin + PREFIX.unpack_from(buffer)[1]
+    if len(buffer) < end:
+        raise ValueError("The .csdfb file is truncated.")
+    dictionary = json.loads(bytes(buffer[begin:end]).decode("utf-8"))
+
+    start = _align(end)
+    blocks = dictionary.pop("blocks", [])
+    variables = dictionary.get("csdm", {}).get("dependent_variables", [])
+    for item, block in zip(variables, blocks):
+        if not components:
+            item["components"] = [None] * QuantityType(item["quantity_type"]).p
+            continue
+        item["components"] = _block(buffer, start, block, item["numeric_type"])
+    return dictionary
+
+
+def _block(buffer, start, block, numeric_type):
+    """Return the components block as a one-dimensional numpy array."""
+    dtype = NumericType(numeric_type).dtype
+    offset = start + block["offset"]
+    if len(buffer) < offset + block["size"]:
+        raise ValueError("The .csdfb file is truncated.")
+    count = block["size"] // dtype.itemsize
+    return np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+
+
+def load_container(filename, components=True, mmap=False):
+    """
+    Load a `.csdfb` file and return a python dictionary, see `parse_container`.
+
+    The file is read into memory once, into a buffer aligned as the file, and the
+    components of the dependent variables are writable numpy arrays over the
+    buffer. When `mmap` is True, the file is mapped to memory instead, and the
+    components are read-only numpy arrays over the map. When `components` is False,
+    only the header is read.
+
+    Args:
+        filename: The local address of the file.
+        components: If False, skip the components.
+        mmap: If True, memory-map the file.
+
+    Returns:
+        A python dictionary.
+    """
+    with open(filename, "rb") as f:
+        if components and mmap:
+            buffer = np.memmap(f, dtype=np.uint8, mode="r")
+        elif components:
+            buffer = _aligned_empty(os.fstat(f.fileno()).st_size)
+            f.readinto(buffer)
+        else:
+            buffer = bytearray(f.read(PREFIX.size))
+            if len(buffer) == PREFIX.size and is_container(buffer):
+                buffer += f.read(PREFIX.unpack_from(buffer)[1])
+    return parse_container(buffer, components)
+
+
+def _aligned_empty(size):
+    """Return an uninitialized numpy array of `size` bytes, whose address is a
+    multiple of ALIGNMENT."""
+    data = np.empty(size + ALIGNMENT, dtype=np.uint8)
+    start = -data.ctypes.data % ALIGNMENT
+    stop = start + size
+    return data[start:stop]
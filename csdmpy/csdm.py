@@ -6,6 +6,8 @@ from __future__ import print_function
 import datetime
 import json
 from copy import deepcopy
+from functools import partial
+from os import path
 
 import numpy as np
 from astropy.units.quantity import Quantity
@@ -13,17 +15,25 @@ from astropy.units.quantity import Quantity
 from .abstract_list import __dimensions_list__  # lgtm [py/import-own-module]
 from .abstract_list import DependentVariableList  # lgtm [py/import-own-module]
 from .abstract_list import DimensionList  # lgtm [py/import-own-module]
+from .container import dump_container  # lgtm [py/import-own-module]
 from .dependent_variables import (  # lgtm [py/import-own-module] # noqa: F401
     as_dependent_variable,
 )
 from .dependent_variables import DependentVariable  # lgtm [py/import-own-module]
+from .dependent_variables.chunked import (  # lgtm [py/import-own-module]
+    check_compression,
+)
+from .dependent_variables.sparse import SparseComponents  # lgtm [py/import-own-module]
 from .dimensions import as_dimension  # lgtm [py/import-own-module]
 from .dimensions import Dimension  # lgtm [py/import-own-module] # noqa: F401
 from .dimensions import LabeledDimension  # lgtm [py/import-own-module] # noqa: F401
 from .dimensions import LinearDimension  # lgtm [py/import-own-module] # noqa: F401
 from .dimensions import MonotonicDimension  # lgtm [py/import-own-module] # noqa: F401
 from .helper_functions import _preview  # lgtm [py/import-own-module]
+from .json_backend import get_json_backend  # lgtm [py/import-own-module]
 from .numpy_wrapper import fft
+from .staging import Staging  # lgtm [py/import-own-module]
+from .streaming import dump_json  # lgtm [py/import-own-module]
 from .units import string_to_quantity  # lgtm [py/import-own-module]
 from .utils import _check_dimension_indices  # lgtm [py/import-own-module]
 from .utils import _get_broadcast_shape  # lgtm [py/import-own-module]
@@ -475,6 +485,9 @@ class CSDM:
     def __setitem__(self, indices, values):
         indices = self._get_indices(indices)
         for variable in self.dependent_variables:
+            # an assignment to a region of the grid is dense.
+            if isinstance(variable.subtype._components, SparseComponents):
+                variable.subtype._components = variable.subtype._components.todense()
             section = (slice(0, len(variable.components), 1),) + indices[::-1]
             variable.components[section] = values
 
@@ -514,8 +527,8 @@ class CSDM:
                 csdm._dimensions += [new_dim]
 
         for variable in self.dependent_variables:
-            section = (slice(0, len(variable.components), 1),) + indices[::-1]
-            y = variable.components[section]
+            section = (slice(0, variable.subtype._quantity_type.p, 1),) + indices[::-1]
+            y = variable.subtype._read_components(section)
             dv = empty_dependent_variable(variable.numeric_type, variable.quantity_type)
             dv.subtype._components = y
             dv._copy_metadata(variable)
@@ -935,6 +948,9 @@ class CSDM:
         read_only=False,
         version=__latest_CSDM_version__,
         for_display=False,
+        encode_components=True,
+        compression=None,
+        staging=None,
     ):
         dictionary = {}
 
@@ -976,6 +992,9 @@ class CSDM:
                     dataset_index=i,
                     for_display=for_display,
                     version=self.__latest_CSDM_version__,
+                    encode_components=encode_components,
+                    compression=compression,
+                    staging=staging,
                 )
             )
 
@@ -988,6 +1007,7 @@ class CSDM:
         update_timestamp=False,
         read_only=False,
         version=__latest_CSDM_version__,
+        json_backend=None,
         **kwargs,
     ):
         """
@@ -997,16 +1017,19 @@ class CSDM:
             update_timestamp(bool): If True, timestamp is updated to current time.
             read_only (bool): If true, the file is serialized as read_only.
             version (str): The file is serialized with the given CSD model version.
+            json_backend (str): The JSON library serializing the object, `auto`,
+                `json`, `orjson`, `ujson`, or a backend registered with the
+                ``cp.register_json_backend`` method. Default is None, that is, the
+                backend set with the ``cp.set_json_backend`` method.
+            kwargs: The keyword arguments of the `dumps` method of the backend, such
+                as `indent` and `sort_keys`. The orjson backend only supports an
+                `indent` of 2.
 
         Example:
             >>> data.dumps()  # doctest: +SKIP
         """
-        return json.dumps(
-            self._dict(update_timestamp, read_only, version),
-            ensure_ascii=False,
-            sort_keys=False,
-            allow_nan=False,
-            **kwargs,
+        return get_json_backend(json_backend).dumps(
+            self._dict(update_timestamp, read_only, version), **kwargs
         )
 
     def save(
@@ -1016,6 +1039,8 @@ class CSDM:
         version=__latest_CSDM_version__,
         output_device=None,
         indent=0,
+        compression=None,
+        json_backend=None,
     ):
         """
         Serialize the :ref:`CSDM_api` instance as a JSON data-exchange file.
@@ -1046,12 +1071,42 @@ class CSDM:
         .. note:: Only dependent variables with ``encoding="raw"`` will be
             serialized to a binary file.
 
+        The components of the dependent variables with ``none`` and ``base64``
+        encodings are written to the file in chunks, without serializing the full
+        components array in memory.
+
+        When `compression` is given, the binary files of the dependent variables
+        with ``encoding="raw"`` are written as a sequence of independently
+        compressed chunks with an index of the chunks. The chunks are compressed
+        in parallel, and a section of the components is read by decompressing only
+        the chunks holding the section, see the `lazy` argument of ``cp.load``.
+
+        When the `filename` has the `.csdfb` extension, the CSDM object is
+        serialized as a single binary file, irrespective of the encodings of the
+        dependent variables. The file holds a length-prefixed JSON header followed
+        by the raw components of every dependent variable, each starting at a
+        multiple of 64 bytes, such that ``cp.load`` maps the components as numpy
+        arrays without copies. The `output_device`, if provided, must be a binary
+        file-like object.
+
+        The files are saved atomically. Every file, the binary files and the
+        header alike, is written to a temporary file in the same directory and
+        synced to the disk, before the temporary files are renamed over the
+        files, the binary files first and the header last. An interrupted save
+        leaves the previous files untouched. A crash between the renames may leave
+        the previous header with the new binary files, which is detected with the
+        checksums, see the `verify` argument of ``cp.load``.
+
         Args:
             filename (str): The filename of the serialized file.
             read_only (bool): If true, the file is serialized as read_only.
             version (str): The file is serialized with the given CSD model version.
             output_device(object): Object where the data is written. If provided,
                 the argument `filename` become irrelevant.
+            compression (str): The compression codec of the binary files, `zlib`,
+                `bz2`, or `lzma`. Default is None, that is, uncompressed files.
+            json_backend (str): The JSON library serializing the metadata, see the
+                ``dumps`` method. Default is None.
 
         Example:
             >>> data.save('my_file.csdf')
@@ -1060,33 +1115,49 @@ class CSDM:
             import os
             os.remove('my_file.csdf')
         """
-        dictionary = self._dict(filename=filename, version=version)
+        binary = path.splitext(filename)[1].lower() == ".csdfb"
+        if compression is not None:
+            check_compression(compression)
+            if binary:
+                raise ValueError("The .csdfb files do not support compression.")
+        if binary:
+            dump = dump_container
+            kwargs = {"mode": "wb"}
+        else:
+            dump = partial(dump_json, indent=indent, json_backend=json_backend)
+            kwargs = {"mode": "w", "encoding": "utf8"}
+
+        if output_device is not None:
+            dictionary = self._header(filename, read_only, version, binary, compression)
+            dump(dictionary, self.dependent_variables, output_device)
+            return
+
+        # the binary files are staged first and the header last, such that the
+        # header is renamed over the previous header once all the data is on disk.
+        with Staging() as staging:
+            dictionary = self._header(
+                filename, read_only, version, binary, compression, staging
+            )
+            with staging.open(filename, **kwargs) as outfile:
+                dump(dictionary, self.dependent_variables, outfile)
+
+    def _header(self, filename, read_only, version, binary, compression, staging=None):
+        """Return the dictionary of the serialized file, writing the binary files of
+        the `raw` encoded dependent variables."""
+        dictionary = self._dict(
+            filename=filename,
+            version=version,
+            encode_components=None if binary else False,
+            compression=compression,
+            staging=staging,
+        )
 
         timestamp = datetime.datetime.utcnow().isoformat()[:-7] + "Z"
         dictionary["csdm"]["timestamp"] = timestamp
 
         if read_only:
             dictionary["csdm"]["read_only"] = read_only
-
-        if output_device is None:
-            with open(filename, "w", encoding="utf8") as outfile:
-                json.dump(
-                    dictionary,
-                    outfile,
-                    ensure_ascii=False,
-                    sort_keys=False,
-                    indent=indent,
-                    allow_nan=False,
-                )
-        else:
-            json.dump(
-                dictionary,
-                output_device,
-                ensure_ascii=False,
-                sort_keys=False,
-                indent=indent,
-                allow_nan=False,
-            )
+        return dictionary
 
     def to_list(self):
         r"""Return the dimension coordinates and dependent variable components as
@@ -6,11 +6,15 @@ from __future__ import print_function
 import json
 import warnings
 from copy import deepcopy
+from functools import partial
 
 import numpy as np
 
 from .external import ExternalDataset  # lgtm [py/import-own-module]
 from .internal import InternalDataset  # lgtm [py/import-own-module]
+from .sparse import SparseComponents  # lgtm [py/import-own-module]
+from csdmpy.schema import check_dependent_variable  # lgtm [py/import-own-module]
+from csdmpy.schema import check_sparse_sampling  # lgtm [py/import-own-module]
 from csdmpy.utils import _axis_label  # lgtm [py/import-own-module]
 from csdmpy.utils import _get_dictionary  # lgtm [py/import-own-module]
 
@@ -72,6 +76,17 @@ class DependentVariable:
 
     def __init__(self, *args, **kwargs):
         """Initialize an instance of a DependentVariable class."""
+        self._initialize(*args, **kwargs)
+
+    @classmethod
+    def _from_validated(cls, *args, **kwargs):
+        """Return a DependentVariable instance from the dictionary of a document checked
+        with `validate_document`, without checking the dictionary again."""
+        obj = cls.__new__(cls)
+        obj._initialize(*args, _validated=True, **kwargs)
+        return obj
+
+    def _initialize(self, *args, _validated=False, **kwargs):
         dictionary = {
             "type": "internal",
             "description": "",
@@ -85,6 +100,10 @@ class DependentVariable:
             "components": None,
             "components_url": None,
             "filename": __file__,
+            "mmap": False,
+            "lazy": False,
+            "load_components": True,
+            "verify": "none",
             "application": {},
             "sparse_sampling": {
                 "dimensions": None,
@@ -99,17 +118,19 @@ class DependentVariable:
         input_dict = _get_dictionary(*args, **kwargs)
         input_keys = input_dict.keys()
 
-        self.__validate_key_value__(input_keys, input_dict)
+        if not _validated:
+            self.__validate_key_value__(input_keys, input_dict)
 
-        if "filename" in kwargs.keys():
-            dictionary["filename"] = kwargs["filename"]
+        # keywords from the csdm object that are not part of the input dictionary.
+        for key in ["filename", "mmap", "lazy", "load_components", "verify"]:
+            if key in kwargs.keys():
+                dictionary[key] = kwargs[key]
 
         for key in input_keys:
             if key in default_keys and key != "sparse_sampling":
                 dictionary[key] = input_dict[key]
 
         if "sparse_sampling" in input_keys:
-            check_sparse_sampling_key_value(input_dict)
             for key in input_dict["sparse_sampling"].keys():
                 dictionary["sparse_sampling"][key] = input_dict["sparse_sampling"][key]
         else:
@@ -125,42 +146,7 @@ class DependentVariable:
 
     @staticmethod
     def __validate_key_value__(input_keys, input_dict):
-        if "type" not in input_keys:
-            raise KeyError(
-                "Missing a required `type` key from the DependentVariable object."
-            )
-
-        if input_dict["type"] not in ["internal", "external"]:
-            t_ = input_dict["type"]
-            raise ValueError(
-                f"The value, '{t_}', is an invalid `type` for the DependentVariable "
-                "objects. The allowed values are 'internal', 'external'."
-            )
-
-        if "quantity_type" not in input_keys:
-            raise KeyError(
-                "Missing a required `quantity_type` key from the DependentVariable "
-                "object."
-            )
-
-        if input_dict["type"] == "external" and "encoding" in input_dict:
-            raise KeyError(
-                "The `encoding` key is invalid for DependentVariable objects with the "
-                "`external` type."
-            )
-
-        def message(item, subtype):
-            return (
-                f"Missing a required `{item}` key from the DependentVariable "
-                "object of type, `{subtype}`."
-            )
-
-        if input_dict["type"] == "internal" and "components" not in input_keys:
-            raise KeyError(message("components", "internal"))
-
-        if input_dict["type"] == "external":
-            if "components_url" not in input_keys:
-                raise KeyError(message("components_url", "external"))
+        check_dependent_variable(input_dict)
 
     def __repr__(self):
         if self.unit.physical_type == "dimensionless":
@@ -365,6 +351,11 @@ class DependentVariable:
         a `ValueError` is raised because the shape of the input array (1, 10)
         is not consistent with the shape of the components array, (3, 10).
 
+        The components of a sparse sampled dependent variable are a
+        :class:`~csdmpy.dependent_variables.sparse.SparseComponents` array, holding
+        only the values at the sampled grid vertexes. Use the ``todense`` method of
+        the array, or ``np.asarray``, for a dense Numpy array.
+
         Returns:
             A Numpy array of components.
 
@@ -643,6 +634,29 @@ class DependentVariable:
     def quantity_type(self, value):
         self.subtype.quantity_type = value
 
+    @property
+    def shape(self):
+        r"""
+        Shape of the components array of the dependent variable.
+
+        The shape is available without decoding the components, for example, when
+        the dataset is loaded with the ``lazy=True`` or ``components=False`` option
+        of the :meth:`~csdmpy.load` method.
+
+        .. doctest::
+
+            >>> y.shape
+            (3, 10)
+
+        Returns:
+            A tuple of integers, or None if the shape of undecoded components is
+            not yet known.
+
+        Raises:
+            AttributeError: When assigned a value.
+        """
+        return self.subtype._data.shape
+
     @property
     def type(self):
         """
@@ -774,9 +788,26 @@ class DependentVariable:
         """
         return self.subtype.dict()
 
-    def _dict(self, filename=None, dataset_index=None, for_display=False, version=None):
+    def _dict(
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        version=None,
+        encode_components=True,
+        compression=None,
+        staging=None,
+    ):
         """Return DependentVariable object as a python dictionary."""
-        return self.subtype.dict(filename, dataset_index, for_display, version)
+        return self.subtype.dict(
+            filename,
+            dataset_index,
+            for_display,
+            version,
+            encode_components,
+            compression,
+            staging,
+        )
 
     def copy(self):
         """Return a copy of the DependentVariable object."""
@@ -790,28 +821,19 @@ class DependentVariable:
         where :math:`p` is the number of components and :math:`N_k` is the number of
         points along the :math:`k^\mathrm{th}` dimension.
         """
-        # for item in self.dependent_variables:
         item = self.subtype
         sub_shape = (item.quantity_type.p,) + tuple(shape)
-        dtype = item.numeric_type.dtype
-
-        grid_points = np.asarray(sub_shape).prod()
-        components_size = item._components.size
-
-        if grid_points != components_size and item._sparse_sampling == {}:
-            warnings.warn(
-                (
-                    f"The number of elements in the components array, "
-                    f"{components_size}, is not consistent with the total "
-                    f"number of grid points, {grid_points}."
-                )
-            )
-        if item._sparse_sampling == {}:
-            item._components = np.asarray(
-                item._components[:, :grid_points].reshape(sub_shape), dtype=dtype
-            )
-        else:
-            item._components = fill_sparse_space(item, sub_shape, dtype)
+        reshape = partial(
+            reshape_components,
+            shape=sub_shape,
+            dtype=item.numeric_type.dtype,
+            sparse_sampling=item._sparse_sampling,
+        )
+        if item.is_deferred:
+            item._data.append(reshape)
+            item._data.shape = sub_shape
+            return
+        item._components = reshape(item._components)
 
     def _copy_metadata(self, obj, copy=False):
         """Copy DependentVariable metadata"""
@@ -828,50 +850,38 @@ class DependentVariable:
         self.subtype._application = obj.subtype._application
 
 
-def fill_sparse_space(item, shape, dtype):
-    """Fill sparse grid using numpy broadcasting."""
-    components = np.zeros(shape, dtype=dtype)
-    sparse_dimensions_indexes = item._sparse_sampling._sparse_dimensions_indexes
-    sgs = item._sparse_sampling._sparse_grid_vertexes.size
-    grid_vertexes = item._sparse_sampling._sparse_grid_vertexes.reshape(
-        int(sgs / len(sparse_dimensions_indexes)), len(sparse_dimensions_indexes)
-    ).T
+def reshape_components(components, shape, dtype, sparse_sampling):
+    """Reshape the components array to the given shape.
 
-    vertexes = [slice(None) for i in range(len(shape))]
-    for i, sparse_index in enumerate(sparse_dimensions_indexes):
-        vertexes[sparse_index] = grid_vertexes[i]
+    The components from a sparse sampled dependent variable are returned as a
+    SparseComponents array of the given `shape`, holding only the sampled values.
+    """
+    grid_points = np.asarray(shape).prod()
+    components_size = components.size
 
-    vertexes = tuple(vertexes[::-1])
-    _new_shape = components[vertexes].shape
+    if grid_points != components_size and sparse_sampling == {}:
+        warnings.warn(
+            (
+                f"The number of elements in the components array, "
+                f"{components_size}, is not consistent with the total "
+                f"number of grid points, {grid_points}."
+            )
+        )
+    if sparse_sampling == {}:
+        return np.asarray(components[:, :grid_points].reshape(shape), dtype=dtype)
+    return fill_sparse_space(components, sparse_sampling, shape, dtype)
 
-    components[vertexes] = item.components.reshape(_new_shape)
-    return components
 
+def fill_sparse_space(item_components, sparse_sampling, shape, dtype):
+    """Return the components of a sparse sampled dependent variable in the compact
+    coordinate format, without filling the dense grid."""
+    return SparseComponents.from_sampling(
+        item_components, sparse_sampling, shape, dtype
+    )
 
-def check_sparse_sampling_key_value(input_dict):
-    def message2(item):
-        return (
-            f"Missing a required `{item}` key from the SparseSampling object of the "
-            "DependentVariable object."
-        )
 
-    sparse_keys = input_dict["sparse_sampling"].keys()
-    if "dimension_indexes" not in sparse_keys:
-        raise KeyError(message2("dimension_indexes"))
-    if "sparse_grid_vertexes" not in sparse_keys:
-        raise KeyError(message2("sparse_grid_vertexes"))
-    if "encoding" in sparse_keys:
-        code = input_dict["sparse_sampling"]["encoding"]
-        if code != "none" and "unsigned_integer_type" not in sparse_keys:
-            raise KeyError(message2("unsigned_integer_type"))
-
-        uint_value = input_dict["sparse_sampling"]["unsigned_integer_type"]
-        if uint_value not in ["uint8", "uint16", "uint32", "uint64"]:
-            raise ValueError(
-                f"{uint_value} is an invalid `unsigned_integer_type` enumeration ",
-                "literal. The allowed values are `uint8`, `uint16`, `uint32`, ",
-                "and `uint64`.",
-            )
+def check_sparse_sampling_key_value(input_dict):
+    check_sparse_sampling(input_dict["sparse_sampling"])
 
 
 def as_dependent_variable(array, **kwargs):
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""The members of the zip archives holding the CSDM files."""
+import io
+import os
+import posixpath
+import struct
+import zipfile
+from urllib.parse import urlparse
+
+import numpy as np
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["ArchiveMember"]
+
+# The fixed part of the local file header of a zip member, with the signature, and
+# the lengths of the filename and the extra field.
+LOCAL_HEADER = struct.Struct("<4s22xHH")
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+class ArchiveMember:
+    """
+    A member of a zip archive.
+
+    The relative `components_url` of the external dependent variables of a CSDM file
+    stored in the archive refer to the sibling members of the archive.
+
+    Args:
+        archive: A zipfile.ZipFile instance open for reading.
+        name: The name of the member in the archive.
+        buffer: The bytes-like content of the archive, if the archive is in memory.
+    """
+
+    __slots__ = ("archive", "name", "buffer")
+
+    def __init__(self, archive, name, buffer=None):
+        """Instantiate an ArchiveMember class instance."""
+        self.archive = archive
+        self.name = name
+        self.buffer = buffer
+
+    def __repr__(self):
+        return f"ArchiveMember({self.archive.filename!r}, {self.name!r})"
+
+    def __str__(self):
+        archive = self.archive.filename or "<archive>"
+        return f"{archive}/{self.name}"
+
+    def resolve(self, url):
+        """Return the sibling member referred by the relative url, or the url, when
+        the url is absolute."""
+        res = urlparse(url)
+        if res.scheme not in ["file", ""] or res.netloc != "":
+            return url
+        if res.path.startswith("/"):
+            return url
+        directory = posixpath.dirname(self.name)
+        name = posixpath.normpath(posixpath.join(directory, res.path))
+        if name not in self.archive.NameToInfo:
+            raise FileNotFoundError(
+                f"The components file, `{name}`, is not a member of the archive, "
+                f"{self.archive.filename or '<archive>'}."
+            )
+        return ArchiveMember(self.archive, name, self.buffer)
+
+    def read(self, mmap=False):
+        """Return the bytes-like content of the member.
+
+        The stored, that is, uncompressed, members of an in-memory archive are
+        returned as views of the archive buffer, without copies. The stored members
+        of an archive file are memory-mapped with the `mmap` option, and otherwise
+        read from the file in a single read. The compressed members are read and
+        decompressed into memory.
+        """
+        info = self.archive.getinfo(self.name)
+        # the encrypted members are decrypted by the zipfile module.
+        if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+            content = self._read_stored(info, mmap)
+            if content is not None:
+                return content
+        return self.archive.read(self.name)
+
+    def _read_stored(self, info, mmap):
+        buffer = self.buffer
+        if buffer is None and isinstance(self.archive.fp, io.BytesIO):
+            buffer = self.archive.fp.getbuffer()
+        if buffer is not None:
+            buffer = memoryview(buffer).cast("B")
+            start = _data_offset(buffer[info.header_offset :])
+            if start is None:
+                return None
+            start += info.header_offset
+            return buffer[start : start + info.file_size]
+
+        filename = self.archive.filename
+        if filename is None or not os.path.isfile(filename):
+            return None
+        with open(filename, "rb") as f:
+            f.seek(info.header_offset)
+            start = _data_offset(f.read(LOCAL_HEADER.size))
+            if start is None:
+                return None
+            start += info.header_offset
+            if mmap and info.file_size > 0:
+                content = np.memmap(
+                    f, dtype=np.uint8, mode="r", offset=start, shape=(info.file_size,)
+                )
+                return memoryview(content)
+            content = bytearray(info.file_size)
+            f.seek(start)
+            f.readinto(content)
+            return memoryview(content)
+
+
+def _data_offset(header):
+    """Return the offset of the data from the local file header of a member, or
+    None, if the header is invalid."""
+    if len(header) < LOCAL_HEADER.size:
+        return None
+    signature, name_length, extra_length = LOCAL_HEADER.unpack_from(header)
+    if signature != LOCAL_HEADER_SIGNATURE:
+        return None
+    return LOCAL_HEADER.size + name_length + extra_length
@@ -4,12 +4,21 @@ from __future__ import division
 from __future__ import print_function
 
 import base64
+import os
 import warnings
 from copy import deepcopy
 
 import numpy as np
 
+from csdmpy.dependent_variables.chunked import write_chunked
+from csdmpy.dependent_variables.download import get_file_url_path
 from csdmpy.dependent_variables.download import get_relative_url_path
+from csdmpy.dependent_variables.integrity import checksum
+from csdmpy.dependent_variables.integrity import ChecksumWriter
+from csdmpy.dependent_variables.integrity import KEY
+from csdmpy.dependent_variables.lazy import DeferredComponents
+from csdmpy.dependent_variables.sparse import SparseComponents
+from csdmpy.staging import open_output
 from csdmpy.units import check_quantity_name
 from csdmpy.units import ScalarQuantity
 from csdmpy.utils import check_encoding
@@ -35,7 +44,7 @@ class BaseDependentVariable:
         "_numeric_type",
         "_quantity_type",
         "_component_labels",
-        "_components",
+        "_data",
         "_application",
         "_description",
     )
@@ -206,17 +215,42 @@ class BaseDependentVariable:
     def description(self, value):
         self._description = validate(value, "description", str)
 
+    @property
+    def _components(self):
+        """Return the components array, decoding the deferred components, if any."""
+        if isinstance(self._data, DeferredComponents):
+            self._data = self._data.materialize()
+        return self._data
+
+    @_components.setter
+    def _components(self, value):
+        self._data = value
+
+    @property
+    def is_deferred(self):
+        """Return True if the components array is not yet decoded."""
+        return isinstance(self._data, DeferredComponents)
+
+    def _read_components(self, section):
+        """Return a section of the components array. The section of the deferred
+        components is read with the reader, when available, without decoding the full
+        components array."""
+        if self.is_deferred and self._data.reader is not None:
+            return self._data.read(section)
+        return self.components[section]
+
     @property
     def components(self):
         """Return components array."""
         dtype = self._numeric_type.dtype
         if self._components.dtype != dtype:
-            self._components = np.asarray(self._components, dtype)
+            self._components = as_components(self._components, dtype)
         return self._components
 
     @components.setter
     def components(self, value):
-        value = np.asarray(value)
+        if not isinstance(value, SparseComponents):
+            value = np.asarray(value)
         if value.shape == self.components.shape:
             self.set_components(value)
             return
@@ -231,9 +265,21 @@ class BaseDependentVariable:
     # ----------------------------------------------------------------------- #
 
     def _get_dictionary(
-        self, filename=None, dataset_index=None, for_display=False, version=None
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        version=None,
+        encode_components=True,
+        compression=None,
+        staging=None,
     ):
-        r"""Return a dictionary object of the base class."""
+        r"""Return a dictionary object of the base class. When `encode_components` is
+        False, the `none` and `base64` encoded components are left out of the
+        dictionary, and when None, all the components are left out. When
+        `compression` is a codec name, the `raw` encoded components are written in
+        the chunked and compressed format. The binary files are written through the
+        `staging`, if given, see the csdmpy.staging module."""
         obj = {}
         if self._description.strip() != "":
             obj["description"] = str(self._description)
@@ -265,11 +311,23 @@ class BaseDependentVariable:
             del obj["encoding"]
             return obj
 
-        self.get_proper_encoded_data(obj, filename, dataset_index)
+        # the sparse components are written as the sampled values and vertexes.
+        if isinstance(self._components, SparseComponents):
+            obj["sparse_sampling"] = self._components.sampling(
+                self._sparse_sampling, "none" if self._encoding == "none" else "base64"
+            )
+
+        encode = encode_components or self._encoding == "raw"
+        if encode_components is not None and encode:
+            self.get_proper_encoded_data(
+                obj, filename, dataset_index, compression, staging
+            )
 
         return obj
 
-    def get_proper_encoded_data(self, obj, filename=None, dataset_index=None):
+    def get_proper_encoded_data(
+        self, obj, filename=None, dataset_index=None, compression=None, staging=None
+    ):
         c = self.ravel_data()
 
         if self.encoding == "none":
@@ -283,10 +341,25 @@ class BaseDependentVariable:
                 dataset_index, filename
             )
 
-            c.ravel().tofile(absolute_path)
+            backing = backing_memmap(c)
+            if backing is not None and compression is None:
+                # the backing file is referenced in place, without copies.
+                backing.flush()
+                url_relative_path = get_file_url_path(backing.filename, filename)
+                metadata = checksum(c)
+            elif compression is None:
+                with open_output(absolute_path, "wb", staging) as f:
+                    output = ChecksumWriter(f)
+                    output.write(c)
+                metadata = output.checksum()
+            else:
+                metadata = write_chunked(
+                    absolute_path, c, compression, staging=staging
+                )
 
             obj["type"] = "external"
             obj["components_url"] = url_relative_path
+            obj["application"] = dict(obj.get("application", {}), **{KEY: metadata})
             del obj["encoding"]
 
         del c
@@ -297,30 +370,55 @@ class BaseDependentVariable:
             _numeric_type = numpy_dtype_to_numeric_type(str(_components.dtype))
         self._numeric_type.update(_numeric_type)
 
-        self._components = np.asarray(_components, self._numeric_type.dtype)
+        self._components = as_components(_components, self._numeric_type.dtype)
 
     def ravel_data(self):
-        """Encode data based on the encoding key value."""
-        n = self._quantity_type.p
-        size = self._components[0].size
-        if self._numeric_type.value in ["complex64", "complex128"]:
-
-            if self._numeric_type.value == "complex64":
-                c = np.empty((n, size * 2), dtype=np.float32)
-
-            if self._numeric_type.value == "complex128":
-                c = np.empty((n, size * 2), dtype=np.float64)
+        """
+        Return the components as a (p, N) array for serialization, where p is the
+        number of components. The complex values are represented as interleaved real
+        and imaginary parts, such that N is twice the number of points.
 
-            for i in range(n):
-                c[i, 0::2] = self._components.real[i].ravel()
-                c[i, 1::2] = self._components.imag[i].ravel()
+        The returned array is a view of the components array when the components are
+        C-contiguous and of the given numeric type, otherwise, a copy. For the sparse
+        components, only the sampled values are returned.
+        """
+        n = self._quantity_type.p
+        dtype = self._numeric_type.dtype
+        c = self._components
+        if isinstance(c, SparseComponents):
+            c = c.sampled_values()
+        c = np.ascontiguousarray(c, dtype=dtype).reshape(n, -1)
+        if dtype.kind == "c":
+            c = c.view(c.real.dtype)
+        return c
 
-        else:
-            c = np.empty((n, size), dtype=self._numeric_type.dtype)
-            for i in range(n):
-                c[i] = self._components[i].ravel()
 
-        return c
+def as_components(array, dtype):
+    """Return the components array of the numpy dtype. The SparseComponents array is
+    kept in the compact format."""
+    if isinstance(array, SparseComponents):
+        return array.astype(dtype, copy=False)
+    return np.asarray(array, dtype)
+
+
+def backing_memmap(array):
+    """Return the writable numpy memmap, whose file holds exactly the bytes of the
+    C-contiguous array, or None."""
+    root = None
+    base = array
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap):
+            root = base
+        base = base.base
+    if root is None or root.mode not in ["r+", "w+"] or root.filename is None:
+        return None
+
+    address = array.__array_interface__["data"][0]
+    same_start = address == root.__array_interface__["data"][0]
+    same_size = array.nbytes == os.path.getsize(root.filename)
+    if array.flags.c_contiguous and root.offset == 0 and same_start and same_size:
+        return root
+    return None
 
 
 def reduced_display(_components):
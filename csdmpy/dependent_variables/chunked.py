@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Chunked and compressed binary format of the external components files.
+
+The components array is stored as a sequence of independently compressed chunks,
+preceded by a fixed size header and an index of the chunks. All the integers are
+little-endian.
+
+======  ============  ====================================================
+Offset  Type          Description
+======  ============  ====================================================
+0       8 bytes       The magic bytes, ``\\x89CSDMCK\\n``.
+8       uint8         The version of the format, 1.
+9       uint8         The compression codec, 1: zlib, 2: bz2, and 3: lzma.
+10      2 bytes       Reserved.
+12      uint32        The size of the uncompressed chunks in bytes.
+16      uint64        The total uncompressed size in bytes.
+24      uint64        The number of chunks, n.
+32      n+1 uint64    The offsets of the chunks from the start of the file,
+                      followed by the offset of the end of the last chunk.
+======  ============  ====================================================
+
+Every chunk, except the last, holds `chunk size` uncompressed bytes, such that the
+i-th chunk holds the uncompressed bytes from `i * chunk size`.
+"""
+import bz2
+import lzma
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from csdmpy.dependent_variables.integrity import ChecksumWriter
+from csdmpy.staging import open_output
+from csdmpy.utils import parallel_map
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["write_chunked", "decode_chunked", "is_chunked", "ChunkIndex"]
+
+MAGIC = b"\x89CSDMCK\n"
+VERSION = 1
+HEADER = struct.Struct("<8sBB2xIQQ")
+
+# The uncompressed size of the chunks in bytes.
+CHUNK_SIZE = 2 ** 20
+
+CODECS = {
+    "zlib": (1, zlib.compress, zlib.decompress),
+    "bz2": (2, bz2.compress, bz2.decompress),
+    "lzma": (3, lzma.compress, lzma.decompress),
+}
+CODEC_NAMES = {value[0]: key for key, value in CODECS.items()}
+
+
+def check_compression(compression):
+    """Check the name of the compression codec."""
+    if compression not in CODECS:
+        raise ValueError(
+            f"`{compression}` is an invalid compression. The allowed values are "
+            f"{list(CODECS)}."
+        )
+    return compression
+
+
+def write_chunked(
+    filename, data, compression="zlib", chunk_size=None, workers=None, staging=None
+):
+    """
+    Write the numpy array to a file in the chunked and compressed format.
+
+    Args:
+        filename: The address of the file.
+        data: A numpy array, written in C order.
+        compression: The compression codec, `zlib`, `bz2`, or `lzma`.
+        chunk_size: The uncompressed size of the chunks in bytes. Default is
+            CHUNK_SIZE.
+        workers: The number of threads compressing the chunks. Default is the
+            number of processors on the machine.
+        staging: The Staging instance staging the file. Default is None, that is,
+            the file is written in place.
+
+    Returns:
+        A dictionary with the size and the SHA-256 checksum of the written file.
+    """
+    codec, compress, _ = CODECS[check_compression(compression)]
+    chunk_size = CHUNK_SIZE if chunk_size is None else chunk_size
+    workers = os.cpu_count() if workers is None else workers
+
+    view = memoryview(np.ascontiguousarray(data)).cast("B")
+    chunks = parallel_map(compress, _split(view, chunk_size), workers)
+
+    offsets = np.empty(len(chunks) + 1, dtype="<u8")
+    offsets[0] = HEADER.size + offsets.nbytes
+    offsets[1:] = offsets[0] + np.cumsum([len(chunk) for chunk in chunks])
+
+    header = HEADER.pack(MAGIC, VERSION, codec, chunk_size, view.nbytes, len(chunks))
+    with open_output(filename, "wb", staging) as f:
+        output = ChecksumWriter(f)
+        output.write(header)
+        output.write(offsets.tobytes())
+        for chunk in chunks:
+            output.write(chunk)
+    return output.checksum()
+
+
+def _split(view, size):
+    """Return the list of the consecutive slices of the view of the given size."""
+    chunks = []
+    for start in range(0, view.nbytes, size):
+        stop = start + size
+        chunks.append(view[start:stop])
+    return chunks
+
+
+def is_chunked(buffer):
+    """Return True if the bytes-like buffer starts with the magic bytes."""
+    size = len(MAGIC)
+    return bytes(buffer[:size]) == MAGIC
+
+
+def is_chunked_file(filename):
+    """Return True if the local file is stored in the chunked format."""
+    with open(filename, "rb") as f:
+        return is_chunked(f.read(len(MAGIC)))
+
+
+class ChunkIndex:
+    """
+    The header and the index of the chunks of a file in the chunked format.
+
+    Attributes:
+        codec: The name of the compression codec.
+        chunk_size: The uncompressed size of the chunks in bytes.
+        size: The total uncompressed size in bytes.
+        offsets: A numpy array of the offsets of the chunks from the start of the
+            file, followed by the offset of the end of the last chunk.
+    """
+
+    __slots__ = ("codec", "chunk_size", "size", "offsets")
+
+    def __init__(self, buffer):
+        """Parse the header and the index from the start of the bytes-like buffer."""
+        if len(buffer) < HEADER.size:
+            raise ValueError("The chunked components file is truncated.")
+
+        magic, version, codec, chunk_size, size, count = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION or codec not in CODEC_NAMES:
+            raise ValueError("Invalid header of the chunked components file.")
+        if index_size(buffer) > len(buffer):
+            raise ValueError("The chunked components file is truncated.")
+
+        self.codec = CODEC_NAMES[codec]
+        self.chunk_size = chunk_size
+        self.size = size
+        self.offsets = np.frombuffer(
+            buffer, dtype="<u8", count=count + 1, offset=HEADER.size
+        ).astype(np.int64)
+
+    def decompress(self, chunk):
+        """Return the uncompressed bytes of a compressed chunk."""
+        return CODECS[self.codec][2](chunk)
+
+
+def index_size(buffer):
+    """Return the size of the header and the index, parsed from the header at the
+    start of the bytes-like buffer."""
+    count = HEADER.unpack_from(buffer)[-1]
+    return HEADER.size + 8 * (count + 1)
+
+
+def decode_chunked(buffer, dtype, workers=None):
+    """
+    Decode a bytes-like buffer in the chunked format as a one-dimensional numpy
+    array of the given dtype.
+
+    Args:
+        buffer: The content of the file.
+        dtype: The numpy dtype of the array.
+        workers: The number of threads decompressing the chunks. Default is the
+            number of processors on the machine.
+    """
+    index = ChunkIndex(buffer)
+    workers = os.cpu_count() if workers is None else workers
+    out = np.empty(index.size, dtype=np.uint8)
+    buffer = memoryview(buffer).cast("B")
+
+    def decompress(i):
+        first, last = index.offsets[i], index.offsets[i + 1]
+        data = np.frombuffer(index.decompress(buffer[first:last]), dtype=np.uint8)
+        start = i * index.chunk_size
+        stop = start + data.size
+        if data.size != min(index.chunk_size, index.size - start):
+            raise ValueError("Inconsistent size of the chunked components.")
+        out[start:stop] = data
+
+    parallel_map(decompress, range(index.offsets.size - 1), workers)
+    return out.view(dtype)
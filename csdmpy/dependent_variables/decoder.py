@@ -1,14 +1,21 @@
 # -*- coding: utf-8 -*-
 """Decoder for components' encoding types."""
 import base64
+import binascii
 
 import numpy as np
 
+from csdmpy.dependent_variables.chunked import decode_chunked
+from csdmpy.dependent_variables.chunked import is_chunked
+
 
 __author__ = "Deepansh J. Srivastava"
 __email__ = "srivastava.89@osu.edu"
 __all__ = ["Decoder"]
 
+# The number of base64 characters decoded at a time. Must be a multiple of 4.
+CHUNK_SIZE = 2 ** 22
+
 
 class Decoder:
     def __new__(self, encoding, quantity_type, components, dtype):
@@ -26,10 +33,25 @@ class Decoder:
 
     @staticmethod
     def decode_base64(components, dtype, component_len=None):
-        components = np.asarray(
-            [np.frombuffer(base64.b64decode(item), dtype=dtype) for item in components]
-        )
-        return components
+        dtype = np.dtype(dtype)
+        try:
+            sizes = [base64_decoded_size(item, 0, len(item)) for item in components]
+            if len(set(sizes)) != 1 or sizes[0] % dtype.itemsize != 0:
+                raise ValueError("Inconsistent length of base64 encoded components.")
+
+            # allocate once and decode each component straight into its row.
+            decoded = np.empty((len(components), sizes[0] // dtype.itemsize), dtype)
+            for row, item in zip(decoded, components):
+                decode_base64_into(item, 0, len(item), row)
+            return decoded
+        except (ValueError, TypeError, binascii.Error):
+            # strings with non-base64 characters, such as line breaks.
+            return np.asarray(
+                [
+                    np.frombuffer(base64.b64decode(item), dtype=dtype)
+                    for item in components
+                ]
+            )
 
     @staticmethod
     def decode_none(components, dtype, component_len=None):
@@ -50,6 +72,8 @@ class Decoder:
 
     @staticmethod
     def decode_raw(components, dtype, component_len=None):
+        if not isinstance(components, np.ndarray) and is_chunked(components):
+            components = decode_chunked(components, dtype)
         components = np.frombuffer(components, dtype=dtype)
         components.shape = component_len, int(components.size / component_len)
         return components
@@ -62,3 +86,30 @@ def check_number_of_components_and_encoding_type(length, quantity_type):
             f"The quantity_type, '{quantity_type.value}', requires exactly "
             f"{quantity_type.p} component(s), found {length} components."
         )
+
+
+def base64_decoded_size(buffer, start, end):
+    """Return the number of bytes encoded in the base64 string, buffer[start:end]."""
+    if (end - start) % 4 != 0:
+        raise ValueError("The length of a base64 encoded string is a multiple of 4.")
+    first = max(end - 2, start)
+    tail = buffer[first:end]
+    if isinstance(tail, memoryview):
+        tail = tail.tobytes()
+    padding = tail.count(b"=" if isinstance(tail, bytes) else "=")
+    return (end - start) // 4 * 3 - padding
+
+
+def decode_base64_into(buffer, start, end, out):
+    """Decode the base64 encoded characters, buffer[start:end], into the numpy
+    array, out, one chunk at a time."""
+    view = memoryview(out).cast("B")
+    filled = 0
+    for offset in range(start, end, CHUNK_SIZE):
+        stop = min(offset + CHUNK_SIZE, end)
+        chunk = binascii.a2b_base64(buffer[offset:stop])
+        size = filled + len(chunk)
+        view[filled:size] = chunk
+        filled = size
+    if filled != view.nbytes:
+        raise ValueError("Inconsistent length of base64 encoded components.")
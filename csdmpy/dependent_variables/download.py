@@ -1,16 +1,78 @@
 # -*- coding: utf-8 -*-
 """Utility functions for the csdmpy module."""
+import asyncio
+import atexit
+import hashlib
+import json
+import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from os import path
 from urllib.parse import quote
+from urllib.parse import urljoin
 from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from csdmpy.staging import Staging  # lgtm [py/import-own-module]
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
 
 
 __author__ = "Deepansh J. Srivastava"
 __email__ = "srivastava.89@osu.edu"
-__all__ = ["parse_url", "download_file_from_url"]
+__all__ = [
+    "parse_url",
+    "download_file_from_url",
+    "cached_file",
+    "set_cache",
+    "get_cache_dir",
+    "clear_cache",
+    "AsyncClient",
+    "TransferStats",
+    "get_default_client",
+]
+
+# The remote files are cached in the `CSDMPY_CACHE_DIR` directory, by default,
+# `~/.cache/csdmpy`, and the least recently used files are evicted when the total
+# size of the cache exceeds `CSDMPY_CACHE_SIZE` bytes, by default, 1 GB. A cached
+# file is used without revalidation for `CSDMPY_CACHE_MAX_AGE` seconds after the
+# last validation, by default, 0, and always when `CSDMPY_OFFLINE` is set.
+CACHE = {
+    "directory": os.environ.get(
+        "CSDMPY_CACHE_DIR",
+        path.join(
+            os.environ.get("XDG_CACHE_HOME", path.join(path.expanduser("~"), ".cache")),
+            "csdmpy",
+        ),
+    ),
+    "max_size": int(os.environ.get("CSDMPY_CACHE_SIZE", 2 ** 30)),
+    "max_age": float(os.environ.get("CSDMPY_CACHE_MAX_AGE", 0)),
+    "offline": os.environ.get("CSDMPY_OFFLINE", "") not in ["", "0"],
+}
+
+# The timeout in seconds of the connection to the remote server.
+TIMEOUT = 30
+
+# The errors of an unreachable or a stalled server, on which the cached file is used.
+UNREACHABLE = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# The AsyncClient shared by the calls of `cp.load_async`, created on first use.
+_DEFAULT_CLIENT = {}
+_DEFAULT_CLIENT_LOCK = threading.Lock()
 
 
 def parse_url(url):
@@ -18,49 +80,525 @@ def parse_url(url):
     return res
 
 
+def set_cache(directory=None, max_size=None, max_age=None, offline=None):
+    """
+    Set the directory, the maximum size, and the revalidation of the cache of the
+    remote files.
+
+    Args:
+        directory (str): The cache directory.
+        max_size (int): The maximum total size of the cached files in bytes. The
+                least recently used files are evicted when the size is exceeded.
+        max_age (float): The time in seconds, after the last validation with the
+                server, for which a cached file is used without revalidation.
+        offline (bool): If true, the cached files are used without revalidation, and
+                the files missing from the cache are not downloaded.
+    """
+    if directory is not None:
+        CACHE["directory"] = str(directory)
+    if max_size is not None:
+        CACHE["max_size"] = int(max_size)
+    if max_age is not None:
+        CACHE["max_age"] = float(max_age)
+    if offline is not None:
+        CACHE["offline"] = bool(offline)
+
+
+def get_cache_dir():
+    """Return the directory of the cache of the remote files."""
+    return CACHE["directory"]
+
+
+def clear_cache():
+    """Remove all the cached remote files, along with the temporary files of the
+    interrupted downloads and the unused lock files."""
+    with _lock(path.join(get_cache_dir(), ".lock")):
+        for entry in _entries():
+            _remove_entry(entry["key"])
+        _sweep()
+
+
 def download_file_from_url(url, verbose=False):
-    res = parse_url(url)
-    filename = path.split(res[2])[1]
-    # name, extension = path.splitext(filename)
-    # original_name = name
-    # i = 0
-    if path.isfile(filename):
-        if verbose:
-            sys.stdout.write(
-                f"Found a local file with the filename, {0}. Skipping download."
-            )
+    """
+    Download the remote file to the cache directory and return the local path.
+
+    Once the path is returned, the file may be evicted by the concurrent threads and
+    processes. Use the ``cached_file`` method to open the file safely.
+
+    Args:
+        url: The url of the remote file.
+        verbose: If true, show the progress bar of the download.
+
+    Returns:
+        The path to the local copy of the file.
+    """
+    with cached_file(url, verbose) as filename:
         return filename
-        # filename = "{0}_{1}{2}".format(original_name, str(i), extension)
-        # i += 1
 
-    with open(filename, "wb") as f:
-        response = requests.get(url, stream=True)
-        total = response.headers.get("content-length")
 
-        if total is None:
-            f.write(response.content)
-        else:
-            downloaded = 0
-            total = int(total)
+@contextmanager
+def cached_file(url, verbose=False):
+    """
+    Download the remote file to the cache directory and yield the local path.
+
+    The cached files are keyed by the hash of the url. A cached file is revalidated
+    with the server using the `ETag` and `Last-Modified` response headers, and is
+    only downloaded again when modified. A cached file is returned without
+    revalidation within the `max_age` of the cache after the last validation, or
+    when the cache is offline, see the ``set_cache`` method. If the server is
+    unreachable or times out, the cached file, if any, is returned. The files are
+    downloaded to a temporary file and renamed once complete.
+
+    The file is locked across the threads and processes until the block is exited,
+    such that the file is neither updated nor evicted while it is opened and read
+    within the block.
+
+    Example:
+        >>> with cached_file(url) as filename: # doctest: +SKIP
+        ...     content = open(filename, 'rb').read()
+
+    Args:
+        url: The url of the remote file.
+        verbose: If true, show the progress bar of the download.
+
+    Yields:
+        The path to the local copy of the file.
+    """
+    res = parse_url(url)
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    filename = _data_path(key, path.split(res[2])[1])
+    os.makedirs(get_cache_dir(), exist_ok=True)
+
+    with _lock(_lock_path(key)):
+        meta = _read_meta(key) if path.isfile(filename) else {}
+        if meta != {} and _is_fresh(meta):
             if verbose:
-                sys.stdout.write(
-                    "Downloading '{0}' from '{1}' to file '{2}'.\n".format(
-                        res[2], res[1], filename
-                    )
+                sys.stdout.write(f"Found a cached copy of '{url}'.\n")
+        elif CACHE["offline"]:
+            raise requests.ConnectionError(
+                f"'{url}' is not in the cache, and the cache is offline."
+            )
+        else:
+            _request(url, key, filename, meta, verbose)
+
+        # the modification time of the file orders the least recently used files.
+        os.utime(filename)
+
+        # the files locked by the other threads and processes are not evicted.
+        _evict(CACHE["max_size"], keep=key)
+        yield filename
+
+
+def _is_fresh(meta):
+    """Return True if the cached file is used without revalidation."""
+    if CACHE["offline"]:
+        return True
+    return time.time() - meta.get("validated", 0) < CACHE["max_age"]
+
+
+def _request(url, key, filename, meta, verbose=False):
+    """Send the conditional request of the url and update the cached file. The
+    cached file, if any, is kept when the server is unreachable, or when the
+    response times out or is interrupted."""
+    try:
+        with requests.get(
+            url, stream=True, headers=_conditional_headers(meta), timeout=TIMEOUT
+        ) as response:
+            _update(response, url, key, filename, meta, verbose)
+    except UNREACHABLE:
+        if meta == {}:
+            raise
+        if verbose:
+            sys.stdout.write(f"Server unreachable, using the cached '{url}'.\n")
+
+
+def _update(response, url, key, filename, meta, verbose=False):
+    """Update the cached file from the response of the conditional request."""
+    if response.status_code == 304:
+        if verbose:
+            sys.stdout.write(f"Found a cached copy of '{url}'.\n")
+        with Staging() as staging:
+            _write_meta(key, dict(meta, validated=time.time()), staging)
+        return
+
+    response.raise_for_status()
+    # the file is renamed once complete, followed by the metadata.
+    with Staging() as staging:
+        _download(response, filename, staging, verbose)
+        meta = _validators(url, filename, response.headers)
+        _write_meta(key, meta, staging)
+
+
+def _download(response, filename, staging, verbose=False):
+    """Write the content of the response to the file staged in the cache
+    directory."""
+    res = parse_url(response.url)
+    with staging.open(filename) as f:
+        _write_content(response, f, res, filename, verbose)
+
+
+def _write_content(response, f, res, filename, verbose):
+    total = response.headers.get("content-length")
+
+    if total is None:
+        f.write(response.content)
+    else:
+        downloaded = 0
+        total = int(total)
+        if verbose:
+            sys.stdout.write(
+                "Downloading '{0}' from '{1}' to file '{2}'.\n".format(
+                    res[2], res[1], filename
                 )
-            for data in response.iter_content(
-                chunk_size=max(int(total / 1000), 1024 * 1024)
-            ):
-                downloaded += len(data)
-                f.write(data)
-                if verbose:
-                    done = int(20 * downloaded / total)
-                    sys.stdout.write("\r[{}{}]".format("█" * done, "." * (20 - done)))
-                    sys.stdout.flush()
+            )
+        for data in response.iter_content(
+            chunk_size=max(int(total / 1000), 1024 * 1024)
+        ):
+            downloaded += len(data)
+            f.write(data)
+            if verbose:
+                done = int(20 * downloaded / total)
+                sys.stdout.write("\r[{}{}]".format("█" * done, "." * (20 - done)))
+                sys.stdout.flush()
     if verbose:
         sys.stdout.write("\n")
 
-    return filename
+
+def _conditional_headers(meta):
+    headers = {}
+    if "etag" in meta:
+        headers["If-None-Match"] = meta["etag"]
+    if "last_modified" in meta:
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _data_path(key, name):
+    return path.join(get_cache_dir(), f"{key}-{name}")
+
+
+def _meta_path(key):
+    return path.join(get_cache_dir(), f"{key}.json")
+
+
+def _lock_path(key):
+    return path.join(get_cache_dir(), f"{key}.lock")
+
+
+def _read_meta(key):
+    try:
+        with open(_meta_path(key), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _validators(url, filename, headers):
+    """Return the metadata of the cached file with the url, the validators, and the
+    time of the validation."""
+    meta = {"url": url, "filename": path.split(filename)[1], "validated": time.time()}
+    if "ETag" in headers:
+        meta["etag"] = headers["ETag"]
+    if "Last-Modified" in headers:
+        meta["last_modified"] = headers["Last-Modified"]
+    return meta
+
+
+def _write_meta(key, meta, staging):
+    """Write the metadata of the cached file to the file staged in the cache
+    directory."""
+    with staging.open(_meta_path(key), "w") as f:
+        json.dump(meta, f)
+
+
+def _entries():
+    """Return the list of the cached files with the key, path, size, and the time of
+    the last use, from the least to the most recently used."""
+    entries = []
+    directory = get_cache_dir()
+    names = os.listdir(directory) if path.isdir(directory) else []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        key = name[:-5]
+        filename = path.join(directory, _read_meta(key).get("filename", ""))
+        try:
+            stat = os.stat(filename)
+            size, used = stat.st_size, stat.st_mtime
+        except OSError:
+            size, used = 0, 0
+        entries.append({"key": key, "path": filename, "size": size, "used": used})
+    return sorted(entries, key=lambda entry: entry["used"])
+
+
+def _evict(max_size, keep=None):
+    """Remove the least recently used files, except `keep`, until the total size of
+    the cache is at most max_size bytes, along with the temporary files of the
+    interrupted downloads and the unused lock files. Files locked by other processes
+    are skipped."""
+    with _lock(path.join(get_cache_dir(), ".lock")):
+        _sweep()
+        entries = _entries()
+        size = sum(entry["size"] for entry in entries)
+        for entry in entries:
+            if size <= max_size:
+                break
+            if entry["key"] == keep:
+                continue
+            with _lock(_lock_path(entry["key"]), blocking=False) as locked:
+                if locked:
+                    _remove_entry(entry["key"])
+                    size -= entry["size"]
+
+
+def _remove_entry(key):
+    """Remove the cached file and the metadata. The lock file is removed by
+    `_sweep`, once unused."""
+    meta = _read_meta(key)
+    files = [_meta_path(key)]
+    if "filename" in meta:
+        files.insert(0, path.join(get_cache_dir(), meta["filename"]))
+    for filename in files:
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+
+def _sweep():
+    """Remove the staged files of the interrupted downloads, `.<key>...part`, and
+    the lock files of the removed entries, unless locked by other processes."""
+    directory = get_cache_dir()
+    for suffix in [".part", ".lock"]:
+        names = os.listdir(directory) if path.isdir(directory) else []
+        for name in names:
+            if not name.endswith(suffix):
+                continue
+            key = name[1:65] if suffix == ".part" else name[:-5]
+            if len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+                continue
+            if suffix == ".lock" and path.exists(_meta_path(key)):
+                continue
+            with _lock(_lock_path(key), blocking=False) as locked:
+                if locked:
+                    _remove(path.join(directory, name))
+
+
+def _remove(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+
+@contextmanager
+def _lock(filename, blocking=True):
+    """Hold an exclusive lock on the file across processes. Yields False, if the
+    lock is held elsewhere and `blocking` is False. A lock file removed by another
+    process while waiting is created again."""
+    os.makedirs(path.dirname(filename), exist_ok=True)
+    while True:
+        f = open(filename, "a+b")
+        locked = _acquire(f, blocking)
+        if not locked or _is_current(f, filename):
+            break
+        _release(f)
+        f.close()
+    try:
+        yield locked
+    finally:
+        if locked:
+            _release(f)
+        f.close()
+
+
+def _is_current(f, filename):
+    """Return True if the open file is the file at the filename."""
+    try:
+        return path.samestat(os.fstat(f.fileno()), os.stat(filename))
+    except OSError:
+        return False
+
+
+def _acquire(f, blocking):
+    if fcntl is not None:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(f.fileno(), flags)
+        except BlockingIOError:
+            return False
+        return True
+
+    while True:  # pragma: no cover
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if not blocking:
+                return False
+            time.sleep(0.05)
+
+
+def _release(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:  # pragma: no cover
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class TransferStats:
+    """
+    Byte and latency counters of the transfers of an AsyncClient.
+
+    Every transfer is recorded in the `transfers` list as a dictionary with the
+    `url`, the response `status`, the number of `bytes`, the `latency`, that is, the
+    time in seconds until the response headers are received, and the `elapsed` time
+    in seconds of the complete transfer.
+    """
+
+    __slots__ = ("transfers",)
+
+    def __init__(self):
+        """Instantiate a TransferStats class instance."""
+        self.transfers = []
+
+    def __repr__(self):
+        return (
+            f"TransferStats(count={self.count}, total_bytes={self.total_bytes}, "
+            f"total_elapsed={self.total_elapsed:.3f})"
+        )
+
+    def add(self, url, status, size, latency, elapsed):
+        """Record a transfer."""
+        self.transfers.append(
+            {
+                "url": url,
+                "status": status,
+                "bytes": size,
+                "latency": latency,
+                "elapsed": elapsed,
+            }
+        )
+
+    @property
+    def count(self):
+        """Return the number of transfers."""
+        return len(self.transfers)
+
+    @property
+    def total_bytes(self):
+        """Return the total number of bytes transferred."""
+        return sum(item["bytes"] for item in self.transfers)
+
+    @property
+    def total_elapsed(self):
+        """Return the sum of the elapsed time of the transfers in seconds."""
+        return sum(item["elapsed"] for item in self.transfers)
+
+
+class AsyncClient:
+    """
+    Fetch files asynchronously over a shared pool of HTTP connections.
+
+    The transfers run on a pool of `concurrency` threads with a `requests.Session`,
+    whose connection pool holds up to `concurrency` connections per host, such that
+    the connections are reused across the transfers. Local files, with the `file`
+    scheme or no scheme, are read from the disk. The transfers are blocking calls
+    of the `requests` library, run on the pool of threads, such that they do not
+    block the event loop. A client is reused across the calls and the event loops,
+    and is closed with the `close` method, or on exiting the `async with` block.
+
+    Args:
+        concurrency (int): The maximum number of concurrent transfers.
+        stats (TransferStats): The counters of the transfers. Default is a new
+                TransferStats instance.
+    """
+
+    __slots__ = ("session", "executor", "stats")
+
+    def __init__(self, concurrency=8, stats=None):
+        """Instantiate an AsyncClient class instance."""
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.stats = TransferStats() if stats is None else stats
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the connections and the pool of threads."""
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+    async def fetch(self, url, stats=None):
+        """Return the content of the file at the url as bytes. The transfer is
+        recorded in `stats`, if provided, and otherwise, in the stats of the
+        client."""
+        loop = asyncio.get_running_loop()
+        stats = self.stats if stats is None else stats
+        return await loop.run_in_executor(self.executor, self._fetch, url, stats)
+
+    def _fetch(self, url, stats):
+        start = time.perf_counter()
+        res = urlparse(url)
+        if res.scheme in ["file", ""]:
+            with open(url2pathname(res.path), "rb") as f:
+                latency = time.perf_counter() - start
+                content = f.read()
+            status = None
+        else:
+            with self.session.get(url, timeout=TIMEOUT) as response:
+                latency = response.elapsed.total_seconds()
+                response.raise_for_status()
+                content = response.content
+                status = response.status_code
+
+        elapsed = time.perf_counter() - start
+        stats.add(url, status, len(content), latency, elapsed)
+        return content
+
+
+def get_default_client():
+    """Return the AsyncClient shared by the calls of ``cp.load_async``. The client is
+    created on the first call and closed on exit."""
+    with _DEFAULT_CLIENT_LOCK:
+        if "client" not in _DEFAULT_CLIENT:
+            client = AsyncClient()
+            atexit.register(client.close)
+            _DEFAULT_CLIENT["client"] = client
+        return _DEFAULT_CLIENT["client"]
+
+
+def resolve_url(url, base_url):
+    """Return the absolute url of the `url` relative to the `base_url`. The relative
+    urls with the `file` scheme, such as `file:./data.dat`, are relative to the
+    location of the base_url. The `http` and `https` urls are absolute. The local
+    absolute urls, such as `file:///data.dat`, are not resolved relative to a remote
+    base_url, and raise a ValueError, as do the other schemes."""
+    res = urlparse(url)
+    if res.scheme in ["http", "https"]:
+        return url
+    if res.scheme not in ["file", ""]:
+        raise ValueError(
+            f"The scheme of the url, `{url}`, is not supported. The supported schemes "
+            "are `http`, `https`, and `file`."
+        )
+    absolute = res.netloc != "" or res.path.startswith("/")
+    if absolute and urlparse(str(base_url)).scheme in ["http", "https"]:
+        raise ValueError(
+            f"The local url, `{url}`, is not resolved relative to the remote file, "
+            f"`{base_url}`."
+        )
+    if res.netloc != "":
+        return url
+    return urljoin(str(base_url), res.path)
 
 
 def _get_absolute_data_address(data_path, file):
@@ -81,10 +619,19 @@ def get_absolute_url_path(url, file):
     path = res.geturl()
     if res.scheme in ["file", ""]:
         if res.netloc == "":
+            # relative to a remote file
+            if urlparse(str(file)).scheme in ["http", "https"]:
+                return resolve_url(url, file)
             path = _get_absolute_data_address(res.path, file)
     return path
 
 
+def get_file_url_path(absolute_path, filename):
+    """Return the url of a local file relative to the directory of the file."""
+    directory = path.dirname(path.abspath(filename))
+    return path.join("file:.", path.relpath(absolute_path, directory))
+
+
 def get_relative_url_path(dataset_index, filename):
     index = str(dataset_index)
     absolute_path = get_absolute_url_path("", filename)
@@ -3,13 +3,25 @@
 from __future__ import division
 from __future__ import print_function
 
-from urllib.request import urlopen
+import os
+from functools import partial
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 
 import numpy as np
 
+from csdmpy.dependent_variables.archive import ArchiveMember
 from csdmpy.dependent_variables.base_class import BaseDependentVariable
+from csdmpy.dependent_variables.chunked import is_chunked_file
 from csdmpy.dependent_variables.decoder import Decoder
 from csdmpy.dependent_variables.download import get_absolute_url_path
+from csdmpy.dependent_variables.integrity import KEY
+from csdmpy.dependent_variables.integrity import read_verified
+from csdmpy.dependent_variables.integrity import verify_content
+from csdmpy.dependent_variables.integrity import verify_size
+from csdmpy.dependent_variables.lazy import components_not_loaded
+from csdmpy.dependent_variables.lazy import DeferredComponents
+from csdmpy.dependent_variables.remote import RangeReader
 from csdmpy.dependent_variables.sparse import SparseSampling
 
 __author__ = "Deepansh J. Srivastava"
@@ -27,6 +39,14 @@ class ExternalDataset(BaseDependentVariable):
         self._sparse_sampling = {}
         kwargs["encoding"] = "raw"
 
+        # the checksum of the file is only recorded on save.
+        application = dict(kwargs["application"])
+        expected = dict(application.pop(KEY, None) or {})
+        kwargs["application"] = application
+
+        # a file being written by the CSDMWriter may end with a partial frame.
+        in_progress = expected.pop("in_progress", False)
+
         if kwargs["numeric_type"] is None:
             raise KeyError(
                 "Missing a required `numeric_type` key from the DependentVariable "
@@ -37,16 +57,38 @@ class ExternalDataset(BaseDependentVariable):
 
         components_url = kwargs["components_url"]
         filename = kwargs["filename"]
-        absolute_url = get_absolute_url_path(components_url, filename)
+        if isinstance(filename, ArchiveMember):
+            # the relative url refers to a sibling member of the archive.
+            absolute_url = filename.resolve(components_url)
+        else:
+            absolute_url = get_absolute_url_path(components_url, filename)
         self._components_url = components_url
 
-        components = urlopen(absolute_url).read()
-        self._components = Decoder(
-            self._encoding, self._quantity_type, components, self._numeric_type.dtype
+        load = partial(
+            load_external_components,
+            absolute_url,
+            self._quantity_type,
+            self._numeric_type.dtype,
+            kwargs["mmap"],
+            expected,
+            kwargs["verify"],
+            in_progress,
         )
-
-        if self._components.ndim == 1:
-            self._components = self._components[np.newaxis, :]
+        if not kwargs["load_components"]:
+            self._components = DeferredComponents(components_not_loaded)
+        elif kwargs["lazy"]:
+            reader = None
+            # the sections of a dense components array are read on demand. The size
+            # of the file is verified before the sections are read, but the checksum
+            # of the file is only computed when the complete file is read.
+            verify = kwargs["verify"]
+            dense = kwargs["sparse_sampling"] == {}
+            if dense and not (verify == "full" and expected):
+                size = expected.get("size") if verify == "size" else None
+                reader = section_reader(absolute_url, self._numeric_type.dtype, size)
+            self._components = DeferredComponents(load, reader=reader)
+        else:
+            self._components = load()
 
         if kwargs["sparse_sampling"] != {}:
             self._sparse_sampling = SparseSampling(**kwargs["sparse_sampling"])
@@ -57,18 +99,50 @@ class ExternalDataset(BaseDependentVariable):
         return self._components_url
 
     def to_dict(
-        self, filename=None, dataset_index=None, for_display=False, version=None
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        version=None,
+        encode_components=True,
+        compression=None,
+        staging=None,
     ):
         """Alias to the `dict()` method of the class."""
-        return self.dict(filename, dataset_index, for_display, version)
+        return self.dict(
+            filename,
+            dataset_index,
+            for_display,
+            version,
+            encode_components,
+            compression,
+            staging,
+        )
 
-    def dict(self, filename=None, dataset_index=None, for_display=False, version=None):
+    def dict(
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        version=None,
+        encode_components=True,
+        compression=None,
+        staging=None,
+    ):
         """Return ExternalDataset object as a python dictionary."""
         dictionary = {}
 
         dictionary["type"] = "internal"
         dictionary.update(
-            self._get_dictionary(filename, dataset_index, for_display, version)
+            self._get_dictionary(
+                filename,
+                dataset_index,
+                for_display,
+                version,
+                encode_components,
+                compression,
+                staging,
+            )
         )
         return dictionary
 
@@ -78,3 +152,97 @@ class ExternalDataset(BaseDependentVariable):
         if False in check:
             return False
         return True
+
+
+def load_external_components(
+    absolute_url,
+    quantity_type,
+    dtype,
+    mmap=False,
+    expected=None,
+    verify="none",
+    in_progress=False,
+):
+    """Read and decode the components from an external components file. The partial
+    trailing values of a file, which is `in_progress` of being written, are ignored.
+    """
+    components = read_external_components(absolute_url, dtype, mmap, expected, verify)
+    if in_progress:
+        itemsize = np.dtype(dtype).itemsize * quantity_type.p
+        components = whole_values(components, itemsize)
+    components = Decoder("raw", quantity_type, components, dtype)
+
+    if components.ndim == 1:
+        components = components[np.newaxis, :]
+    return components
+
+
+def whole_values(content, itemsize):
+    """Return the bytes-like content without the partial trailing value."""
+    if not isinstance(content, np.ndarray):
+        content = memoryview(content).cast("B")
+    size = len(content)
+    return content[: size - size % itemsize]
+
+
+def section_reader(absolute_url, dtype, size=None):
+    """Return a reader of the sections of the components array from the external
+    components file, or None, if the sections cannot be read from the url. When the
+    recorded `size` of the file in bytes is given, the size of the file is verified
+    before a section is read."""
+    if isinstance(absolute_url, ArchiveMember):
+        return None
+    res = urlparse(absolute_url)
+    if res.scheme in ["http", "https"]:
+        return RangeReader(absolute_url, dtype, size=size)
+    if res.scheme in ["file", ""] and res.netloc == "":
+        filename = url2pathname(res.path)
+        # the chunks of a compressed file are read and decompressed on demand.
+        if is_chunked_file(filename):
+            return RangeReader(absolute_url, dtype, size=size)
+        return partial(read_local_section, filename, dtype, size=size)
+    return None
+
+
+def read_local_section(filename, dtype, section, shape, size=None):
+    """Return a section of the components array of the given shape, stored in a local
+    file. The file is memory-mapped and only the pages of the section are read from
+    the disk. The returned array is a copy of the section. When the recorded `size`
+    of the file in bytes is given, the size of the file is verified first."""
+    if size is not None:
+        verify_size(os.path.getsize(filename), size, filename)
+    components = np.memmap(filename, dtype=dtype, mode="r", shape=tuple(shape))
+    return np.array(components[section])
+
+
+def read_external_components(
+    absolute_url, dtype, mmap=False, expected=None, verify="none"
+):
+    """Return the content of an external components file.
+
+    When `mmap` is True and the url refers to a local file, the file is mapped to
+    memory as a read-only numpy array instead of being read into memory. A file in
+    the chunked and compressed format is always read into memory.
+
+    The content is verified against the `expected` size and SHA-256 checksum of the
+    file, recorded on save, see the `verify` argument of ``cp.load``. The checksum
+    is computed while the file is read, or over the map, such that the file is read
+    from the disk once.
+
+    When the url is a member of a zip archive, the content of a stored member is a
+    view of the archive, or of the map of the archive file, without copies.
+    """
+    if isinstance(absolute_url, ArchiveMember):
+        content = absolute_url.read(mmap)
+        verify_content(content, expected, verify, str(absolute_url))
+        return content
+
+    res = urlparse(absolute_url)
+    if mmap and res.scheme in ["file", ""] and res.netloc == "":
+        filename = url2pathname(res.path)
+        # an empty file, such as a file with no frames yet, is not mapped.
+        if not is_chunked_file(filename) and os.path.getsize(filename) > 0:
+            content = np.memmap(filename, dtype=np.uint8, mode="r")
+            verify_content(content, expected, verify, absolute_url)
+            return content
+    return read_verified(absolute_url, expected, verify)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Integrity checksums of the external components files."""
+import hashlib
+from urllib.request import urlopen
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = [
+    "check_verify",
+    "checksum",
+    "ChecksumWriter",
+    "read_verified",
+    "verify_content",
+    "verify_size",
+]
+
+# The application metadata key of the checksum of the external components file.
+KEY = "com.github.deepanshs.csdmpy"
+
+# The size of the blocks in bytes, in which the files are written and read.
+BLOCK_SIZE = 2 ** 20
+
+VERIFY = ["none", "size", "full"]
+
+
+def check_verify(verify):
+    """Validate the verification mode."""
+    if verify not in VERIFY:
+        raise ValueError(
+            f"`{verify}` is an invalid verify option. The allowed values are "
+            f"{', '.join(repr(item) for item in VERIFY)}."
+        )
+    return verify
+
+
+class ChecksumWriter:
+    """A binary file-like object, which computes the size and the SHA-256 checksum of
+    the data while writing it to the underlying file.
+
+    Args:
+        file: A binary file-like object.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.size = 0
+        self._hash = hashlib.sha256()
+
+    def write(self, data):
+        """Write the bytes-like data in blocks, each hashed before being written."""
+        view = memoryview(data).cast("B")
+        for start in range(0, view.nbytes, BLOCK_SIZE):
+            stop = start + BLOCK_SIZE
+            self._hash.update(view[start:stop])
+            self.file.write(view[start:stop])
+        self.size += view.nbytes
+
+    def checksum(self):
+        """Return the application metadata of the written data."""
+        return {"size": self.size, "sha256": self._hash.hexdigest()}
+
+
+def checksum(data):
+    """Return the application metadata of the bytes-like data."""
+    view = memoryview(data).cast("B")
+    return {"size": view.nbytes, "sha256": hashlib.sha256(view).hexdigest()}
+
+
+def verify_content(content, expected, verify, url):
+    """Compare the size, and for the `full` verification, the SHA-256 checksum of
+    the bytes-like content of the file with the expected application metadata.
+
+    Args:
+        content: The bytes-like content of the file, or a numpy memmap of the file.
+        expected: The application metadata, or None, when the file has no checksum.
+        verify: The verification mode, `none`, `size`, or `full`.
+        url: The address of the file, used in the error messages.
+    """
+    if verify == "none" or not expected:
+        return
+    verify_size(memoryview(content).nbytes, expected["size"], url)
+    if verify == "full":
+        _compare(hashlib.sha256(content), expected, url)
+
+
+def verify_size(size, expected, url):
+    """Compare the size of the file with the recorded size, both in bytes."""
+    if size != expected:
+        raise ValueError(
+            f"The size of the external components file {url}, {size} bytes, is not "
+            f"equal to the recorded size, {expected} bytes."
+        )
+
+
+def read_verified(url, expected=None, verify="none"):
+    """Read the content of the file at url. For the `full` verification, the
+    checksum is computed on the blocks of the content as they are read.
+
+    Args:
+        url: The address of the file.
+        expected: The application metadata, or None, when the file has no checksum.
+        verify: The verification mode, `none`, `size`, or `full`.
+
+    Returns:
+        The bytes-like content of the file.
+    """
+    with urlopen(url) as response:
+        if verify != "full" or not expected:
+            content = response.read()
+            verify_content(content, expected, verify, url)
+            return content
+
+        digest = hashlib.sha256()
+        content = bytearray()
+        block = response.read(BLOCK_SIZE)
+        while block:
+            digest.update(block)
+            content += block
+            block = response.read(BLOCK_SIZE)
+
+    verify_content(content, expected, "size", url)
+    _compare(digest, expected, url)
+    return content
+
+
+def _compare(digest, expected, url):
+    if digest.hexdigest() != expected["sha256"]:
+        raise ValueError(
+            f"The SHA-256 checksum of the external components file {url} does not "
+            "match the recorded checksum."
+        )
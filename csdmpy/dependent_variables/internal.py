@@ -3,10 +3,17 @@
 from __future__ import division
 from __future__ import print_function
 
+from functools import partial
+
 import numpy as np
 
 from csdmpy.dependent_variables.base_class import BaseDependentVariable
+from csdmpy.dependent_variables.decoder import (
+    check_number_of_components_and_encoding_type,
+)
 from csdmpy.dependent_variables.decoder import Decoder
+from csdmpy.dependent_variables.lazy import components_not_loaded
+from csdmpy.dependent_variables.lazy import DeferredComponents
 from csdmpy.dependent_variables.sparse import SparseSampling
 from csdmpy.utils import numpy_dtype_to_numeric_type
 
@@ -37,7 +44,9 @@ class InternalDataset(BaseDependentVariable):
                 )
                 kwargs["components"] = components
             else:
-                kwargs["components"] = components.astype(kwargs["numeric_type"])
+                kwargs["components"] = components.astype(
+                    kwargs["numeric_type"], copy=False
+                )
 
         if kwargs["numeric_type"] is None:
             raise KeyError(
@@ -50,22 +59,41 @@ class InternalDataset(BaseDependentVariable):
         super().__init__(**kwargs)
 
         if not isinstance(components, np.ndarray):
-            components = Decoder(
-                self._encoding,
-                self._quantity_type,
-                components,
-                self._numeric_type.dtype,
+            self._decode_components(
+                components, kwargs["lazy"], kwargs["load_components"]
             )
-            self._components = components
 
-        size = self._components.size
-        p = self.quantity_type.p
-
-        self._components.shape = (p, int(size / p))
+        if not self.is_deferred:
+            self._components = as_component_rows(
+                self._components, self.quantity_type.p
+            )
 
         if kwargs["sparse_sampling"] != {}:
             self._sparse_sampling = SparseSampling(**kwargs["sparse_sampling"])
 
+    def _decode_components(self, components, lazy=False, load=True):
+        """Decode the encoded components now, or on first access when lazy. The
+        components are discarded when load is False."""
+        decode = partial(
+            Decoder,
+            self._encoding,
+            self._quantity_type,
+            components,
+            self._numeric_type.dtype,
+        )
+        if not lazy and load:
+            self._components = decode()
+            return
+
+        if self._encoding != "raw":
+            check_number_of_components_and_encoding_type(
+                len(components), self._quantity_type
+            )
+        self._components = DeferredComponents(
+            decode if load else components_not_loaded
+        )
+        self._data.append(partial(as_component_rows, p=self._quantity_type.p))
+
     def __eq__(self, other):
         """Overrides the default implementation"""
         check = [super().__eq__(other), self._sparse_sampling == other._sparse_sampling]
@@ -74,17 +102,55 @@ class InternalDataset(BaseDependentVariable):
         return True
 
     def to_dict(
-        self, filename=None, dataset_index=None, for_display=False, version=None
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        version=None,
+        encode_components=True,
+        compression=None,
+        staging=None,
     ):
         """Alias to the `dict()` method of the class."""
-        return self.dict(filename, dataset_index, for_display, version)
+        return self.dict(
+            filename,
+            dataset_index,
+            for_display,
+            version,
+            encode_components,
+            compression,
+            staging,
+        )
 
-    def dict(self, filename=None, dataset_index=None, for_display=False, version=None):
+    def dict(
+        self,
+        filename=None,
+        dataset_index=None,
+        for_display=False,
+        version=None,
+        encode_components=True,
+        compression=None,
+        staging=None,
+    ):
         """Return InternalDataset object as a python dictionary."""
         dictionary = {}
 
         dictionary["type"] = "internal"
         dictionary.update(
-            self._get_dictionary(filename, dataset_index, for_display, version)
+            self._get_dictionary(
+                filename,
+                dataset_index,
+                for_display,
+                version,
+                encode_components,
+                compression,
+                staging,
+            )
         )
         return dictionary
+
+
+def as_component_rows(components, p):
+    """Return a view of the components array with shape (p, size/p)."""
+    components.shape = (p, int(components.size / p))
+    return components
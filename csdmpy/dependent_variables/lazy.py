@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Deferred components for the lazily decoded dependent variables."""
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["DeferredComponents", "components_not_loaded"]
+
+
+class DeferredComponents:
+    """
+    Placeholder for a components array that is decoded on first access.
+
+    The instance holds a `source`, a callable returning the decoded components
+    array, and an ordered list of `steps`, callables which are applied to the output
+    of the source, for example, reshaping the array to the shape of the dimensions.
+    Both the source and the steps are expected to be picklable, such as module level
+    functions or `functools.partial` objects. The `shape` attribute holds the shape
+    of the decoded components array, when known, and None otherwise.
+
+    The optional `reader` is a callable, `reader(section, shape)`, returning a
+    section of the components array of the given shape without decoding the full
+    array, for example, with the HTTP Range requests.
+    """
+
+    __slots__ = ("_source", "_steps", "shape", "reader")
+
+    def __init__(self, source, shape=None, reader=None):
+        """Instantiate a DeferredComponents class instance."""
+        self._source = source
+        self._steps = []
+        self.shape = shape
+        self.reader = reader
+
+    def append(self, step):
+        """Append a step applied to the components array after decoding."""
+        self._steps.append(step)
+
+    def materialize(self):
+        """Decode and return the components array."""
+        components = self._source()
+        for step in self._steps:
+            components = step(components)
+        return components
+
+    def read(self, section):
+        """Return a section of the components array with the reader."""
+        return self.reader(section, self.shape)
+
+
+def components_not_loaded():
+    """Source of the components from a dataset loaded without the components."""
+    raise ValueError(
+        "The components of the dependent variable were not loaded. Use the "
+        "`cp.load` method with `components=True` to access the components."
+    )
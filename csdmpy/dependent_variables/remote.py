@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""Region reads of the external components with HTTP Range requests."""
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import numpy as np
+import requests
+
+from csdmpy.dependent_variables.chunked import ChunkIndex
+from csdmpy.dependent_variables.chunked import HEADER
+from csdmpy.dependent_variables.chunked import index_size
+from csdmpy.dependent_variables.chunked import is_chunked
+from csdmpy.dependent_variables.download import TIMEOUT
+from csdmpy.dependent_variables.download import TransferStats
+from csdmpy.dependent_variables.integrity import verify_size
+from csdmpy.utils import parallel_map
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["RangeReader"]
+
+# The size in bytes of the blocks fetched from the remote file. Must be a multiple of
+# the largest item size, 16 bytes, such that no value straddles two blocks.
+BLOCK_SIZE = 2 ** 16
+
+# The maximum size in bytes of the cached blocks of a remote file.
+CACHE_SIZE = 2 ** 26
+
+
+class RangeReader:
+    """
+    Read regions of a remote raw components file with HTTP Range requests.
+
+    The file is read in blocks of `block_size` bytes. A region of the components
+    array is mapped to the blocks holding the values of the region. The blocks,
+    which are not cached, are fetched with one Range request for every run of
+    adjacent blocks. The fetched blocks are kept in a least recently used cache of
+    up to `cache_size` bytes.
+
+    A file in the chunked and compressed format, detected from the first block, is
+    read in chunks instead. The blocks are the decompressed chunks, and a run of
+    adjacent chunks is fetched with one Range request, located from the index of the
+    chunks. Local files, with the `file` scheme, are read with the same ranges.
+    When the server ignores the Range requests and sends the complete file, the
+    file is kept in memory and the later regions are read from it.
+
+    A ValueError is raised when a region extends past the end of the file, that is,
+    the file is shorter than the components array. When the recorded `size` of the
+    file is given, the size of the file, from the Content-Range or the Content-Length
+    header, is verified before the first region is read.
+
+    Args:
+        url: The url of the remote file.
+        dtype: The numpy dtype of the components.
+        block_size: The size of the blocks in bytes. Default is BLOCK_SIZE.
+        cache_size: The maximum size of the cached blocks in bytes. Default is
+            CACHE_SIZE.
+        size: The recorded size of the file in bytes. Default is None, that is, the
+            size of the file is not verified.
+    """
+
+    __slots__ = (
+        "url",
+        "dtype",
+        "block_size",
+        "cache_size",
+        "size",
+        "stats",
+        "_blocks",
+        "_session",
+        "_lock",
+        "_index",
+        "_content",
+        "_total",
+    )
+
+    def __init__(self, url, dtype, block_size=None, cache_size=None, size=None):
+        """Instantiate a RangeReader class instance."""
+        self.url = url
+        self.dtype = np.dtype(dtype)
+        self.block_size = BLOCK_SIZE if block_size is None else block_size
+        self.cache_size = CACHE_SIZE if cache_size is None else cache_size
+        self.size = size
+        self.stats = TransferStats()
+        self._blocks = OrderedDict()
+        self._session = None
+        self._lock = threading.Lock()
+        self._index = None
+        self._content = None
+        self._total = None
+
+    def __getstate__(self):
+        # the session and the cached blocks are not pickled.
+        return [self.url, self.dtype, self.block_size, self.cache_size, self.size]
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __call__(self, section, shape):
+        """Return the section of the components array of the given shape."""
+        index = _element_index(section, shape)
+        with self._lock:
+            if self._index is None:
+                self._detect()
+            per_block = self.block_size // self.dtype.itemsize
+            blocks, rows = np.unique(index // per_block, return_inverse=True)
+            table, lengths = self._read_blocks(blocks.tolist())
+
+        rows = rows.reshape(index.shape)
+        # the values past the end of a short block are not in the file.
+        position = index % per_block
+        if np.any((position + 1) * self.dtype.itemsize > lengths[rows]):
+            raise ValueError(
+                f"The components file, `{self.url}`, is shorter than the components "
+                f"array of shape {tuple(shape)}."
+            )
+        values = table.view(self.dtype).reshape(blocks.size, per_block)
+        return values[rows, position]
+
+    def _read_blocks(self, blocks):
+        """Return the blocks as a (n, block_size) array of bytes, along with the
+        length of each block in bytes."""
+        missing = [block for block in blocks if block not in self._blocks]
+        for start, stop in _runs(missing):
+            self._fetch(start, stop)
+
+        table = np.zeros((len(blocks), self.block_size), dtype=np.uint8)
+        lengths = np.empty(len(blocks), dtype=np.int64)
+        for i, block in enumerate(blocks):
+            data = np.frombuffer(self._blocks[block], dtype=np.uint8)
+            self._blocks.move_to_end(block)
+            table[i, : data.size] = data
+            lengths[i] = data.size
+
+        # evict the least recently used blocks
+        while len(self._blocks) * self.block_size > self.cache_size:
+            self._blocks.popitem(last=False)
+        return table, lengths
+
+    def _detect(self):
+        """Read the first block and detect the format of the file. The index of a
+        chunked file replaces the first block, and the blocks become the chunks."""
+        size = max(self.block_size, HEADER.size)
+        content = self._read_range(0, size)
+        if self.size is not None:
+            verify_size(self._file_size(), self.size, self.url)
+        if not is_chunked(content):
+            self._index = False
+            self._blocks[0] = content[: self.block_size]
+            return
+
+        size = index_size(content)
+        if len(content) < size:
+            content = self._read_range(0, size)
+        self._index = ChunkIndex(content)
+        self.block_size = self._index.chunk_size
+
+    def _file_size(self):
+        """Return the size of the file in bytes, from the last response, or else,
+        from the Content-Length header of a HEAD request."""
+        if self._total is None:
+            with self._session.head(self.url, timeout=TIMEOUT) as response:
+                response.raise_for_status()
+                if response.headers.get("Content-Encoding", "identity") == "identity":
+                    self._total = _integer(response.headers.get("Content-Length"))
+        if self._total is None:
+            raise ValueError(
+                f"The size of the components file, `{self.url}`, is not reported by "
+                "the server and cannot be verified."
+            )
+        return self._total
+
+    def _fetch(self, start, stop):
+        """Fetch the blocks from start to stop, exclusive, with a Range request."""
+        if self._index:
+            return self._fetch_chunks(start, stop)
+
+        first = start * self.block_size
+        content = self._read_range(first, stop * self.block_size)
+        for block in range(start, stop):
+            offset = (block - start) * self.block_size
+            end = offset + self.block_size
+            self._blocks[block] = content[offset:end]
+
+    def _fetch_chunks(self, start, stop):
+        """Fetch and decompress the chunks from start to stop, exclusive. The blocks
+        past the last chunk are empty."""
+        offsets = self._index.offsets
+        count = len(offsets) - 1
+        for block in range(max(start, count), stop):
+            self._blocks[block] = b""
+        stop = min(stop, count)
+        if start >= stop:
+            return
+        content = memoryview(self._read_range(offsets[start], offsets[stop]))
+        chunks = []
+        for block in range(start, stop):
+            offset = offsets[block] - offsets[start]
+            end = offsets[block + 1] - offsets[start]
+            chunks.append(content[offset:end])
+
+        workers = os.cpu_count()
+        data = parallel_map(self._index.decompress, chunks, workers)
+        for block, item in zip(range(start, stop), data):
+            self._blocks[block] = item
+
+    def _read_range(self, first, stop):
+        """Return the bytes of the file from first to stop, exclusive."""
+        if self._content is not None:
+            return self._content[first:stop]
+
+        res = urlparse(self.url)
+        begin = time.perf_counter()
+        if res.scheme not in ["http", "https"]:
+            with open(url2pathname(res.path), "rb") as f:
+                self._total = os.fstat(f.fileno()).st_size
+                f.seek(first)
+                content = f.read(stop - first)
+            elapsed = time.perf_counter() - begin
+            self.stats.add(self.url, None, len(content), elapsed, elapsed)
+            return content
+
+        if self._session is None:
+            self._session = requests.Session()
+        last = stop - 1
+        with self._session.get(
+            self.url, headers={"Range": f"bytes={first}-{last}"}, timeout=TIMEOUT
+        ) as response:
+            latency = response.elapsed.total_seconds()
+            response.raise_for_status()
+            content = response.content
+            # the complete size of the file follows the range, as in bytes 0-9/100.
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            self._total = _integer(total)
+        elapsed = time.perf_counter() - begin
+        self.stats.add(self.url, response.status_code, len(content), latency, elapsed)
+
+        # the server ignores the Range header and sends the complete file, which is
+        # kept for the later reads.
+        if response.status_code == 200:
+            self._content = content
+            self._total = len(content)
+            content = content[first:stop]
+        return content
+
+
+def _element_index(section, shape):
+    """Return the flat C-order indexes of the elements of an array of the given shape,
+    selected by the section, a tuple of integers and slices."""
+    # the trailing axes, not in the section, are selected in full.
+    section = tuple(section) + (slice(None),) * (len(shape) - len(section))
+    index = np.zeros((), dtype=np.int64)
+    stride = 1
+    for item, size in zip(reversed(section), reversed(shape)):
+        axis = np.arange(size, dtype=np.int64)[item]
+        if axis.ndim == 0:
+            index = index + axis * stride
+        else:
+            index = np.add.outer(axis * stride, index)
+        stride *= size
+    return index
+
+
+def _integer(value):
+    """Return the header value as an integer, or None, when the value is unknown."""
+    if value is None or not value.strip().isdigit():
+        return None
+    return int(value)
+
+
+def _runs(blocks):
+    """Return the (start, stop) pairs of the runs of consecutive block indexes."""
+    runs = []
+    for block in sorted(blocks):
+        if runs and runs[-1][1] == block:
+            runs[-1][1] = block + 1
+        else:
+            runs.append([block, block + 1])
+    return runs
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
-"""The SparseSampling class."""
+"""The SparseSampling class and the SparseComponents array."""
+import base64
+import operator
 from copy import deepcopy
 
 import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
 
 from csdmpy.dependent_variables.decoder import Decoder
 from csdmpy.utils import check_encoding
@@ -12,7 +15,7 @@ from csdmpy.utils import validate
 
 __author__ = "Deepansh J. Srivastava"
 __email__ = "srivastava.89@osu.edu"
-__all__ = ["SparseSampling"]
+__all__ = ["SparseSampling", "SparseComponents"]
 
 
 class SparseSampling:
@@ -121,3 +124,451 @@ class SparseSampling:
     def sparse_grid_vertexes(self):
         """List of grid vertexes corresponding to sparse dimensions."""
         return deepcopy(self._sparse_grid_vertexes)
+
+
+class SparseComponents(NDArrayOperatorsMixin):
+    r"""
+    A components array in the coordinate (COO) format, holding only the values at
+    the sampled grid vertexes of a sparse sampled dependent variable.
+
+    The dense array of the given `shape` is zero except at the sampled vertexes. The
+    integer arrays of `coords` hold the coordinates of the sampled vertexes along the
+    sparse `axes` of the dense array, in ascending order of the axes. The `values`
+    array holds the values at the sampled vertexes, with the shape of the dense array
+    along the remaining axes, in order, followed by the number of sampled vertexes.
+
+    The arithmetic operations and numpy ufuncs, which map zero to zero, such as
+    multiplication, and the sum, mean, transpose, real, imag, and slicing operations
+    are applied to the values only. The other operations return a dense array. The
+    dense array is otherwise only created when requested with the `todense` method
+    or the `np.asarray` function.
+    """
+
+    __slots__ = ("values", "axes", "coords", "shape")
+
+    def __init__(self, values, axes, coords, shape):
+        """Instantiate a SparseComponents class instance."""
+        self.values = values
+        self.axes = tuple(axes)
+        self.coords = tuple(coords)
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_sampling(cls, components, sparse_sampling, shape, dtype):
+        """Return the SparseComponents from the components of a sparse sampled
+        dependent variable, ordered as in the CSD model.
+
+        Args:
+            components: The array of the sampled values.
+            sparse_sampling: The SparseSampling object of the dependent variable.
+            shape: The shape of the dense components array.
+            dtype: The numpy dtype of the components.
+        """
+        indexes = sparse_sampling._sparse_dimensions_indexes
+        vertexes = np.asarray(sparse_sampling._sparse_grid_vertexes, dtype=np.intp)
+        vertexes = vertexes.reshape(-1, len(indexes)).T
+
+        # the dimension k is the axis ndim - 1 - k of the components array.
+        axes = [len(shape) - 1 - k for k in indexes]
+        order = np.argsort(axes)
+        axes = [axes[i] for i in order]
+        coords = [vertexes[i] for i in order]
+
+        n = coords[0].size
+        dense = [shape[i] for i in range(len(shape)) if i not in axes]
+        position = _vertex_axis(axes)
+        values = np.asarray(components, dtype=dtype).reshape(
+            dense[:position] + [n] + dense[position:]
+        )
+        return cls(np.moveaxis(values, position, -1), axes, coords, shape)
+
+    def __repr__(self):
+        return (
+            f"SparseComponents(shape={self.shape}, nnz={self.nnz}, "
+            f"dtype={self.dtype})"
+        )
+
+    # ----------------------------------------------------------------------- #
+    #                                 Attributes                              #
+    # ----------------------------------------------------------------------- #
+
+    @property
+    def dtype(self):
+        """Return the numpy dtype of the values."""
+        return self.values.dtype
+
+    @property
+    def ndim(self):
+        """Return the number of dimensions of the dense array."""
+        return len(self.shape)
+
+    @property
+    def size(self):
+        """Return the number of elements of the dense array."""
+        return int(np.prod(self.shape))
+
+    @property
+    def nnz(self):
+        """Return the number of stored values."""
+        return self.values.size
+
+    @property
+    def nbytes(self):
+        """Return the number of bytes of the stored values and coordinates."""
+        return self.values.nbytes + sum(item.nbytes for item in self.coords)
+
+    @property
+    def real(self):
+        """Return the real part of the components."""
+        return self._new(self.values.real)
+
+    @property
+    def imag(self):
+        """Return the imaginary part of the components."""
+        return self._new(self.values.imag)
+
+    @property
+    def T(self):
+        """Return the transpose of the components."""
+        return self.transpose()
+
+    # ----------------------------------------------------------------------- #
+    #                                  Methods                                #
+    # ----------------------------------------------------------------------- #
+
+    def todense(self):
+        """Return the components as a dense numpy array."""
+        dense = np.zeros(self.shape, dtype=self.dtype)
+        self._moved(dense)[self._index] = self.values
+        return dense
+
+    def sampled_values(self):
+        """Return the values ordered as the components of a sparse sampled dependent
+        variable in the CSD model, that is, the inverse of `from_sampling`."""
+        return np.moveaxis(self.values, -1, _vertex_axis(self.axes))
+
+    def sampling(self, sparse_sampling=None, encoding="base64"):
+        """Return the dictionary of the SparseSampling object of the components.
+
+        Args:
+            sparse_sampling: The SparseSampling object, from which the order of the
+                dimension indexes, the encoding, the unsigned integer type, the
+                description, and the application metadata are taken, when given.
+            encoding: The encoding of the sparse grid vertexes, when the
+                `sparse_sampling` is not given.
+        """
+        indexes = sorted(self.ndim - 1 - item for item in self.axes)
+        uint = None
+        if isinstance(sparse_sampling, SparseSampling):
+            if sorted(sparse_sampling._sparse_dimensions_indexes) == indexes:
+                indexes = list(sparse_sampling._sparse_dimensions_indexes)
+            encoding = sparse_sampling._encoding
+            uint = sparse_sampling._unsigned_integer_type.dtype
+
+        coords = [self.coords[self.axes.index(self.ndim - 1 - k)] for k in indexes]
+        vertexes = np.stack(coords, axis=-1).ravel()
+        largest = int(vertexes.max()) if vertexes.size else 0
+        if uint is None or uint.kind != "u" or largest > np.iinfo(uint).max:
+            uint = next(
+                np.dtype(item)
+                for item in ["uint8", "uint16", "uint32", "uint64"]
+                if largest <= np.iinfo(item).max
+            )
+        vertexes = vertexes.astype(uint)
+
+        obj = {"dimension_indexes": indexes}
+        if encoding == "none":
+            obj["sparse_grid_vertexes"] = vertexes.tolist()
+        else:
+            obj["sparse_grid_vertexes"] = base64.b64encode(vertexes).decode("utf-8")
+            obj["encoding"] = "base64"
+            obj["unsigned_integer_type"] = str(uint)
+
+        if isinstance(sparse_sampling, SparseSampling):
+            if sparse_sampling._description.strip() != "":
+                obj["description"] = sparse_sampling._description
+            if sparse_sampling._application != {}:
+                obj["application"] = sparse_sampling._application
+        return obj
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.todense()
+        return dense if dtype is None else dense.astype(dtype, copy=False)
+
+    def astype(self, dtype, copy=True):
+        """Return the components with the values cast to the numpy dtype."""
+        return self._new(self.values.astype(dtype, copy=copy))
+
+    def copy(self):
+        """Return a copy of the components."""
+        coords = [item.copy() for item in self.coords]
+        return SparseComponents(self.values.copy(), self.axes, coords, self.shape)
+
+    def conj(self):
+        """Return the complex conjugate of the components."""
+        return np.conj(self)
+
+    def sum(self, axis=None, dtype=None):
+        """Return the sum of the components along the axis."""
+        return np.sum(self, axis=axis, dtype=dtype)
+
+    def mean(self, axis=None, dtype=None):
+        """Return the mean of the components along the axis."""
+        return np.mean(self, axis=axis, dtype=dtype)
+
+    def max(self, axis=None):
+        """Return the maximum of the components along the axis."""
+        return np.max(self, axis=axis)
+
+    def min(self, axis=None):
+        """Return the minimum of the components along the axis."""
+        return np.min(self, axis=axis)
+
+    def ravel(self):
+        """Return the flattened dense components."""
+        return np.ravel(self)
+
+    def transpose(self, *axes):
+        """Return the components with the axes permuted."""
+        if len(axes) == 1 and not isinstance(axes[0], int):
+            axes = axes[0]
+        if axes is None or len(axes) == 0:
+            axes = range(self.ndim)[::-1]
+        axes = [operator.index(item) % self.ndim for item in axes]
+        if sorted(axes) != list(range(self.ndim)):
+            raise ValueError("The axes do not match the dimensions of the array.")
+
+        sparse = [i for i, item in enumerate(axes) if item in self.axes]
+        coords = [self.coords[self.axes.index(axes[i])] for i in sparse]
+        dense = self._dense_axes()
+        order = [dense.index(item) for item in axes if item not in self.axes]
+        values = self.values.transpose(order + [len(dense)])
+        return SparseComponents(values, sparse, coords, [self.shape[i] for i in axes])
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if Ellipsis in key or not all(
+            isinstance(item, (slice, int, np.integer)) for item in key
+        ):
+            return self.todense()[key]
+        if len(key) > self.ndim:
+            raise IndexError("Too many indices for the components array.")
+        key = key + (slice(None),) * (self.ndim - len(key))
+
+        index, axes, coords, shape = [], [], [], []
+        mask = np.ones(self.values.shape[-1], dtype=bool)
+        for axis, item in enumerate(key):
+            n = self.shape[axis]
+            if axis not in self.axes:
+                index.append(item)
+                if isinstance(item, slice):
+                    shape.append(len(range(*item.indices(n))))
+                continue
+
+            coord = self.coords[self.axes.index(axis)]
+            if isinstance(item, slice):
+                start, stop, step = item.indices(n)
+                length = len(range(start, stop, step))
+                position = (coord - start) // step
+                mask &= (coord - start) % step == 0
+                mask &= (position >= 0) & (position < length)
+                axes.append(len(shape))
+                coords.append(position)
+                shape.append(length)
+                continue
+
+            item = operator.index(item)
+            if not -n <= item < n:
+                raise IndexError(f"Index {item} is out of bounds for axis {axis}.")
+            mask &= coord == item % n
+
+        values = self.values[tuple(index)][..., mask]
+        if axes == []:
+            # the sampled vertexes are unique, that is, at most one value is selected.
+            return values.sum(axis=-1, dtype=self.dtype)
+        coords = [item[mask] for item in coords]
+        return SparseComponents(values, axes, coords, shape)
+
+    def __setitem__(self, key, value):
+        raise TypeError(
+            "The components of a sparse sampled dependent variable do not support item "
+            "assignment. Convert the components to a dense array first."
+        )
+
+    def __array_ufunc__(self, ufunc, method, *inputs, out=None, **kwargs):
+        values = None
+        if method == "__call__" and ufunc.nout == 1:
+            values = self._zero_preserving(ufunc, inputs, out, kwargs)
+        if values is not None:
+            if out is not None:
+                return out[0]
+            return self._new(values)
+
+        if out is not None and any(isinstance(item, SparseComponents) for item in out):
+            raise TypeError(
+                f"The `{ufunc.__name__}` ufunc does not map zero to zero, and cannot "
+                "be applied in place to the sparse components."
+            )
+        inputs = _densify(inputs)
+        if out is not None:
+            kwargs["out"] = out
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __array_function__(self, function, types, args, kwargs):
+        if function in SPARSE_FUNCTIONS and not set(kwargs) - {"axis", "dtype", "axes"}:
+            if isinstance(args[0], SparseComponents):
+                result = SPARSE_FUNCTIONS[function](*args, **kwargs)
+                if result is not NotImplemented:
+                    return result
+        return function(*_densify(args), **_densify(kwargs))
+
+    # ----------------------------------------------------------------------- #
+    #                              Private methods                            #
+    # ----------------------------------------------------------------------- #
+
+    def _new(self, values):
+        return SparseComponents(values, self.axes, self.coords, self.shape)
+
+    def _dense_axes(self):
+        return [i for i in range(self.ndim) if i not in self.axes]
+
+    def _moved(self, array):
+        """Return a view of the array, of the shape of the dense array, with the
+        sparse axes moved last, such that indexing the view with the `_index`
+        selects the elements at the sampled vertexes, ordered as the values."""
+        sparse = range(self.ndim - len(self.axes), self.ndim)
+        return np.moveaxis(array, self.axes, sparse)
+
+    @property
+    def _index(self):
+        return (Ellipsis,) + self.coords
+
+    def _structure(self, other):
+        return (
+            self.shape == other.shape
+            and self.axes == other.axes
+            and all(np.array_equal(a, b) for a, b in zip(self.coords, other.coords))
+        )
+
+    def _zero_preserving(self, ufunc, inputs, out, kwargs):
+        """Apply the ufunc to the values, when the ufunc maps the zero elements of
+        the sparse inputs to zero. Returns None otherwise."""
+        if out is not None and (len(out) != 1 or out[0] is not self):
+            return None
+        if set(kwargs) - {"dtype", "casting"}:
+            return None
+
+        zeros, operands = [], []
+        for item in inputs:
+            if isinstance(item, SparseComponents):
+                if not self._structure(item):
+                    return None
+                zeros.append(np.zeros((), dtype=item.dtype))
+                operands.append(item.values)
+                continue
+            item = np.asarray(item)
+            if np.broadcast_shapes(item.shape, self.shape) != self.shape:
+                return None
+            zeros.append(item)
+            operands.append(item if item.ndim == 0 else self._gather(item))
+
+        with np.errstate(all="ignore"):
+            if not np.all(ufunc(*zeros, **kwargs) == 0):
+                return None
+        if out is not None:
+            kwargs["out"] = (self.values,)
+        return ufunc(*operands, **kwargs)
+
+    def _gather(self, array):
+        """Return the elements of the array, broadcast to the shape of the dense
+        array, at the sampled vertexes."""
+        return self._moved(np.broadcast_to(array, self.shape))[self._index]
+
+    def _sum(self, axis=None, dtype=None):
+        if axis is None:
+            return self.values.sum(dtype=dtype)
+        axis = (axis,) if np.ndim(axis) == 0 else axis
+        axis = {operator.index(item) % self.ndim for item in axis}
+
+        dense = self._dense_axes()
+        values = self.values.sum(
+            axis=tuple(dense.index(item) for item in axis if item in dense),
+            dtype=dtype,
+        )
+        keep = [i for i, item in enumerate(self.axes) if item not in axis]
+        shape = [n for i, n in enumerate(self.shape) if i not in axis]
+        axes = [item - sum(i < item for i in axis) for item in self.axes]
+        if keep == []:
+            return values.sum(axis=-1, dtype=dtype)
+        if len(keep) == len(self.axes):
+            return SparseComponents(values, axes, self.coords, shape)
+
+        # the vertexes, which differ only along the reduced axes, are merged.
+        size = [self.shape[self.axes[i]] for i in keep]
+        flat = np.ravel_multi_index([self.coords[i] for i in keep], size)
+        unique, inverse = np.unique(flat, return_inverse=True)
+        merged = np.zeros((unique.size,) + values.shape[:-1], dtype=values.dtype)
+        np.add.at(merged, inverse, np.moveaxis(values, -1, 0))
+        coords = np.unravel_index(unique, size)
+        return SparseComponents(
+            np.moveaxis(merged, 0, -1), [axes[i] for i in keep], coords, shape
+        )
+
+    def _mean(self, axis=None, dtype=None):
+        if dtype is None and self.dtype.kind in "biu":
+            dtype = np.float64
+        if axis is None:
+            count = self.size
+        else:
+            axis = (axis,) if np.ndim(axis) == 0 else axis
+            count = int(np.prod([self.shape[item] for item in axis]))
+        return np.true_divide(self._sum(axis, dtype), count)
+
+
+def _vertex_axis(axes):
+    """Return the axis of the vertexes in the result of the numpy advanced indexing
+    of a dense array with the coordinates along the ascending sparse axes. The axis
+    of the vertexes replaces the adjacent sparse axes, or otherwise, comes first."""
+    adjacent = axes[-1] - axes[0] == len(axes) - 1
+    return axes[0] if adjacent else 0
+
+
+def _densify(item):
+    """Replace the SparseComponents in the nested arguments with dense arrays."""
+    if isinstance(item, SparseComponents):
+        return item.todense()
+    if isinstance(item, (list, tuple)):
+        return type(item)(_densify(i) for i in item)
+    if isinstance(item, dict):
+        return {key: _densify(value) for key, value in item.items()}
+    return item
+
+
+def _moveaxis(array, source, destination):
+    source = np.atleast_1d(source) % array.ndim
+    destination = np.atleast_1d(destination) % array.ndim
+    order = [i for i in range(array.ndim) if i not in source]
+    for dest, src in sorted(zip(destination, source)):
+        order.insert(dest, src)
+    return array.transpose(order)
+
+
+SPARSE_FUNCTIONS = {
+    np.sum: SparseComponents._sum,
+    np.mean: SparseComponents._mean,
+    np.real: lambda array: array.real,
+    np.imag: lambda array: array.imag,
+    np.transpose: lambda array, axes=None: array.transpose(axes),
+    np.moveaxis: _moveaxis,
+    np.shape: lambda array: array.shape,
+    np.ndim: lambda array: array.ndim,
+    np.size: lambda array, axis=None: array.size if axis is None else NotImplemented,
+    np.copy: lambda array: array.copy(),
+}
@@ -8,9 +8,9 @@ import numpy as np
 from .labeled import LabeledDimension  # lgtm [py/import-own-module]
 from .linear import LinearDimension  # lgtm [py/import-own-module]
 from .monotonic import MonotonicDimension  # lgtm [py/import-own-module]
+from csdmpy.schema import check_dimension  # lgtm [py/import-own-module]
 from csdmpy.units import string_to_quantity  # lgtm [py/import-own-module]
 from csdmpy.utils import _get_dictionary  # lgtm [py/import-own-module]
-from csdmpy.utils import validate  # lgtm [py/import-own-module]
 
 __author__ = "Deepansh J. Srivastava"
 __email__ = "srivastava.89@osu.edu"
@@ -71,6 +71,17 @@ class Dimension:
 
     def __init__(self, *args, **kwargs):
         """Initialize an instance of Dimension object."""
+        self._initialize(*args, **kwargs)
+
+    @classmethod
+    def _from_validated(cls, *args, **kwargs):
+        """Return a Dimension instance from the dictionary of a document checked
+        with `validate_document`, without checking the dictionary again."""
+        obj = cls.__new__(cls)
+        obj._initialize(*args, _validated=True, **kwargs)
+        return obj
+
+    def _initialize(self, *args, _validated=False, **kwargs):
         default = {
             "type": None,  # valid for all dimension subtypes
             "description": "",  # valid for all dimension subtypes
@@ -101,8 +112,8 @@ class Dimension:
         input_dict = _get_dictionary(*args, **kwargs)
         input_keys = input_dict.keys()
 
-        if "type" not in input_keys:
-            raise KeyError("Missing a required 'type' key from the Dimension object.")
+        if not _validated:
+            self.__validate_key_value__(input_dict)
 
         if "reciprocal" in input_keys:
             input_subkeys = input_dict["reciprocal"].keys()
@@ -114,8 +125,6 @@ class Dimension:
                 else:
                     default[key] = input_dict[key]
 
-        self.__validate_key_value__(default)
-
         if default["type"] == "labeled":
             self.subtype = LabeledDimension(**default)
 
@@ -126,42 +135,11 @@ class Dimension:
             self.subtype = self._linear(default)
 
     @staticmethod
-    def __validate_key_value__(default):
-        _valid_types = ["monotonic", "linear", "labeled"]
-
-        type_ = default["type"]
-        message = (
-            f"The value, '{type_}', is invalid for the `type` attribute of the "
-            "Dimension object. The allowed values are 'monotonic', 'linear' and "
-            "'labeled'."
-        )
-
-        if default["type"] not in _valid_types:
-            raise ValueError(message)
-
-        if default["type"] == "labeled" and default["labels"] is None:
-            raise KeyError(
-                "Missing a required `labels` key from the LabeledDimension object."
-            )
-
-        if default["type"] == "monotonic" and default["coordinates"] is None:
-            raise KeyError(
-                "Missing a required `coordinates` key from the MonotonicDimension "
-                "object."
-            )
+    def __validate_key_value__(input_dict):
+        check_dimension(input_dict)
 
     def _linear(self, default):
         """Create and assign a linear dimension."""
-        missing_key = ["increment", "count"]
-
-        for item in missing_key:
-            if default[item] is None:
-                raise KeyError(
-                    f"Missing a required `{item}` key from the LinearDimension object."
-                )
-
-        validate(default["count"], "count", int)
-
         return LinearDimension(**default)
 
     def __repr__(self):
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""Pluggable JSON backends for the serialization of the CSDM objects.
+
+The JSON documents are parsed and serialized with the backend selected with the
+`set_json_backend` method, or with the `json_backend` argument of the ``cp.load``,
+``cp.loads``, ``CSDM.dumps``, and ``CSDM.save`` methods. The default backend is the
+standard library `json` module. The `orjson` and `ujson` backends, and the `auto`
+backend, the fastest of the installed libraries, are opt-in.
+
+The fast backends keep the behaviour of the `json` backend. The non-finite floats
+are rejected on serialization with a ValueError, and the `NaN` and `Infinity`
+literals are parsed. An indentation, or a keyword argument, which the library
+cannot honour raises an error instead of being ignored.
+"""
+import json
+import math
+import os
+
+import numpy as np
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = [
+    "JSONBackend",
+    "get_json_backend",
+    "set_json_backend",
+    "register_json_backend",
+]
+
+# The default backend, set with the `CSDMPY_JSON_BACKEND` environment variable or the
+# `set_json_backend` method.
+BACKEND = {"default": os.environ.get("CSDMPY_JSON_BACKEND", "json")}
+
+# The order of preference of the `auto` backend.
+PREFERENCE = ["orjson", "ujson", "json"]
+
+
+class JSONBackend:
+    """
+    A JSON library used for parsing and serializing the CSDM documents.
+
+    Args:
+        name: The name of the backend.
+        loads: A callable, `loads(document)`, returning the python object of a JSON
+            document, given as a str or a bytes-like object.
+        dumps: A callable, `dumps(obj, indent=None, **kwargs)`, returning the JSON
+            document of a python object as a str. The document is indented when
+            `indent` is a positive integer.
+    """
+
+    __slots__ = ("name", "loads", "dumps")
+
+    def __init__(self, name, loads, dumps):
+        """Instantiate a JSONBackend class instance."""
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return f"JSONBackend(name={self.name!r})"
+
+
+def _json():
+    def dumps(obj, indent=None, sort_keys=False, **kwargs):
+        return json.dumps(
+            obj,
+            ensure_ascii=False,
+            sort_keys=sort_keys,
+            allow_nan=False,
+            indent=indent,
+            **kwargs,
+        )
+
+    return JSONBackend("json", json.loads, dumps)
+
+
+def _orjson():
+    import orjson
+
+    def loads(document):
+        if isinstance(document, (memoryview, bytearray)):
+            document = bytes(document)
+        try:
+            return orjson.loads(document)
+        except orjson.JSONDecodeError:
+            # the NaN and Infinity literals are only parsed by the json module.
+            return json.loads(document)
+
+    def dumps(obj, indent=None, sort_keys=False, **kwargs):
+        _check_kwargs("orjson", kwargs)
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        # orjson supports an indentation of two spaces only.
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        elif indent:
+            raise ValueError(
+                f"The orjson backend only supports an indent of 2, not {indent}."
+            )
+        document = orjson.dumps(obj, option=option).decode("utf-8")
+        # orjson serializes the non-finite floats as null.
+        if "null" in document:
+            _check_finite(obj)
+        return document
+
+    return JSONBackend("orjson", loads, dumps)
+
+
+def _ujson():
+    import ujson
+
+    def loads(document):
+        if isinstance(document, (memoryview, bytearray)):
+            document = bytes(document)
+        try:
+            return ujson.loads(document)
+        except ValueError:
+            # the NaN and Infinity literals are only parsed by the json module.
+            return json.loads(document)
+
+    def dumps(obj, indent=None, sort_keys=False, **kwargs):
+        _check_kwargs("ujson", kwargs)
+        _check_finite(obj)
+        return ujson.dumps(
+            obj,
+            ensure_ascii=False,
+            escape_forward_slashes=False,
+            sort_keys=sort_keys,
+            indent=indent or 0,
+        )
+
+    return JSONBackend("ujson", loads, dumps)
+
+
+def _check_kwargs(name, kwargs):
+    """Raise a TypeError for the keyword arguments of the json module, which the
+    backend does not support."""
+    if kwargs:
+        names = ", ".join(f"`{item}`" for item in kwargs)
+        raise TypeError(f"The {name} backend does not support the {names} arguments.")
+
+
+def _check_finite(obj):
+    """Raise a ValueError when the object holds a non-finite float, as the json
+    module does with `allow_nan=False`."""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            finite = math.isfinite(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+            continue
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+            continue
+        elif hasattr(item, "dtype") and item.dtype.kind in "fc":
+            finite = bool(np.isfinite(item).all())
+        else:
+            continue
+        if not finite:
+            raise ValueError("Out of range float values are not JSON compliant")
+
+
+# The factories of the built-in backends, which import the JSON library on first use.
+FACTORIES = {"json": _json, "orjson": _orjson, "ujson": _ujson}
+
+# The instantiated and the registered backends.
+_BACKENDS = {}
+
+
+def register_json_backend(name, loads, dumps):
+    """
+    Register a JSON backend, selectable by name with the `set_json_backend` method or
+    the `json_backend` argument of the serialization methods.
+
+    Args:
+        name (str): The name of the backend.
+        loads: A callable, `loads(document)`, returning the python object of a JSON
+            document, given as a str or a bytes-like object.
+        dumps: A callable, `dumps(obj, indent=None, **kwargs)`, returning the JSON
+            document of a python object as a str.
+
+    Example:
+        >>> import json
+        >>> cp.register_json_backend('compact', json.loads, lambda obj, indent=None:
+        ...     json.dumps(obj, separators=(',', ':')))
+        >>> cp.new().dumps(json_backend='compact')[:18]
+        '{"csdm":{"version"'
+    """
+    _BACKENDS[name] = JSONBackend(name, loads, dumps)
+
+
+def get_json_backend(backend=None):
+    """
+    Return the JSONBackend instance of the given name.
+
+    Args:
+        backend: The name of the backend, `auto`, `json`, `orjson`, `ujson`, or a
+            registered backend, or a JSONBackend instance. Default is None, that is,
+            the backend set with the `set_json_backend` method.
+
+    Raises:
+        ValueError: When the backend is not a known backend.
+        ImportError: When the JSON library of the backend is not installed.
+    """
+    if isinstance(backend, JSONBackend):
+        return backend
+    backend = BACKEND["default"] if backend is None else backend
+
+    if backend == "auto":
+        for item in PREFERENCE:
+            try:
+                return get_json_backend(item)
+            except ImportError:
+                continue
+
+    if backend not in _BACKENDS:
+        if backend not in FACTORIES:
+            names = ", ".join(f"`{item}`" for item in ["auto"] + list(FACTORIES))
+            raise ValueError(
+                f"`{backend}` is an invalid JSON backend. The allowed values are "
+                f"{names}, or a backend registered with `register_json_backend`."
+            )
+        _BACKENDS[backend] = FACTORIES[backend]()
+    return _BACKENDS[backend]
+
+
+def set_json_backend(backend="json"):
+    """
+    Set the default JSON backend of the ``cp.load``, ``cp.loads``, ``CSDM.dumps``,
+    and ``CSDM.save`` methods.
+
+    Args:
+        backend (str): The name of the backend, `auto`, `json`, `orjson`, `ujson`,
+            or a backend registered with the `register_json_backend` method. The
+            `auto` backend is the first installed library of `orjson`, `ujson`, and
+            `json`. Default is `json`.
+
+    Example:
+        >>> cp.set_json_backend('json')
+        >>> cp.set_json_backend()
+
+    Raises:
+        ValueError: When the backend is not a known backend.
+        ImportError: When the JSON library of the backend is not installed.
+    """
+    get_json_backend(backend)
+    BACKEND["default"] = backend
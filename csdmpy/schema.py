@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""Single-pass validation of the CSDM documents.
+
+The key and value checks of the CSDM, Dimension, DependentVariable, and
+SparseSampling objects are compiled, at import, into the sets of allowed and
+required keys of each object and subtype. The `validate_document` method checks a
+parsed document in one traversal, before any object is instantiated, and raises the
+same errors as the respective class initializers.
+"""
+from csdmpy.utils import validate  # lgtm [py/import-own-module]
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = [
+    "validate_document",
+    "check_root",
+    "check_dimension",
+    "check_dependent_variable",
+    "check_sparse_sampling",
+]
+
+# The keys of the csdm object.
+CSDM_REQUIRED = ("version",)
+CSDM_KEYS = frozenset(
+    [
+        "read_only",
+        "timestamp",
+        "geographic_coordinate",
+        "application",
+        "tags",
+        "description",
+    ]
+    + list(CSDM_REQUIRED)
+)
+
+# The required keys of the dimension subtypes, with the name of the class.
+DIMENSION_TYPES = {
+    "linear": ("LinearDimension", ("increment", "count")),
+    "monotonic": ("MonotonicDimension", ("coordinates",)),
+    "labeled": ("LabeledDimension", ("labels",)),
+}
+
+# The required keys of the dependent variable subtypes.
+DEPENDENT_VARIABLE_TYPES = {
+    "internal": ("components",),
+    "external": ("components_url",),
+}
+
+SPARSE_SAMPLING_REQUIRED = ("dimension_indexes", "sparse_grid_vertexes")
+UNSIGNED_INTEGER_TYPES = frozenset(["uint8", "uint16", "uint32", "uint64"])
+
+
+def check_root(dictionary):
+    """Check the root level keys and the values of the csdm object.
+
+    Args:
+        dictionary: A CSDM compliant python dictionary.
+    """
+    if "CSDM" in dictionary:
+        raise KeyError(
+            "'CSDM' is not a valid keyword for the CSD model. Did you mean 'csdm'?"
+        )
+
+    if "csdm" not in dictionary:
+        raise KeyError("Missing a required `csdm` key from the data model.")
+
+    csdm = dictionary["csdm"]
+    for item in csdm:
+        # only the unknown keys are lowercased.
+        if item not in CSDM_KEYS:
+            lower = item.lower()
+            if lower in CSDM_KEYS:
+                raise KeyError(
+                    f"{item} is an invalid key for the CSDM object. "
+                    f"Did you mean '{lower}'?"
+                )
+
+    for item in CSDM_REQUIRED:
+        if item not in csdm:
+            raise KeyError(f"Missing a required `{item}` key from the CSDM object.")
+
+    validate(csdm["version"], "version", str)
+    if "timestamp" in csdm:
+        validate(csdm["timestamp"], "timestamp", str)
+
+
+def check_dimension(dictionary):
+    """Check the keys and the values of a Dimension object.
+
+    Args:
+        dictionary: A python dictionary of the Dimension object.
+    """
+    if "type" not in dictionary:
+        raise KeyError("Missing a required 'type' key from the Dimension object.")
+
+    type_ = dictionary["type"]
+    if type_ not in DIMENSION_TYPES:
+        raise ValueError(
+            f"The value, '{type_}', is invalid for the `type` attribute of the "
+            "Dimension object. The allowed values are 'monotonic', 'linear' and "
+            "'labeled'."
+        )
+
+    name, required = DIMENSION_TYPES[type_]
+    for item in required:
+        if dictionary.get(item, None) is None:
+            raise KeyError(f"Missing a required `{item}` key from the {name} object.")
+
+    if type_ == "linear":
+        validate(dictionary["count"], "count", int)
+
+
+def check_dependent_variable(dictionary):
+    """Check the keys and the values of a DependentVariable object.
+
+    Args:
+        dictionary: A python dictionary of the DependentVariable object.
+    """
+    if "type" not in dictionary:
+        raise KeyError(
+            "Missing a required `type` key from the DependentVariable object."
+        )
+
+    type_ = dictionary["type"]
+    if type_ not in DEPENDENT_VARIABLE_TYPES:
+        raise ValueError(
+            f"The value, '{type_}', is an invalid `type` for the DependentVariable "
+            "objects. The allowed values are 'internal', 'external'."
+        )
+
+    if "quantity_type" not in dictionary:
+        raise KeyError(
+            "Missing a required `quantity_type` key from the DependentVariable "
+            "object."
+        )
+
+    if type_ == "external" and "encoding" in dictionary:
+        raise KeyError(
+            "The `encoding` key is invalid for DependentVariable objects with the "
+            "`external` type."
+        )
+
+    for item in DEPENDENT_VARIABLE_TYPES[type_]:
+        if item not in dictionary:
+            raise KeyError(
+                f"Missing a required `{item}` key from the DependentVariable "
+                f"object of type, `{type_}`."
+            )
+
+    if "sparse_sampling" in dictionary:
+        check_sparse_sampling(dictionary["sparse_sampling"])
+
+
+def check_sparse_sampling(dictionary):
+    """Check the keys and the values of a SparseSampling object.
+
+    Args:
+        dictionary: A python dictionary of the SparseSampling object.
+    """
+    for item in SPARSE_SAMPLING_REQUIRED:
+        if item not in dictionary:
+            raise KeyError(_sparse_sampling_message(item))
+
+    encoding = dictionary.get("encoding", "none")
+    if encoding != "none" and "unsigned_integer_type" not in dictionary:
+        raise KeyError(_sparse_sampling_message("unsigned_integer_type"))
+
+    if "unsigned_integer_type" in dictionary:
+        uint_value = dictionary["unsigned_integer_type"]
+        if uint_value not in UNSIGNED_INTEGER_TYPES:
+            raise ValueError(
+                f"{uint_value} is an invalid `unsigned_integer_type` enumeration "
+                "literal. The allowed values are `uint8`, `uint16`, `uint32`, "
+                "and `uint64`."
+            )
+
+
+def _sparse_sampling_message(item):
+    return (
+        f"Missing a required `{item}` key from the SparseSampling object of the "
+        "DependentVariable object."
+    )
+
+
+def validate_document(dictionary):
+    """Validate a parsed CSDM document in a single traversal.
+
+    The root, the dimensions, and the dependent variables, with the sparse sampling,
+    are checked in the order of the document. The components are not accessed.
+
+    Args:
+        dictionary: A CSDM compliant python dictionary.
+
+    Raises:
+        KeyError: When a required key is missing or a key is invalid.
+        ValueError: When the value of an enumerated key is invalid.
+        TypeError: When the value of a key is of an invalid type.
+    """
+    check_root(dictionary)
+    csdm = dictionary["csdm"]
+    for item in csdm.get("dimensions", ()):
+        check_dimension(item)
+    for item in csdm.get("dependent_variables", ()):
+        check_dependent_variable(item)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""Load the CSDM files from in-memory buffers, file-like objects, and zip archives.
+
+The sources other than a filename or a url are read without temporary files. A
+bytes-like object or the content of a file-like object is parsed in memory, either
+as a JSON serialized CSDM file, a `.csdfb` container, or a zip archive, detected from
+the leading bytes. The CSDM file in a zip archive is a member of the archive, and
+the relative `components_url` of its external dependent variables refer to the
+sibling members of the archive.
+"""
+import io
+import os
+import posixpath
+import zipfile
+
+from csdmpy import container  # lgtm [py/import-own-module]
+from csdmpy import streaming  # lgtm [py/import-own-module]
+from csdmpy.dependent_variables.archive import ArchiveMember  # lgtm [py/import-own-module] # NOQA
+from csdmpy.json_backend import get_json_backend  # lgtm [py/import-own-module]
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["is_source", "load_source", "close_archive"]
+
+ZIP_MAGIC = b"PK\x03\x04"
+EXTENSIONS = (".csdf", ".csdfe", ".csdfb")
+
+
+def is_source(source):
+    """Return True if the source is loaded with the `load_source` method, that is,
+    the source is a bytes-like object, a file-like object, a zip archive, or the
+    local address of a `.zip` file, and False for the other filenames and urls.
+
+    Raises:
+        TypeError: When the source is neither a filename nor a valid source.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        filename = os.fspath(source)
+        return os.path.splitext(filename)[1].lower() == ".zip" and os.path.isfile(
+            filename
+        )
+    if isinstance(source, zipfile.ZipFile) or hasattr(source, "read"):
+        return True
+    try:
+        memoryview(source)
+    except TypeError:
+        raise TypeError(
+            f"A source of type `{type(source).__name__}` is not supported. The "
+            "source is a filename, a url, a bytes-like object, a file-like object, "
+            "or a zipfile.ZipFile instance."
+        ) from None
+    return True
+
+
+def load_source(
+    source,
+    member=None,
+    stream=True,
+    components=True,
+    workers=None,
+    mmap=False,
+    json_backend=None,
+):
+    """Parse the CSDM file from the source and return a python dictionary.
+
+    Args:
+        source: A bytes-like object, a binary or text file-like object, a
+            zipfile.ZipFile instance, or the local address of a `.zip` file.
+        member: The name of the CSDM file in the zip archive. Default is None, that
+            is, the only `.csdf`, `.csdfe`, or `.csdfb` member of the archive.
+        stream: If False, the encoded components are kept as is.
+        components: If False, skip the components arrays.
+        workers: The number of threads used for decoding the components arrays.
+        mmap: If True, the stored members of an archive file are memory-mapped.
+        json_backend: The JSON backend parsing the metadata.
+
+    Returns:
+        A python dictionary, along with the `filename` key, which is the
+        ArchiveMember of the CSDM file for the archives, and None otherwise.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        source = zipfile.ZipFile(source)
+
+    buffer = None
+    if not isinstance(source, zipfile.ZipFile):
+        source, buffer = _open(source)
+
+    if isinstance(source, zipfile.ZipFile):
+        item = ArchiveMember(source, _member_name(source, member), buffer)
+        dictionary = parse(item.read(mmap), stream, components, workers, json_backend)
+        dictionary["filename"] = item
+        return dictionary
+
+    if member is not None:
+        raise ValueError("The `member` argument is only valid for the zip archives.")
+    dictionary = parse(buffer, stream, components, workers, json_backend)
+    dictionary["filename"] = None
+    return dictionary
+
+
+def close_archive(source, filename):
+    """Close the zip archive of the ArchiveMember, `filename`, of the dictionary
+    returned by the `load_source` method, unless the archive is the source, that is,
+    a zipfile.ZipFile instance of the caller."""
+    if isinstance(filename, ArchiveMember) and filename.archive is not source:
+        filename.archive.close()
+
+
+def parse(buffer, stream=True, components=True, workers=None, json_backend=None):
+    """Parse a JSON serialized CSDM file or a `.csdfb` container from a bytes-like
+    buffer and return a python dictionary. The components of a container are numpy
+    arrays over the buffer, without copies."""
+    buffer = memoryview(buffer).cast("B")
+    if container.is_container(buffer):
+        return container.parse_container(buffer, components)
+
+    # the JSON document is searched in the bytes object, or in the view, without
+    # copies.
+    document = buffer.obj
+    if not isinstance(document, bytes) or len(document) != buffer.nbytes:
+        document = buffer
+    if stream:
+        return streaming.parse_json(document, components, workers, json_backend)
+    # the encoded components are kept, and the document is parsed as a whole.
+    return get_json_backend(json_backend).loads(bytes(document))
+
+
+def _open(source):
+    """Return the zip archive, or the content of a non-archive source, as a
+    (source, buffer) tuple, where buffer is the content of the source, if in memory.
+    """
+    if hasattr(source, "read"):
+        # a seekable binary file holding an archive is read by the zipfile module.
+        if _is_seekable_archive(source):
+            return zipfile.ZipFile(source), None
+        source = source.read()
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+
+    buffer = memoryview(source).cast("B")
+    if bytes(buffer[: len(ZIP_MAGIC)]) == ZIP_MAGIC:
+        return zipfile.ZipFile(BufferFile(buffer)), buffer
+    return buffer, buffer
+
+
+class BufferFile(io.RawIOBase):
+    """A read-only binary file over a bytes-like buffer, read without copies of the
+    buffer."""
+
+    def __init__(self, buffer):
+        """Instantiate a BufferFile class instance."""
+        super().__init__()
+        self._buffer = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        start = min(self._position, len(self._buffer))
+        data = self._buffer[start : start + len(b)]
+        b[: len(data)] = data
+        self._position = start + len(data)
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}.")
+        self._position = offset
+        return offset
+
+    def tell(self):
+        return self._position
+
+
+def _is_seekable_archive(file):
+    try:
+        if not file.seekable():
+            return False
+        position = file.tell()
+        magic = file.read(len(ZIP_MAGIC))
+        file.seek(position)
+    except (AttributeError, OSError):
+        return False
+    return isinstance(magic, bytes) and magic == ZIP_MAGIC
+
+
+def _member_name(archive, member):
+    """Return the name of the CSDM file in the archive."""
+    names = archive.namelist()
+    if member is not None:
+        if member not in names:
+            raise FileNotFoundError(f"`{member}` is not a member of the archive.")
+        return member
+
+    candidates = [
+        name
+        for name in names
+        if posixpath.splitext(name)[1].lower() in EXTENSIONS
+    ]
+    if len(candidates) != 1:
+        found = "no" if candidates == [] else f"{len(candidates)}"
+        raise ValueError(
+            f"Found {found} .csdf/.csdfe/.csdfb files in the archive. Use the "
+            "`member` argument to select the CSDM file."
+        )
+    return candidates[0]
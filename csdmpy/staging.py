@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Atomic, crash-safe writing of the files of a save through staged temporary files.
+
+Every output file is written to a temporary file in the directory of the file, with
+large buffered writes, and synced to the disk. Once all the files are written, the
+temporary files are renamed over the output files in the order in which they were
+staged, the data files first and the header last, such that a crash leaves either
+the previous or the new files, and never a truncated file.
+"""
+import contextlib
+import os
+import secrets
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["Staging", "open_output"]
+
+# The size in bytes of the write buffers of the staged files.
+BUFFER_SIZE = 2 ** 20
+
+# The flags of the new temporary files. The files are created with the permissions
+# 0o666, less the umask of the process, as with `open`.
+_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+
+class Staging:
+    """
+    Stage the output files of a save in temporary files and commit them atomically.
+
+    Used as a context manager, the staged files are committed on exit, or removed
+    when an exception is raised, leaving the output files untouched.
+
+    Args:
+        sync: If False, the files and the renames are not synced to the disk. The
+            readers see either the previous or the new files, but a crash may leave
+            the new files incomplete. Default is True.
+
+    Example:
+        >>> with Staging() as staging: # doctest: +SKIP
+        ...     with staging.open('file_0.dat') as f:
+        ...         f.write(data)
+        ...     with staging.open('file.csdfe', 'w', encoding='utf8') as f:
+        ...         f.write(header)
+    """
+
+    __slots__ = ("_files", "_sync")
+
+    def __init__(self, sync=True):
+        """Instantiate a Staging class instance."""
+        self._files = []
+        self._sync = sync
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.commit()
+        finally:
+            self.abort()
+
+    @contextlib.contextmanager
+    def open(self, filename, mode="wb", **kwargs):
+        """Open a temporary file in the directory of the filename, staged to replace
+        the filename on commit. The file is flushed and synced to the disk on close,
+        unless the staging is not synced.
+
+        Args:
+            filename: The address of the output file.
+            mode: The mode of the file, `wb` or `w`.
+            kwargs: The keyword arguments of the `open` method, such as `encoding`.
+        """
+        filename = os.path.abspath(filename)
+        descriptor, temporary = _create(filename)
+        self._files.append((temporary, filename))
+        try:
+            # the replaced file keeps its permissions.
+            with contextlib.suppress(FileNotFoundError):
+                os.chmod(temporary, os.stat(filename).st_mode & 0o7777)
+            file = os.fdopen(descriptor, mode, buffering=BUFFER_SIZE, **kwargs)
+        except BaseException:
+            os.close(descriptor)
+            raise
+        with file:
+            yield file
+            if self._sync:
+                file.flush()
+                os.fsync(file.fileno())
+
+    def commit(self):
+        """Rename the staged files over the output files, in the order of staging.
+        The renames of the data files are synced to the disk before the last staged
+        file, the header, is renamed. A staged file is released once renamed, such
+        that the files left after a failed rename are removed by `abort`."""
+        directories = set()
+        while len(self._files) > 1:
+            temporary, filename = self._files[0]
+            os.replace(temporary, filename)
+            self._files.pop(0)
+            directories.add(os.path.dirname(filename))
+        if self._sync:
+            for directory in directories:
+                _sync_directory(directory)
+        if self._files:
+            temporary, filename = self._files[0]
+            os.replace(temporary, filename)
+            self._files.pop(0)
+            if self._sync:
+                _sync_directory(os.path.dirname(filename))
+
+    def abort(self):
+        """Remove the staged files. The output files are left untouched."""
+        files, self._files = self._files, []
+        for temporary, _ in files:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temporary)
+
+
+def open_output(filename, mode="wb", staging=None, **kwargs):
+    """Return the file object of the output file, opened directly, or staged, when
+    `staging` is a Staging instance."""
+    if staging is None:
+        return open(filename, mode, **kwargs)
+    return staging.open(filename, mode, **kwargs)
+
+
+def _create(filename):
+    """Create a new temporary file, `.<name>.<random>.part`, in the directory of the
+    filename and return the (descriptor, path) tuple."""
+    directory, name = os.path.split(filename)
+    while True:
+        temporary = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.part")
+        try:
+            return os.open(temporary, _FLAGS, 0o666), temporary
+        except FileExistsError:
+            continue
+
+
+def _sync_directory(directory):
+    """Sync the entries of the directory to the disk, where supported."""
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+"""Incremental reader and writer for the JSON serialized CSDM files."""
+import base64
+import json
+import mmap
+import re
+import uuid
+import warnings
+
+import numpy as np
+
+from csdmpy.dependent_variables.decoder import (
+    check_number_of_components_and_encoding_type,
+)
+from csdmpy.dependent_variables.decoder import base64_decoded_size
+from csdmpy.dependent_variables.decoder import decode_base64_into
+from csdmpy.json_backend import get_json_backend
+from csdmpy.utils import NumericType
+from csdmpy.utils import parallel_map
+from csdmpy.utils import QuantityType
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["load_json", "parse_json", "dump_json"]
+
+# A JSON string, or a character opening or closing an object or an array.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]')
+_WHITESPACE = re.compile(rb"\s*")
+_KEY_SEPARATOR = re.compile(rb"\s*:\s*")
+
+# Path of the components array from the root of the document, as a list of the
+# (container, current key) pairs.
+_COMPONENTS_PATH = [
+    ["{", "csdm"],
+    ["{", "dependent_variables"],
+    ["[", None],
+    ["{", "components"],
+]
+
+# The number of bytes of text parsed at a time.
+CHUNK_SIZE = 2 ** 22
+
+# The number of component values serialized at a time. The number of bytes per chunk
+# is a multiple of 3, such that the base64 encoded chunks concatenate as one string.
+WRITE_CHUNK_SIZE = 3 * 2 ** 16
+
+
+def load_json(filename, components=True, workers=None, json_backend=None):
+    """
+    Parse a JSON serialized CSDM file and return a python dictionary.
+
+    Unlike `json.load`, the document is read through a memory-map and only the
+    metadata is parsed as python objects. The `components` arrays of the dependent
+    variables, encoded as `none` or `base64`, are decoded straight from the file
+    into numpy arrays of shape (p, N), allocated once. When `components` is False,
+    the components arrays are skipped and replaced with a list of None, one for each
+    component.
+
+    Args:
+        filename: The local address of the file.
+        components: If False, skip the components arrays.
+        workers: The number of threads used for decoding the components arrays, one
+            dependent variable per thread.
+        json_backend: The JSON backend parsing the metadata, see the
+            `csdmpy.json_backend` module. Default is the default backend.
+
+    Returns:
+        A python dictionary.
+    """
+    with open(filename, "rb") as f:
+        f.seek(0, 2)
+        if f.tell() == 0:
+            return json.loads(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return parse_json(buffer, components, workers, json_backend)
+
+
+def parse_json(buffer, components=True, workers=None, json_backend=None):
+    """
+    Parse a JSON serialized CSDM document from a buffer, a bytes object, a memory
+    map, or a memoryview, and return a python dictionary. The buffer is not copied.
+    See `load_json` for the description of the arguments.
+    """
+    loads = get_json_backend(json_backend).loads
+    return _StreamParser(buffer, loads).parse(components, workers)
+
+
+class _StreamParser:
+    """Scan the structure of a JSON document and locate the components arrays."""
+
+    __slots__ = ("buffer", "regions", "loads")
+
+    def __init__(self, buffer, loads=json.loads):
+        self.buffer = buffer
+        self.regions = {}
+        self.loads = loads
+
+    def parse(self, components=True, workers=None):
+        skeleton = self._scan()
+        dictionary = self.loads(skeleton)
+        # the regions are only located in the documents with dependent variables,
+        # the invalid documents are reported on validation.
+        regions = []
+        if self.regions:
+            dependent_variables = dictionary["csdm"]["dependent_variables"]
+            regions = [
+                (dependent_variables[i], rows) for i, rows in self.regions.items()
+            ]
+        if components:
+            decoded = parallel_map(self._decode_region, regions, workers)
+        else:
+            decoded = [[None] * len(rows) for _, rows in regions]
+        for (variable, _), item in zip(regions, decoded):
+            variable["components"] = item
+        return dictionary
+
+    def _decode_region(self, region):
+        return self._decode(*region)
+
+    def _scan(self):
+        """Return the document with the components arrays replaced by null."""
+        buffer = self.buffer
+        stack, segments = [], []
+        position = start = 0
+        index = -1
+        while True:
+            match = _TOKEN.search(buffer, position)
+            if match is None:
+                break
+            token = match.group()
+            position = match.end()
+
+            if token in (b"{", b"["):
+                if token == b"{" and stack == _COMPONENTS_PATH[:3]:
+                    index += 1
+                stack.append([token.decode(), None])
+                continue
+
+            if token in (b"}", b"]"):
+                if stack:
+                    stack.pop()
+                continue
+
+            separator = _KEY_SEPARATOR.match(buffer, position)
+            if separator is None or not stack:
+                continue
+
+            stack[-1][1] = json.loads(token)
+            if stack != _COMPONENTS_PATH or buffer[separator.end()] != ord("["):
+                continue
+
+            rows, end = self._components_rows(separator.end())
+            self.regions[index] = rows
+            value = separator.end()
+            segments += [buffer[start:value], b"null"]
+            position = start = end
+
+        segments.append(buffer[start:])
+        return b"".join(segments)
+
+    def _components_rows(self, position):
+        """Locate the rows of a components array starting at `position`.
+
+        Returns a list of (kind, start, end) tuples, where kind is `none` for an array
+        of numbers and `base64` for a string, and the position after the array.
+        """
+        buffer = self.buffer
+        rows = []
+        position += 1
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+            char = bytes([buffer[position]])
+            if char == b"]":
+                return rows, position + 1
+            if char == b",":
+                position += 1
+            elif char == b"[":
+                end = _find(buffer, b"]", position)
+                rows.append(("none", position + 1, end))
+                position = end + 1
+            elif char == b'"':
+                # a base64 string has no quotes or escaped quotes.
+                end = _find(buffer, b'"', position + 1)
+                rows.append(("base64", position + 1, end))
+                position = end + 1
+            else:
+                raise ValueError(
+                    f"Unexpected character, {char}, at position {position} of the "
+                    "components array."
+                )
+
+    def _decode(self, variable, rows):
+        """Decode the rows as a (p, N) numpy array, or as python objects when the
+        metadata of the dependent variable is invalid."""
+        try:
+            quantity_type = QuantityType(variable["quantity_type"])
+            dtype = NumericType(variable["numeric_type"]).dtype
+            encoding = variable.get("encoding", "none")
+            check_number_of_components_and_encoding_type(len(rows), quantity_type)
+            if {kind for kind, *_ in rows} != {encoding}:
+                raise ValueError(f"Components are not `{encoding}` encoded.")
+            if encoding == "base64":
+                return self._decode_base64(rows, dtype)
+            return self._decode_none(rows, dtype)
+        except Exception:
+            # fall back to the python objects, the errors are raised on validation.
+            return [self.loads(self._row_text(*row)) for row in rows]
+
+    def _row_text(self, kind, start, end):
+        if kind == "none":
+            return b"[" + bytes(self.buffer[start:end]) + b"]"
+        return b'"' + bytes(self.buffer[start:end]) + b'"'
+
+    def _decode_base64(self, rows, dtype):
+        buffer = self.buffer
+        sizes = [base64_decoded_size(buffer, start, end) for _, start, end in rows]
+        if len(set(sizes)) != 1 or sizes[0] % dtype.itemsize != 0:
+            raise ValueError("Inconsistent length of base64 encoded components.")
+
+        components = np.empty((len(rows), sizes[0] // dtype.itemsize), dtype=dtype)
+        for row, (_, start, end) in zip(components, rows):
+            decode_base64_into(buffer, start, end, row)
+        return components
+
+    def _decode_none(self, rows, dtype):
+        # complex numbers are serialized as interleaved real and imaginary parts.
+        values, parse_dtype = 1, dtype
+        if dtype.kind == "c":
+            values, parse_dtype = 2, np.dtype(f"<f{dtype.itemsize // 2}")
+
+        counts = [self._count(start, end) for _, start, end in rows]
+        if len(set(counts)) != 1 or counts[0] % values != 0:
+            raise ValueError("Inconsistent number of components values.")
+
+        components = np.empty((len(rows), counts[0]), dtype=parse_dtype)
+        for row, (_, start, end) in zip(components, rows):
+            self._parse_numbers(start, end, row)
+        return components.view(dtype)
+
+    def _count(self, start, end):
+        """Return the number of comma separated values between start and end."""
+        buffer = self.buffer
+        if _WHITESPACE.match(buffer, start).end() >= end:
+            return 0
+        count = 1
+        for offset in range(start, end, CHUNK_SIZE):
+            stop = min(offset + CHUNK_SIZE, end)
+            count += bytes(buffer[offset:stop]).count(b",")
+        return count
+
+    def _parse_numbers(self, start, end, out):
+        """Parse comma separated numbers between start and end into out."""
+        buffer = self.buffer
+        dtype = np.dtype("<f8") if out.dtype.kind == "f" else out.dtype
+        filled = 0
+        while start < end:
+            # the chunk ends before a comma, the next chunk starts after the comma.
+            stop = min(start + CHUNK_SIZE, end)
+            if stop < end:
+                stop = _rfind(buffer, b",", start, stop)
+                stop = end if stop == -1 else stop
+            values = _parse_text(bytes(buffer[start:stop]), dtype)
+            size = filled + values.size
+            out[filled:size] = values
+            filled, start = size, stop + 1
+        if filled != out.size:
+            raise ValueError("Inconsistent number of components values.")
+
+
+def _find(buffer, sub, start):
+    """Return the lowest index of sub in the buffer from start, or -1. A memoryview
+    is searched without copies."""
+    if not isinstance(buffer, memoryview):
+        return buffer.find(sub, start)
+    match = re.compile(re.escape(sub)).search(buffer, start)
+    return -1 if match is None else match.start()
+
+
+def _rfind(buffer, sub, start, end):
+    """Return the highest index of sub in buffer[start:end], or -1."""
+    if not isinstance(buffer, memoryview):
+        return buffer.rfind(sub, start, end)
+    index = bytes(buffer[start:end]).rfind(sub)
+    return -1 if index == -1 else start + index
+
+
+def _parse_text(text, dtype):
+    """Parse comma separated numbers in text as a numpy array of type dtype."""
+    if text.isspace() or text == b"":
+        return np.empty(0, dtype=dtype)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=dtype, sep=",")
+        except (ValueError, DeprecationWarning):
+            # values such as `1.0` for integer types.
+            return np.asarray(json.loads(b"[" + text + b"]"), dtype=dtype)
+
+
+def dump_json(
+    dictionary, dependent_variables, output_device, indent=0, json_backend=None
+):
+    """
+    Serialize the CSDM dictionary as JSON to the output_device, a text file-like
+    object.
+
+    The dictionary is expected to be generated without the `none` and `base64`
+    encoded components, see the `encode_components` argument of the `_dict` method
+    of the CSDM object. The components of the `dependent_variables` are instead
+    written to the output_device in chunks of `WRITE_CHUNK_SIZE` values, without
+    serializing the full components array in memory.
+
+    Args:
+        dictionary: A python dictionary of the CSDM object.
+        dependent_variables: A list of the DependentVariable objects.
+        output_device: A text file-like object.
+        indent: The indentation level of the JSON metadata.
+        json_backend: The JSON backend serializing the metadata, see the
+            `csdmpy.json_backend` module. Default is the default backend.
+    """
+    token = f"csdmpy-components-{uuid.uuid4().hex}"
+    variables = dictionary["csdm"]["dependent_variables"]
+    streamed = []
+    for i, variable in enumerate(variables):
+        if variable["type"] == "internal" and "components" not in variable:
+            variable["components"] = f"{token}-{i}"
+            streamed.append(i)
+
+    text = get_json_backend(json_backend).dumps(dictionary, indent=indent)
+    for i in streamed:
+        placeholder = f'"{token}-{i}"'
+        head, text = text.split(placeholder, 1)
+        output_device.write(head)
+        _write_components(dependent_variables[i].subtype, output_device)
+    output_device.write(text)
+
+
+def _write_components(subtype, output_device):
+    """Write the components of the dependent variable as a JSON array."""
+    components = subtype.ravel_data()
+    base64_encoded = subtype.encoding == "base64"
+
+    output_device.write("[")
+    for i, row in enumerate(components):
+        output_device.write(", " if i else "")
+        if base64_encoded:
+            _write_base64(row, output_device)
+        else:
+            _write_numbers(row, output_device)
+    output_device.write("]")
+
+
+def _write_base64(row, output_device):
+    output_device.write('"')
+    data = memoryview(row).cast("B")
+    step = WRITE_CHUNK_SIZE * row.itemsize
+    for start in range(0, data.nbytes, step):
+        stop = start + step
+        output_device.write(base64.b64encode(data[start:stop]).decode())
+    output_device.write('"')
+
+
+def _write_numbers(row, output_device):
+    output_device.write("[")
+    for start in range(0, row.size, WRITE_CHUNK_SIZE):
+        stop = start + WRITE_CHUNK_SIZE
+        chunk = row[start:stop]
+        if chunk.dtype.kind == "f" and not np.all(np.isfinite(chunk)):
+            raise ValueError("Out of range float values are not JSON compliant")
+        output_device.write(", " if start else "")
+        output_device.write(", ".join(map(repr, chunk.tolist())))
+    output_device.write("]")
@@ -2,6 +2,7 @@
 """Helper methods for CSDM class."""
 from __future__ import print_function
 
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 
 import numpy as np
@@ -333,6 +334,24 @@ def numpy_dtype_to_numeric_type(element):
     raise ValueError("The dtype, {0}, is not supported.".format(element))
 
 
+def parallel_map(function, iterable, workers=None):
+    """Apply the function to every item of the iterable on a pool of `workers`
+    threads and return the list of results, in the order of the items. When
+    `workers` is None or 1, the items are processed in the calling thread."""
+    if workers is not None:
+        validate(workers, "workers", int)
+        if workers < 1:
+            raise ValueError(
+                f"The number of workers must be at least 1, got {workers}."
+            )
+
+    if workers is None or workers == 1:
+        return [function(item) for item in iterable]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, iterable))
+
+
 def check_and_assign_bool(element):
     if element is None:
         return False
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Append-only writer of the .csdfe files for live acquisitions."""
+import datetime
+import json
+import os
+
+import numpy as np
+
+import csdmpy as cp  # lgtm [py/import-own-module]
+from csdmpy.dependent_variables import DependentVariable
+from csdmpy.dependent_variables.download import get_relative_url_path
+from csdmpy.dependent_variables.integrity import ChecksumWriter
+from csdmpy.dependent_variables.integrity import KEY
+from csdmpy.staging import Staging
+from csdmpy.utils import validate
+
+__author__ = "Deepansh J. Srivastava"
+__email__ = "srivastava.89@osu.edu"
+__all__ = ["CSDMWriter"]
+
+
+class CSDMWriter:
+    r"""
+    Write a .csdfe file one frame at a time along an outer linear dimension.
+
+    Every frame holds the components of each dependent variable over the inner
+    dimensions. A frame is appended to the external `.dat` files of the dependent
+    variables, followed by an update of the `count` of the outer dimension in the
+    JSON file, such that writing N frames costs O(N). The JSON file is replaced
+    atomically after the data of the frame is written, and the file is loadable with
+    ``cp.load`` while writing is in progress, holding the frames appended so far.
+    The header of a file in progress marks the dependent variables as such, and the
+    partially written trailing frame of the `.dat` files is ignored on load. The
+    header with no frames is written before the `.dat` files are created, and the
+    final header, written on close, records the size and the SHA-256 checksum of the
+    `.dat` files, see the `verify` argument of ``cp.load``.
+
+    The `.dat` files store the components of every dependent variable as a single
+    contiguous array, therefore, only the dependent variables with one component,
+    such as the `scalar` quantity type, are supported.
+
+    Example:
+        >>> inner = cp.LinearDimension(count=1024, increment="0.1")
+        >>> outer = cp.LinearDimension(count=1, increment="1")
+        >>> variable = {"quantity_type": "scalar", "numeric_type": "float32"}
+        >>> with cp.CSDMWriter(
+        ...     "live.csdfe", dimensions=[inner, outer], dependent_variables=[variable]
+        ... ) as writer:  # doctest: +SKIP
+        ...     for frame in spectrometer:
+        ...         writer.append(frame)
+
+    Args:
+        filename (str): The local address of the .csdfe file.
+        dimensions: A list of Dimension objects or python dictionaries. The last
+                dimension is the outer dimension, along which the frames are
+                appended, and must be a linear dimension. Its `count` is replaced by
+                the number of appended frames.
+        dependent_variables: A list of DependentVariable objects or python
+                dictionaries with the metadata of the dependent variables, such as
+                the `quantity_type`, `numeric_type`, `unit`, and `name`. The
+                components, if any, are ignored.
+        description (str): The description of the dataset.
+    """
+
+    def __init__(self, filename, dimensions, dependent_variables, description=""):
+        """Instantiate a CSDMWriter class instance."""
+        validate(dimensions, "dimensions", (list, tuple))
+        validate(dependent_variables, "dependent_variables", (list, tuple))
+        if len(dimensions) == 0:
+            raise ValueError("The outer dimension is required.")
+
+        template = cp.new(description)
+        for dimension in dimensions:
+            template.add_dimension(dimension)
+        outer = template.dimensions[-1]
+        if outer.type != "linear":
+            raise ValueError(
+                f"The outer dimension must be a linear dimension, found `{outer.type}`."
+            )
+        outer.count = 1
+        self.frame_size = int(np.prod(template.shape[:-1], dtype=int))
+        self.filename = filename
+        self.count = 0
+
+        self._header = template._dict(encode_components=None)
+        self._dtypes = []
+        self._files = []
+        for i, variable in enumerate(dependent_variables):
+            item, dtype = _external_dict(variable, i, filename)
+            self._header["csdm"]["dependent_variables"].append(item)
+            self._dtypes.append(dtype)
+
+        # the header with no frames replaces the previous file, if any, before the
+        # data files are created, and only after the metadata is validated.
+        self._write_header()
+        for i in range(len(self._dtypes)):
+            _, absolute_path = get_relative_url_path(i, filename)
+            self._files.append(ChecksumWriter(open(absolute_path, "wb")))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        """Return True if the writer is closed."""
+        return self._files is None
+
+    def append(self, *frames):
+        """
+        Append a frame, one array per dependent variable in order, each holding the
+        components of the dependent variable over the inner dimensions.
+
+        Args:
+            frames: The numpy arrays of the frame, one for each dependent variable.
+                The size of every array is the number of points of the inner
+                dimensions.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on a closed CSDMWriter.")
+        if len(frames) != len(self._files):
+            raise ValueError(
+                f"Expecting {len(self._files)} arrays per frame, one per dependent "
+                f"variable, found {len(frames)}."
+            )
+
+        data = [
+            np.ascontiguousarray(item, dtype)
+            for item, dtype in zip(frames, self._dtypes)
+        ]
+        for item in data:
+            if item.size != self.frame_size:
+                raise ValueError(
+                    f"The size of the frame, {item.size}, is not equal to the number "
+                    f"of points of the inner dimensions, {self.frame_size}."
+                )
+
+        for output, item in zip(self._files, data):
+            output.write(item)
+            output.file.flush()
+        self.count += 1
+        self._write_header()
+
+    def close(self):
+        """Flush the data files to the disk and write the final header."""
+        if self.closed:
+            return
+        checksums = []
+        for output in self._files:
+            output.file.flush()
+            os.fsync(output.file.fileno())
+            output.file.close()
+            checksums.append(output.checksum())
+        self._files = None
+        self._write_header(checksums)
+
+    def _write_header(self, checksums=None):
+        """Replace the JSON file with the header of the appended frames, staged such
+        that readers see either the previous or the new header. The final header,
+        with the checksums of the data files, is synced to the disk."""
+        csdm = self._header["csdm"]
+        csdm["dimensions"][-1]["count"] = self.count
+        csdm["timestamp"] = datetime.datetime.utcnow().isoformat()[:-7] + "Z"
+        for i, item in enumerate(csdm["dependent_variables"]):
+            metadata = {"in_progress": True} if checksums is None else checksums[i]
+            item["application"] = dict(item.get("application", {}), **{KEY: metadata})
+
+        with Staging(sync=checksums is not None) as staging:
+            with staging.open(self.filename, "w", encoding="utf8") as file:
+                json.dump(self._header, file, ensure_ascii=False, allow_nan=False)
+
+
+def _external_dict(variable, index, filename):
+    """Return the dictionary of the dependent variable as an external dependent
+    variable, stored in the `filename_index.dat` file, and its numpy dtype."""
+    if not isinstance(variable, DependentVariable):
+        validate(variable, f"dependent_variables[{index}]", dict)
+        item = dict(variable, type="internal", components=np.zeros(0))
+        item.pop("components_url", None)
+        variable = DependentVariable(**item)
+
+    if variable.subtype._quantity_type.p != 1:
+        raise ValueError(
+            "CSDMWriter supports dependent variables with one component only, found "
+            f"quantity_type `{variable.quantity_type}`."
+        )
+
+    item = variable._dict(encode_components=None)
+    item.pop("encoding", None)
+    url_relative_path, _ = get_relative_url_path(index, filename)
+    item.update(type="external", components_url=url_relative_path)
+    return item, variable.subtype._numeric_type.dtype
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy import batch
+
+
+def make_datasets(tmp_path, count):
+    objects = []
+    for i in range(count):
+        data = cp.as_csdm(np.arange(10 * (i + 1), dtype=np.float64).reshape(-1, 10))
+        data.y[0].encoding = "raw" if i % 2 else "base64"
+        objects.append(data)
+    filenames = [
+        str(tmp_path / (f"batch_{i}.csdf" + ("e" if i % 2 else "")))
+        for i in range(count)
+    ]
+    return objects, filenames
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_save_and_load_many(tmp_path, monkeypatch, executor):
+    # the items are submitted as the workers become available.
+    monkeypatch.setattr(batch, "PENDING_PER_WORKER", 1)
+    objects, filenames = make_datasets(tmp_path, 4)
+    errors = cp.save_many(objects, filenames, workers=2, executor=executor)
+    assert errors == [None] * 4
+
+    datasets = cp.load_many(filenames, workers=2, executor=executor)
+    for data, expected in zip(datasets, objects):
+        assert np.array_equal(data.y[0].components, expected.y[0].components)
+    assert datasets[0].y[0].components.flags.writeable
+
+    # the metadata only option of cp.load
+    datasets = cp.load_many(filenames, executor=executor, components=False)
+    assert [data.shape for data in datasets] == [data.shape for data in objects]
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_errors_per_file(tmp_path, executor):
+    objects, filenames = make_datasets(tmp_path, 2)
+    filenames[1] = str(tmp_path / "missing_folder" / "batch.csdf")
+    errors = cp.save_many(objects, filenames, executor=executor)
+    assert errors[0] is None
+    assert isinstance(errors[1], FileNotFoundError)
+
+    datasets = cp.load_many(filenames, executor=executor)
+    assert datasets[0] == objects[0]
+    assert isinstance(datasets[1], FileNotFoundError)
+
+
+def test_spill(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "SPILL_SIZE", 0)
+    data = cp.as_csdm(np.arange(12, dtype=np.complex128).reshape(3, 4))
+    item = batch._pickle(data, str(tmp_path))
+    assert os.path.dirname(item[2]) == str(tmp_path)
+
+    result = batch._unpickle(item)
+    assert result == data
+    assert result.y[0].components.flags.writeable
+    assert not os.path.exists(item[2])
+
+    # a truncated spill file is an error, not zero-filled buffers.
+    item = batch._pickle(data, str(tmp_path))
+    with open(item[2], "r+b") as file:
+        file.truncate(100)
+    with pytest.raises(EOFError, match="is truncated"):
+        batch._unpickle(item)
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_spill_cleanup(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch, "SPILL_SIZE", 0)
+    monkeypatch.setattr(batch.tempfile, "tempdir", str(tmp_path))
+    objects, filenames = make_datasets(tmp_path / "out", 2)
+    (tmp_path / "out").mkdir()
+
+    pickle = batch._pickle
+
+    def fail(obj, directory):
+        if obj is objects[1]:
+            raise RuntimeError("pickling failed")
+        return pickle(obj, directory)
+
+    # the spill directory is removed when a submission fails.
+    monkeypatch.setattr(batch, "_pickle", fail)
+    with pytest.raises(RuntimeError, match="pickling failed"):
+        cp.save_many(objects, filenames, workers=1)
+    assert sorted(os.listdir(str(tmp_path))) == ["out"]
+
+
+def test_invalid_arguments(tmp_path):
+    objects, filenames = make_datasets(tmp_path, 2)
+    error = "is an invalid executor"
+    with pytest.raises(ValueError, match=f".*{error}.*"):
+        cp.load_many(filenames, executor="cluster")
+
+    error = "is not equal to the number of filenames"
+    with pytest.raises(ValueError, match=f".*{error}.*"):
+        cp.save_many(objects, filenames[:1])
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+
+
+def document(increments, tags=(), timestamp="2020-01-01T00:00:00Z"):
+    return {
+        "csdm": {
+            "version": "1.0",
+            "timestamp": timestamp,
+            "tags": list(tags),
+            "dimensions": [
+                {"type": "linear", "count": 4, "increment": item} for item in increments
+            ],
+            "dependent_variables": [
+                {
+                    "type": "internal",
+                    "quantity_type": "scalar",
+                    "numeric_type": "float64",
+                    "components": [list(range(4 ** len(increments)))],
+                }
+            ],
+        }
+    }
+
+
+def write(filename, dictionary):
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, "w") as f:
+        json.dump(dictionary, f)
+
+
+def make_tree(root):
+    write(os.path.join(root, "a", "ppm.csdf"), document(["1 ppm", "2 ppm"], ["X"]))
+    write(
+        os.path.join(root, "a", "hz.csdf"),
+        document(["10 Hz"], ["X", "Y"], "2021-06-01T00:00:00Z"),
+    )
+    write(os.path.join(root, "b", "mixed.csdf"), document(["1 ppm", "1 m/s"], ["Y"]))
+    write(os.path.join(root, "b", "invalid.csdf"), {"csdm": {"version": 1}})
+
+    # the components of the external and container files are not read.
+    data = cp.as_csdm(np.arange(12.0).reshape(3, 4))
+    data.y[0].encoding = "raw"
+    data.save(os.path.join(root, "b", "data.csdfe"))
+    data.save(os.path.join(root, "data.csdfb"))
+    os.remove(os.path.join(root, "b", "data_0.dat"))
+    with open(os.path.join(root, "notes.txt"), "w") as f:
+        f.write("not a csdm file")
+
+
+def test_catalog(tmp_path):
+    root = str(tmp_path)
+    make_tree(root)
+
+    with pytest.raises(FileNotFoundError, match="No catalog at"):
+        cp.catalog.query(root)
+
+    summary = cp.catalog.build(root, workers=2)
+    assert summary["scanned"] == 6
+    assert summary["unchanged"] == 0
+    assert list(summary["errors"]) == [os.path.join(root, "b", "invalid.csdf")]
+    assert "Expecting an instance of type `str` for version" in str(summary["errors"])
+
+    def query(**kwargs):
+        paths = cp.catalog.query(root, **kwargs)
+        return [os.path.relpath(item, root).replace(os.sep, "/") for item in paths]
+
+    files = ["a/hz.csdf", "a/ppm.csdf", "b/data.csdfe", "b/mixed.csdf", "data.csdfb"]
+    assert query() == files
+    assert query(ndim=2, unit="ppm", tags="X") == ["a/ppm.csdf"]
+    assert query(ndim=2, unit="ppm") == ["a/ppm.csdf", "b/mixed.csdf"]
+    assert query(unit="m * s^-1") == ["b/mixed.csdf"]
+    assert query(tags=["X", "Y"]) == ["a/hz.csdf"]
+    assert query(shape=(4,)) == ["a/hz.csdf"]
+    files = ["b/data.csdfe", "data.csdfb"]
+    assert query(shape=(4, 3), quantity_type="scalar") == files
+    assert query(quantity_type="vector_2") == []
+    assert query(dimension_type="labeled") == []
+    assert query(since="2021-01-01T00:00:00Z", until="2022") == ["a/hz.csdf"]
+    assert query(until="2021-01-01T00:00:00Z", unit="Hz") == []
+
+    # the timestamps are compared in UTC.
+    assert query(since="2021-06-01T01:00:00+02:00", unit="Hz") == ["a/hz.csdf"]
+    assert query(since="2021-06-01T00:00:00.001", unit="Hz") == []
+    assert query(until="2021-05-31T20:00:00-04:00", unit="Hz") == ["a/hz.csdf"]
+    with pytest.raises(ValueError, match="invalid ISO 8601 timestamp for `since`"):
+        query(since="yesterday")
+
+
+def test_catalog_timestamps(tmp_path):
+    root = str(tmp_path)
+    timestamps = ["2021-06-01T02:00:00+02:00", "2021-06-01T00:30:00", "June"]
+    for i, timestamp in enumerate(timestamps):
+        write(os.path.join(root, f"{i}.csdf"), document(["1 s"], [], timestamp))
+    with open(os.path.join(root, "empty.csdf"), "w"):
+        pass
+
+    summary = cp.catalog.build(root)
+    errors = {os.path.join(root, "empty.csdf"): "ValueError: Empty file"}
+    assert summary["errors"] == errors
+
+    # the files without a valid timestamp are not matched.
+    paths = cp.catalog.query(root, since="2021-06-01", until="2021-06-01T00:30Z")
+    assert paths == [os.path.join(root, f"{i}.csdf") for i in [0, 1]]
+    paths = cp.catalog.query(root, until="2021-06-01T00:00:00Z")
+    assert paths == [os.path.join(root, "0.csdf")]
+
+
+def test_catalog_rebuild(tmp_path):
+    root = str(tmp_path)
+    make_tree(root)
+    cp.catalog.build(root)
+
+    summary = cp.catalog.build(root)
+    assert summary["scanned"] == 0
+    assert summary["unchanged"] == 6
+
+    # the modified files are scanned again, and the removed files are removed.
+    write(os.path.join(root, "b", "invalid.csdf"), document(["1 s"], ["Z"]))
+    os.remove(os.path.join(root, "a", "hz.csdf"))
+    summary = cp.catalog.build(root)
+    assert summary["scanned"] == 1
+    assert summary["unchanged"] == 4
+    assert summary["removed"] == 1
+    assert summary["errors"] == {}
+
+    paths = cp.catalog.query(root, tags="Z")
+    assert paths == [os.path.join(root, "b", "invalid.csdf")]
+    assert cp.catalog.query(root, unit="Hz") == []
+
+    database = str(tmp_path / "catalog.sqlite")
+    cp.catalog.build(os.path.join(root, "a"), database=database)
+    paths = cp.catalog.query(os.path.join(root, "a"), database=database)
+    assert paths == [os.path.join(root, "a", "ppm.csdf")]
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy.dependent_variables import chunked
+from csdmpy.dependent_variables import remote
+from csdmpy.dependent_variables.chunked import ChunkIndex
+from csdmpy.dependent_variables.chunked import decode_chunked
+from csdmpy.dependent_variables.chunked import write_chunked
+
+
+@pytest.mark.parametrize("compression", ["zlib", "bz2", "lzma"])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_write_and_decode(tmp_path, compression, workers):
+    data = np.arange(1001, dtype=np.complex128) * (1 - 2j)
+    filename = str(tmp_path / "test.dat")
+    write_chunked(filename, data, compression, chunk_size=1024, workers=workers)
+
+    with open(filename, "rb") as f:
+        content = f.read()
+    assert chunked.is_chunked(content)
+    assert chunked.is_chunked_file(filename)
+
+    index = ChunkIndex(content)
+    assert index.codec == compression
+    assert index.size == data.nbytes
+    assert index.offsets.size == 17
+    assert index.offsets[-1] == len(content)
+
+    decoded = decode_chunked(content, np.complex128, workers=workers)
+    assert np.array_equal(decoded, data)
+
+
+def test_invalid_files(tmp_path):
+    filename = str(tmp_path / "test.dat")
+    write_chunked(filename, np.arange(100.0), chunk_size=64)
+    with open(filename, "rb") as f:
+        content = f.read()
+
+    with pytest.raises(ValueError, match="truncated"):
+        ChunkIndex(content[:40])
+    with pytest.raises(ValueError, match="Invalid header"):
+        ChunkIndex(content[:8] + b"\x02" + content[9:])
+
+    with pytest.raises(ValueError, match="invalid compression"):
+        write_chunked(filename, np.arange(100.0), "zip")
+    with pytest.raises(ValueError, match="invalid compression"):
+        cp.as_csdm(np.arange(10.0)).save(
+            str(tmp_path / "test.csdfe"), compression="zip"
+        )
+
+
+@pytest.mark.parametrize("compression", ["zlib", "bz2", "lzma"])
+def test_save_and_load(tmp_path, compression):
+    data = cp.as_csdm(np.arange(40 * 50, dtype=np.float64).reshape(40, 50) % 7)
+    data.add_dependent_variable(
+        type="internal",
+        quantity_type="vector_2",
+        components=(np.arange(2 * 2000).reshape(2, 2000) % 3).astype(np.complex64),
+    )
+    for variable in data.y:
+        variable.encoding = "raw"
+    filename = str(tmp_path / "test.csdfe")
+    data.save(filename, compression=compression)
+
+    for i, variable in enumerate(data.y):
+        assert chunked.is_chunked_file(str(tmp_path / f"test_{i}.dat"))
+        size = os.path.getsize(str(tmp_path / f"test_{i}.dat"))
+        assert size < variable.components.nbytes
+
+    for kwargs in [{}, {"mmap": True}, {"lazy": True}]:
+        loaded = cp.load(filename, **kwargs)
+        for variable, expected in zip(loaded.y, data.y):
+            assert np.array_equal(variable.components, expected.components)
+
+
+def test_lazy_chunk_slicing(tmp_path, monkeypatch):
+    monkeypatch.setattr(chunked, "CHUNK_SIZE", 256)
+    monkeypatch.setattr(remote, "BLOCK_SIZE", 64)
+    data = cp.as_csdm(np.arange(3 * 40 * 50, dtype=np.float64).reshape(3, 40, 50))
+    data.y[0].encoding = "raw"
+    filename = str(tmp_path / "test.csdfe")
+    data.save(filename, compression="zlib")
+
+    lazy = cp.load(filename, lazy=True)
+    for indices in [(slice(5, 10), 2), (3, slice(None), slice(0, 3, 2)), (-1, -1, -1)]:
+        sliced = lazy[indices]
+        assert np.array_equal(sliced.y[0].components, data[indices].y[0].components)
+
+    # only the chunks of the regions are read and decompressed
+    assert lazy.y[0].subtype.is_deferred
+    reader = lazy.y[0].subtype._data.reader
+    assert reader.block_size == 256
+    assert len(reader._blocks) < 3 * 40 * 50 * 8 // 256
+    assert reader.stats.total_bytes < os.path.getsize(str(tmp_path / "test_0.dat"))
+
+    # the chunks are cached
+    count = reader.stats.count
+    lazy[5:10, 2]
+    assert reader.stats.count == count
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy import container
+
+
+def make_dataset():
+    data = cp.as_csdm(np.arange(30 * 40, dtype=np.int8).reshape(30, 40))
+    data.add_dependent_variable(
+        type="internal",
+        quantity_type="vector_2",
+        components=(np.arange(2 * 1200).reshape(2, 1200) * (1 - 1j)).astype(
+            np.complex64
+        ),
+    )
+    data.add_dependent_variable(
+        type="internal", quantity_type="scalar", components=np.arange(1200.0)
+    )
+    data.y[1].encoding = "raw"
+    data.y[2].encoding = "none"
+    return data
+
+
+def check(loaded, data):
+    assert loaded.shape == data.shape
+    for variable, expected in zip(loaded.y, data.y):
+        assert variable.numeric_type == expected.numeric_type
+        assert variable.quantity_type == expected.quantity_type
+        assert np.array_equal(variable.components, expected.components)
+
+
+def test_save_and_load(tmp_path):
+    data = make_dataset()
+    filename = str(tmp_path / "test.csdfb")
+    data.save(filename)
+    assert os.listdir(tmp_path) == ["test.csdfb"]
+
+    with open(filename, "rb") as f:
+        content = f.read()
+    assert content[:8] == container.MAGIC
+    size = int.from_bytes(content[8:16], "little")
+    end = 16 + size
+    header = json.loads(content[16:end])
+    assert [block["size"] for block in header["blocks"]] == [1200, 19200, 9600]
+    for block in header["blocks"]:
+        assert block["offset"] % 64 == 0
+    for item in header["csdm"]["dependent_variables"]:
+        assert "components" not in item
+    assert header["csdm"]["dependent_variables"][1]["encoding"] == "raw"
+
+    loaded = cp.load(filename)
+    check(loaded, data)
+    for variable in loaded.y:
+        # views of one aligned buffer, without copies
+        assert variable.components.ctypes.data % container.ALIGNMENT == 0
+        assert variable.components.flags.writeable
+
+
+def test_mmap_lazy_and_header(tmp_path):
+    data = make_dataset()
+    filename = str(tmp_path / "test.csdfb")
+    data.save(filename)
+
+    mapped = cp.load(filename, mmap=True)
+    check(mapped, data)
+    for variable in mapped.y:
+        assert variable.components.ctypes.data % container.ALIGNMENT == 0
+        assert not variable.components.flags.writeable
+
+    check(cp.load(filename, lazy=True), data)
+    check(cp.load(filename, workers=2), data)
+
+    header = cp.load_header(filename)
+    assert header.y[1].shape == (2, 30, 40)
+    with pytest.raises(ValueError):
+        header.y[0].components
+
+
+def test_detect_by_magic_bytes(tmp_path):
+    data = make_dataset()
+    filename = str(tmp_path / "test.csdfb")
+    data.save(filename)
+    os.rename(filename, str(tmp_path / "test.bin"))
+    check(cp.load(str(tmp_path / "test.bin")), data)
+
+    with open(str(tmp_path / "test.bin"), "rb") as f:
+        content = f.read()
+    check(cp.parse_dict(container.parse_container(content)), data)
+    check(cp.parse_dict(cp._parse_json(content)), data)
+
+
+def test_output_device_and_errors(tmp_path):
+    data = make_dataset()
+    output = io.BytesIO()
+    data.save("test.csdfb", output_device=output)
+    assert not os.path.exists("test.csdfb")
+    check(cp.parse_dict(container.parse_container(output.getvalue())), data)
+
+    with pytest.raises(ValueError, match="do not support compression"):
+        data.save(str(tmp_path / "test.csdfb"), compression="zlib")
+
+    content = output.getvalue()
+    with pytest.raises(ValueError, match="truncated"):
+        container.parse_container(content[:-10])
+    with pytest.raises(ValueError, match="Invalid header"):
+        container.parse_container(b"{}" + content)
+
+
+def test_empty_and_dimensionless(tmp_path):
+    filename = str(tmp_path / "test.csdfb")
+    cp.new("empty").save(filename)
+    assert cp.load(filename).description == "empty"
+
+    data = cp.as_csdm(np.array([1.5]))
+    data.save(filename)
+    check(cp.load(filename), data)
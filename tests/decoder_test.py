@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import base64
+
+import numpy as np
+import pytest
+
+from csdmpy.dependent_variables.decoder import Decoder
+from csdmpy.dependent_variables.sparse import SparseSampling
+from csdmpy.utils import QuantityType
+
+
+def encode(array):
+    return [base64.b64encode(item.tobytes()).decode("utf-8") for item in array]
+
+
+@pytest.mark.parametrize("dtype", ["<u1", "<i4", "<f4", "<f8", "<c8", "<c16"])
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 10, 101])
+def test_decode_base64(dtype, size):
+    array = (np.arange(6 * size) * 1.25).astype(dtype).reshape(6, size)
+    quantity_type = QuantityType("symmetric_matrix_3")
+
+    decoded = Decoder("base64", quantity_type, encode(array), np.dtype(dtype))
+    assert decoded.dtype == np.dtype(dtype)
+    assert decoded.shape == (6, size)
+    assert decoded.flags.c_contiguous
+    assert np.array_equal(decoded, array)
+
+
+def test_decode_base64_with_line_breaks():
+    array = np.arange(40, dtype="<f8").reshape(2, 20)
+    components = [base64.encodebytes(item.tobytes()).decode() for item in array]
+    assert "\n" in components[0]
+
+    decoded = Decoder("base64", QuantityType("vector_2"), components, "<f8")
+    assert np.array_equal(decoded, array)
+
+
+def test_decode_base64_sparse_vertexes():
+    vertexes = np.asarray([0, 5, 10, 15, 20, 25], dtype="<u2")
+    sparse = SparseSampling(
+        dimension_indexes=[0],
+        sparse_grid_vertexes=base64.b64encode(vertexes.tobytes()).decode(),
+        encoding="base64",
+        unsigned_integer_type="uint16",
+    )
+    assert np.array_equal(sparse.sparse_grid_vertexes.ravel(), vertexes)
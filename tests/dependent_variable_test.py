@@ -322,3 +322,34 @@ def test_missing_component_url():
     error = "Missing a required `components_url` key"
     with pytest.raises(KeyError, match=".*{0}.*".format(error)):
         data.add_dependent_variable(dim)
+
+
+def test_ravel_data():
+    data = cp.new()
+    data.add_dimension(cp.Dimension(type="linear", count=4, increment="1"))
+    data.add_dimension(cp.Dimension(type="linear", count=3, increment="1"))
+    components = np.random.rand(3, 12) + 1j * np.random.rand(3, 12)
+    dim = {
+        "type": "internal",
+        "numeric_type": "complex128",
+        "quantity_type": "vector_3",
+        "components": components,
+    }
+    data.add_dependent_variable(dim)
+    subtype = data.y[0].subtype
+
+    # complex components are interleaved real and imaginary parts, as a view.
+    ravel = subtype.ravel_data()
+    assert ravel.shape == (3, 24)
+    assert ravel.dtype == np.float64
+    assert np.shares_memory(ravel, subtype._components)
+    assert np.array_equal(ravel[:, 0::2], components.real)
+    assert np.array_equal(ravel[:, 1::2], components.imag)
+
+    # a non-contiguous components array is copied.
+    subtype._components = subtype._components.real.copy().transpose(0, 2, 1)
+    subtype.numeric_type = "float64"
+    ravel = subtype.ravel_data()
+    assert ravel.shape == (3, 12)
+    assert not np.shares_memory(ravel, subtype._components)
+    assert np.array_equal(ravel[0], subtype._components[0].ravel())
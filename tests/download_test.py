@@ -0,0 +1,547 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import io
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+import requests
+
+import csdmpy as cp
+from csdmpy.dependent_variables import chunked
+from csdmpy.dependent_variables import download
+from csdmpy.dependent_variables import remote
+from csdmpy.dependent_variables.remote import RangeReader
+
+
+class Handler(SimpleHTTPRequestHandler):
+    """Serve the files with an ETag header and single Range requests, and record the
+    response status codes."""
+
+    etag = True
+    ranges = True
+    total = False
+    statuses = []
+
+    def send_head(self):
+        filename = self.translate_path(self.path)
+        if self.ranges and "Range" in self.headers and os.path.isfile(filename):
+            return self.send_range(filename)
+        if self.etag and os.path.isfile(filename):
+            stat = os.stat(filename)
+            tag = f'"{stat.st_mtime_ns}-{stat.st_size}"'
+            if self.headers.get("If-None-Match") == tag:
+                self.send_response(304)
+                self.end_headers()
+                return None
+            self._etag = tag
+        return super().send_head()
+
+    def send_range(self, filename):
+        first, last = self.headers["Range"].replace("bytes=", "").split("-")
+        with open(filename, "rb") as f:
+            f.seek(int(first))
+            content = f.read(int(last) - int(first) + 1)
+        total = os.path.getsize(filename) if self.total else "*"
+        self.send_response(206)
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("Content-Range", f"bytes {first}-{last}/{total}")
+        self.end_headers()
+        return io.BytesIO(content)
+
+    def end_headers(self):
+        if getattr(self, "_etag", None) is not None:
+            self.send_header("ETag", self._etag)
+        super().end_headers()
+
+    def send_response(self, code, message=None):
+        self.statuses.append(code)
+        super().send_response(code, message)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setitem(download.CACHE, "directory", str(tmp_path / "cache"))
+    monkeypatch.setattr(Handler, "statuses", [])
+    root = tmp_path / "www"
+    root.mkdir()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(Handler, directory=str(root)))
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield httpd, root, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def write(filename, content):
+    previous = os.stat(filename).st_mtime if os.path.exists(filename) else 0
+    with open(filename, "wb") as f:
+        f.write(content)
+    # the Last-Modified header has a resolution of a second.
+    mtime = max(os.stat(filename).st_mtime, previous + 2)
+    os.utime(filename, (mtime, mtime))
+
+
+@pytest.mark.parametrize("etag", [True, False])
+def test_download_and_revalidate(server, monkeypatch, etag):
+    monkeypatch.setattr(Handler, "etag", etag)
+    _, root, url = server
+    write(root / "test.csdf", b"first")
+
+    filename = download.download_file_from_url(f"{url}/test.csdf")
+    assert os.path.dirname(filename) == download.get_cache_dir()
+    assert filename.endswith("test.csdf")
+    with open(filename, "rb") as f:
+        assert f.read() == b"first"
+
+    # not modified
+    assert download.download_file_from_url(f"{url}/test.csdf") == filename
+    assert Handler.statuses == [200, 304]
+
+    # modified
+    write(root / "test.csdf", b"second")
+    assert download.download_file_from_url(f"{url}/test.csdf") == filename
+    assert Handler.statuses == [200, 304, 200]
+    with open(filename, "rb") as f:
+        assert f.read() == b"second"
+
+    # no temporary files are left in the cache
+    names = os.listdir(download.get_cache_dir())
+    assert not [name for name in names if name.endswith(".part")]
+
+
+def test_max_age_and_offline(server, monkeypatch):
+    _, root, url = server
+    write(root / "test.csdf", b"content")
+    filename = download.download_file_from_url(f"{url}/test.csdf")
+
+    # the cached file is used without revalidation within the max age.
+    monkeypatch.setitem(download.CACHE, "max_age", 3600)
+    assert download.download_file_from_url(f"{url}/test.csdf") == filename
+    assert Handler.statuses == [200]
+
+    monkeypatch.setitem(download.CACHE, "max_age", 0)
+    assert download.download_file_from_url(f"{url}/test.csdf") == filename
+    assert Handler.statuses == [200, 304]
+
+    monkeypatch.setitem(download.CACHE, "offline", True)
+    assert download.download_file_from_url(f"{url}/test.csdf") == filename
+    assert Handler.statuses == [200, 304]
+    with pytest.raises(requests.ConnectionError, match="the cache is offline"):
+        download.download_file_from_url(f"{url}/other.csdf")
+
+
+def test_sweep(server):
+    _, root, url = server
+    write(root / "test.csdf", b"content")
+    filename = download.download_file_from_url(f"{url}/test.csdf")
+    directory = download.get_cache_dir()
+
+    # the staged files of an interrupted download and an unused lock file.
+    key = "0" * 64
+    for name in [f".{key}-test.csdf.0a1b2c3d.part", f"{key}.lock"]:
+        with open(os.path.join(directory, name), "wb"):
+            pass
+
+    # the staged files of a download in progress are kept.
+    busy = "1" * 64
+    with download._lock(download._lock_path(busy)):
+        with open(os.path.join(directory, f".{busy}.json.0a1b2c3d.part"), "wb"):
+            pass
+        download._evict(download.CACHE["max_size"])
+        names = sorted(os.listdir(directory))
+    key = os.path.basename(filename)[:64]
+    expected = [".lock", f".{busy}.json.0a1b2c3d.part", f"{busy}.lock"]
+    expected += [os.path.basename(filename), f"{key}.json", f"{key}.lock"]
+    assert names == sorted(expected)
+
+    download.clear_cache()
+    assert os.listdir(directory) == [".lock"]
+
+
+def test_same_basename_from_different_urls(server):
+    _, root, url = server
+    (root / "a").mkdir()
+    (root / "b").mkdir()
+    write(root / "a" / "test.csdf", b"a")
+    write(root / "b" / "test.csdf", b"b")
+
+    file_a = download.download_file_from_url(f"{url}/a/test.csdf")
+    file_b = download.download_file_from_url(f"{url}/b/test.csdf")
+    assert file_a != file_b
+    with open(file_a, "rb") as f:
+        assert f.read() == b"a"
+
+
+def test_server_unreachable(server):
+    httpd, root, url = server
+    write(root / "test.csdf", b"content")
+    filename = download.download_file_from_url(f"{url}/test.csdf")
+
+    httpd.shutdown()
+    httpd.server_close()
+    assert download.download_file_from_url(f"{url}/test.csdf") == filename
+
+    with pytest.raises(requests.ConnectionError):
+        download.download_file_from_url(f"{url}/other.csdf")
+
+
+@pytest.mark.parametrize(
+    "error", [requests.ReadTimeout, requests.exceptions.ChunkedEncodingError]
+)
+def test_server_stalled(server, monkeypatch, error):
+    _, root, url = server
+    write(root / "test.csdf", b"content")
+    filename = download.download_file_from_url(f"{url}/test.csdf")
+
+    def stall(*args, **kwargs):
+        raise error("stalled")
+
+    # the cached file is used when the server times out or the response is cut.
+    monkeypatch.setattr(download.requests, "get", stall)
+    assert download.download_file_from_url(f"{url}/test.csdf") == filename
+    with open(filename, "rb") as f:
+        assert f.read() == b"content"
+
+    with pytest.raises(error):
+        download.download_file_from_url(f"{url}/other.csdf")
+
+
+def test_missing_file(server):
+    _, _, url = server
+    with pytest.raises(requests.HTTPError):
+        download.download_file_from_url(f"{url}/missing.csdf")
+    assert not [
+        name for name in os.listdir(download.get_cache_dir()) if "missing" in name
+    ]
+
+
+def test_eviction(server, monkeypatch):
+    monkeypatch.setitem(download.CACHE, "max_size", 250)
+    _, root, url = server
+    files = []
+    for i in range(3):
+        write(root / f"{i}.csdf", bytes(100))
+        files.append(download.download_file_from_url(f"{url}/{i}.csdf"))
+        os.utime(files[-1], (i, i))
+
+    # the least recently used file is evicted
+    assert not os.path.exists(files[0])
+    assert os.path.exists(files[1])
+    assert os.path.exists(files[2])
+
+    # a use refreshes the file
+    download.download_file_from_url(f"{url}/1.csdf")
+    write(root / "3.csdf", bytes(100))
+    download.download_file_from_url(f"{url}/3.csdf")
+    assert os.path.exists(files[1])
+    assert not os.path.exists(files[2])
+
+    download.clear_cache()
+    assert not os.path.exists(files[1])
+
+
+def test_concurrent_eviction(server, monkeypatch):
+    # the cache is smaller than either file.
+    monkeypatch.setitem(download.CACHE, "max_size", 50)
+    _, root, url = server
+    contents = [os.urandom(100), os.urandom(100)]
+    for i, content in enumerate(contents):
+        write(root / f"{i}.csdf", content)
+
+    barrier = threading.Barrier(2, timeout=10)
+    results = {}
+
+    def run(i):
+        with download.cached_file(f"{url}/{i}.csdf") as filename:
+            # both files are cached and evicted before either file is read.
+            barrier.wait()
+            download._evict(0)
+            with open(filename, "rb") as f:
+                results[i] = f.read()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {0: contents[0], 1: contents[1]}
+
+    # the files are evicted once unlocked.
+    download._evict(50)
+    assert [entry["size"] for entry in download._entries()] == []
+
+
+def test_concurrent_downloads(server):
+    _, root, url = server
+    content = os.urandom(2 ** 20)
+    write(root / "test.csdf", content)
+
+    results = []
+
+    def run():
+        results.append(download.download_file_from_url(f"{url}/test.csdf"))
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(results)) == 1
+    assert Handler.statuses.count(200) == 1
+    with open(results[0], "rb") as f:
+        assert f.read() == content
+
+
+def test_load_url(server):
+    _, root, url = server
+    data = cp.as_csdm(np.arange(10.0))
+    data.save(str(root / "test.csdf"))
+
+    loaded = cp.load(f"{url}/test.csdf")
+    assert np.array_equal(loaded.y[0].components, data.y[0].components)
+    assert not os.path.exists("test.csdf")
+
+
+def test_load_async(server):
+    _, root, url = server
+    data = cp.as_csdm(np.arange(10.0))
+    data.add_dependent_variable(
+        type="internal", quantity_type="scalar", components=np.arange(10, 20.0)
+    )
+    data.y[0].encoding = "raw"
+    data.save(str(root / "test.csdfe"))
+
+    stats = download.TransferStats()
+    loaded = asyncio.run(cp.load_async(f"{url}/test.csdfe", stats=stats))
+    for variable, expected in zip(loaded.y, data.y):
+        assert np.array_equal(variable.components, expected.components)
+
+    # the header and the external components file
+    assert stats.count == 2
+    assert [item["status"] for item in stats.transfers] == [200, 200]
+    assert stats.transfers[1]["url"] == f"{url}/test_0.dat"
+    assert stats.transfers[1]["bytes"] == 80
+    assert stats.total_bytes == sum(item["bytes"] for item in stats.transfers)
+    assert all(item["latency"] <= item["elapsed"] for item in stats.transfers)
+
+    # metadata only
+    stats = download.TransferStats()
+    header = asyncio.run(
+        cp.load_async(f"{url}/test.csdfe", stats=stats, components=False)
+    )
+    assert header.shape == (10,)
+    assert stats.count == 1
+
+
+def test_load_async_client(server):
+    _, root, url = server
+    data = cp.as_csdm(np.arange(10.0))
+    data.save(str(root / "test.csdf"))
+
+    # the calls share a client, and the transfers are recorded per call.
+    client = download.get_default_client()
+    for _ in range(2):
+        stats = download.TransferStats()
+        asyncio.run(cp.load_async(f"{url}/test.csdf", stats=stats))
+        assert stats.count == 1
+    assert download.get_default_client() is client
+    assert client.stats.count == 0
+
+    async def load():
+        async with download.AsyncClient(concurrency=2) as client:
+            await cp.load_async(f"{url}/test.csdf", client=client)
+            await cp.load_many_async([f"{url}/test.csdf"], client=client)
+            return client.stats
+
+    assert asyncio.run(load()).count == 2
+
+
+def test_resolve_url():
+    base = "http://example.com/data/test.csdfe"
+    assert download.resolve_url("file:./test_0.dat", base) == (
+        "http://example.com/data/test_0.dat"
+    )
+    assert download.resolve_url("test_0.dat", base) == (
+        "http://example.com/data/test_0.dat"
+    )
+    other = "https://example.org/test_0.dat"
+    assert download.resolve_url(other, base) == other
+    local = "/data/test.csdfe"
+    assert download.resolve_url("file:./test_0.dat", local) == "/data/test_0.dat"
+    assert download.resolve_url("file:///tmp/test_0.dat", local) == "/tmp/test_0.dat"
+
+    error = "is not resolved relative to the remote file"
+    for url in ["file:///tmp/test_0.dat", "/tmp/test_0.dat", "file://host/test.dat"]:
+        with pytest.raises(ValueError, match=error):
+            download.resolve_url(url, base)
+
+    with pytest.raises(ValueError, match="is not supported"):
+        download.resolve_url("ftp://example.com/test_0.dat", base)
+
+
+def test_load_many_async(server):
+    _, root, url = server
+    urls = []
+    for i in range(6):
+        data = cp.as_csdm(np.arange(10.0) * i)
+        data.y[0].encoding = "raw" if i % 2 else "base64"
+        extension = ".csdfe" if i % 2 else ".csdf"
+        data.save(str(root / f"{i}{extension}"))
+        urls.append(f"{url}/{i}{extension}")
+    urls.append(f"{url}/missing.csdf")
+
+    stats = download.TransferStats()
+    datasets = asyncio.run(cp.load_many_async(urls, concurrency=3, stats=stats))
+    for i, data in enumerate(datasets[:-1]):
+        assert np.array_equal(data.y[0].components[0], np.arange(10.0) * i)
+    assert isinstance(datasets[-1], requests.HTTPError)
+    assert stats.count == 9
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_remote_range_slicing(server, monkeypatch, ranges):
+    monkeypatch.setattr(Handler, "ranges", ranges)
+    monkeypatch.setattr(remote, "BLOCK_SIZE", 256)
+    _, root, url = server
+    data = cp.as_csdm(np.arange(3 * 40 * 50, dtype=np.float64).reshape(3, 40, 50))
+    data.add_dependent_variable(
+        type="internal",
+        quantity_type="vector_2",
+        components=np.arange(2 * 6000, dtype=np.complex64).reshape(2, 6000),
+    )
+    for variable in data.y:
+        variable.encoding = "raw"
+    data.save(str(root / "test.csdfe"))
+
+    lazy = cp.load(f"{url}/test.csdfe", lazy=True)
+    Handler.statuses.clear()
+    for indices in [(slice(5, 10), 2), (3, slice(None), slice(0, 3, 2)), (-1, -1, -1)]:
+        sliced = lazy[indices]
+        for variable, expected in zip(sliced.y, data[indices].y):
+            assert np.array_equal(variable.components, expected.components)
+
+    for variable in lazy.y:
+        assert variable.subtype.is_deferred
+
+    reader = lazy.y[0].subtype._data.reader
+    if ranges:
+        assert set(Handler.statuses) == {206}
+        # only the blocks of the regions are fetched
+        assert reader.stats.total_bytes < 3 * 40 * 50 * 8
+
+        # the blocks are cached
+        count = reader.stats.count
+        lazy[5:10, 2]
+        assert reader.stats.count == count
+    else:
+        # the complete file is fetched once, and the regions are read from it.
+        assert set(Handler.statuses) == {200}
+        assert reader.stats.count == 1
+
+    # the full components array
+    assert np.array_equal(lazy.y[1].components, data.y[1].components)
+    assert not lazy.y[1].subtype.is_deferred
+
+
+def test_range_reader_runs(server, monkeypatch):
+    _, root, url = server
+    write(root / "test.dat", np.arange(1000, dtype=np.int32).tobytes())
+    reader = RangeReader(f"{url}/test.dat", np.int32, block_size=64)
+
+    # the first block, read to detect the format, is cached, and the adjacent
+    # blocks are fetched with one request
+    assert np.array_equal(reader((slice(10, 100),), (1000,)), np.arange(10, 100))
+    assert reader.stats.count == 2
+    assert reader.stats.total_bytes == 7 * 64
+
+    # the missing blocks around a cached block are fetched with two requests
+    assert np.array_equal(reader((slice(200, 216),), (1000,)), np.arange(200, 216))
+    assert reader.stats.count == 3
+    expected = np.arange(0, 400, 10)
+    assert np.array_equal(reader((slice(0, 400, 10),), (1000,)), expected)
+    assert reader.stats.count == 5
+
+    # the least recently used blocks are evicted
+    reader.cache_size = 4 * 64
+    reader((slice(900, 1000),), (1000,))
+    assert len(reader._blocks) == 4
+
+    # the elements past the end of the file, in the last short block or after it.
+    error = "is shorter than the components array"
+    for index in [slice(990, 1001), slice(1050, 1060)]:
+        with pytest.raises(ValueError, match=error):
+            reader((index,), (1100,))
+
+
+@pytest.mark.parametrize("ranges, total", [(True, True), (True, False), (False, False)])
+def test_remote_verify_size(server, monkeypatch, ranges, total):
+    monkeypatch.setattr(Handler, "ranges", ranges)
+    monkeypatch.setattr(Handler, "total", total)
+    _, root, url = server
+    data = cp.as_csdm(np.arange(40 * 50, dtype=np.float64).reshape(40, 50))
+    data.y[0].encoding = "raw"
+    data.save(str(root / "test.csdfe"))
+
+    lazy = cp.load(f"{url}/test.csdfe", lazy=True, verify="size")
+    assert np.array_equal(lazy[5:10, 2].y[0].components, data[5:10, 2].y[0].components)
+    assert lazy.y[0].subtype.is_deferred
+
+    # the size, from the Content-Range header, the HEAD request, or the complete
+    # file, is verified before the first region is read.
+    with open(root / "test_0.dat", "ab") as f:
+        f.write(b"\0" * 8)
+    lazy = cp.load(f"{url}/test.csdfe", lazy=True, verify="size")
+    with pytest.raises(ValueError, match="is not equal to the recorded size"):
+        lazy[5:10, 2]
+    assert np.array_equal(
+        cp.load(f"{url}/test.csdfe", lazy=True)[5:10, 2].y[0].components,
+        data[5:10, 2].y[0].components,
+    )
+
+
+def test_remote_chunked(server, monkeypatch):
+    monkeypatch.setattr(remote, "BLOCK_SIZE", 64)
+    monkeypatch.setattr(chunked, "CHUNK_SIZE", 256)
+    _, root, url = server
+    data = cp.as_csdm(np.arange(40 * 50, dtype=np.float64).reshape(40, 50))
+    data.y[0].encoding = "raw"
+    data.save(str(root / "test.csdfe"), compression="zlib")
+
+    lazy = cp.load(f"{url}/test.csdfe", lazy=True)
+    Handler.statuses.clear()
+    assert np.array_equal(lazy[5:10, 2].y[0].components, data[5:10, 2].y[0].components)
+    assert set(Handler.statuses) == {206}
+
+    # the header and the index, and one run of chunks
+    reader = lazy.y[0].subtype._data.reader
+    assert reader.stats.count == 3
+    assert reader.stats.total_bytes < os.path.getsize(root / "test_0.dat")
+    with pytest.raises(ValueError, match="is shorter than the components array"):
+        reader((slice(1990, 2100),), (2100,))
+
+    loaded = asyncio.run(cp.load_async(f"{url}/test.csdfe"))
+    assert np.array_equal(loaded.y[0].components, data.y[0].components)
+
+
+def test_load_container_url(server):
+    _, root, url = server
+    data = cp.as_csdm(np.arange(10.0))
+    data.save(str(root / "test.csdfb"))
+
+    loaded = cp.load(f"{url}/test.csdfb")
+    assert np.array_equal(loaded.y[0].components, data.y[0].components)
+
+    stats = download.TransferStats()
+    loaded = asyncio.run(cp.load_async(f"{url}/test.csdfb", stats=stats))
+    assert np.array_equal(loaded.y[0].components, data.y[0].components)
+    assert stats.count == 1
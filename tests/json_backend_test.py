@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import json
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy.json_backend import BACKEND
+from csdmpy.json_backend import get_json_backend
+
+
+def make_dataset():
+    data = cp.as_csdm(np.arange(12, dtype=np.float32).reshape(3, 4))
+    data.dimensions[0].label = "ünïcode"
+    data.application = {"com.example": {"values": list(range(5))}}
+    return data
+
+
+def installed_backends():
+    backends = ["json"]
+    for item in ["orjson", "ujson"]:
+        try:
+            get_json_backend(item)
+            backends.append(item)
+        except ImportError:
+            pass
+    return backends
+
+
+@pytest.fixture
+def default_backend():
+    default = BACKEND["default"]
+    yield
+    cp.set_json_backend(default)
+
+
+def test_json_backend_round_trip(tmp_path):
+    data = make_dataset()
+    backends = installed_backends() + ["auto"]
+    for backend in backends:
+        for encoding in ["none", "base64"]:
+            data.y[0].encoding = encoding
+            filename = str(tmp_path / f"{backend}_{encoding}.csdf")
+            data.save(filename, json_backend=backend)
+            with open(filename, encoding="utf8") as f:
+                json.load(f)
+            for reader in backends:
+                new = cp.load(filename, application=True, json_backend=reader)
+                assert np.array_equal(new.y[0].components, data.y[0].components)
+                assert new.x[0].label == "ünïcode"
+                assert new.application == data.application
+
+        string = data.dumps(json_backend=backend)
+        assert json.loads(string) == json.loads(data.dumps(json_backend="json"))
+        assert cp.loads(string, json_backend=backend) == cp.loads(string)
+
+
+def test_set_json_backend(default_backend):
+    cp.set_json_backend("json")
+    assert get_json_backend().name == "json"
+    assert cp.new("test").dumps(indent=4) == json.dumps(
+        cp.new("test")._dict(), ensure_ascii=False, indent=4
+    )
+
+    calls = []
+
+    def loads(document):
+        calls.append("loads")
+        return json.loads(document)
+
+    def dumps(obj, indent=None):
+        calls.append("dumps")
+        return json.dumps(obj, indent=indent)
+
+    cp.register_json_backend("counting", loads, dumps)
+    cp.set_json_backend("counting")
+    assert cp.loads(cp.new("test").dumps()).description == "test"
+    assert calls == ["dumps", "loads"]
+
+    # the backend given per call takes precedence
+    cp.new("test").dumps(json_backend="json")
+    assert calls == ["dumps", "loads"]
+
+    error = "`fast` is an invalid JSON backend"
+    with pytest.raises(ValueError, match=error):
+        cp.set_json_backend("fast")
+    assert get_json_backend().name == "counting"
+
+
+
+def test_json_backend_default():
+    assert get_json_backend().name == "json"
+
+
+@pytest.mark.parametrize("backend", installed_backends())
+def test_json_backend_compliance(backend):
+    data = make_dataset()
+    json_backend = get_json_backend(backend)
+
+    # the non-finite floats are rejected, as with the json module.
+    data.y[0].components[0, 0] = np.nan
+    data.y[0].encoding = "none"
+    with pytest.raises(ValueError, match="Out of range float values"):
+        data.dumps(json_backend=backend)
+    for value in [float("inf"), [1.0, -float("inf")]]:
+        with pytest.raises(ValueError, match="Out of range float values"):
+            json_backend.dumps({"value": [None, value]})
+    assert json.loads(json_backend.dumps({"value": None})) == {"value": None}
+
+    # the NaN and Infinity literals are parsed, as with the json module.
+    document = '{"values": [NaN, Infinity, -Infinity, 1.5]}'
+    values = json_backend.loads(document)["values"]
+    assert np.isnan(values[0]) and values[1:] == [np.inf, -np.inf, 1.5]
+    with pytest.raises(ValueError):
+        json_backend.loads('{"values": [1,]}')
+
+    obj = {"b": [1, 2], "a": "ünïcode"}
+    expected = json.dumps(obj, ensure_ascii=False, sort_keys=True, indent=2)
+    assert json.loads(json_backend.dumps(obj, indent=2, sort_keys=True)) == obj
+    assert json_backend.dumps(obj, indent=2, sort_keys=True).split() == (
+        expected.split()
+    )
+
+    if backend == "json":
+        return
+
+    with pytest.raises(TypeError, match="does not support the `separators`"):
+        json_backend.dumps(obj, separators=(",", ":"))
+    if backend == "orjson":
+        with pytest.raises(ValueError, match="only supports an indent of 2"):
+            json_backend.dumps(obj, indent=4)
+        with pytest.raises(ValueError, match="Out of range float values"):
+            json_backend.dumps({"value": [None, np.array([1.0, -np.inf])]})
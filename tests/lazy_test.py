@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+
+
+def make_dataset(encoding):
+    data = cp.as_csdm(np.arange(60, dtype=np.float32).reshape(3, 4, 5))
+    data.add_dependent_variable(
+        type="internal",
+        components=np.arange(120, dtype=np.complex64).reshape(2, 60),
+        quantity_type="vector_2",
+    )
+    for variable in data.dependent_variables:
+        variable.encoding = encoding
+    return data
+
+
+@pytest.mark.parametrize("encoding", ["none", "base64", "raw"])
+def test_lazy_load(tmp_path, encoding):
+    data = make_dataset(encoding)
+    filename = str(tmp_path / f"lazy_{encoding}.csdf")
+    filename += "e" if encoding == "raw" else ""
+    data.save(filename)
+
+    lazy_data = cp.load(filename, lazy=True)
+    for variable in lazy_data.dependent_variables:
+        assert variable.subtype.is_deferred
+
+    # metadata access does not decode the components
+    assert lazy_data.shape == (5, 4, 3)
+    assert lazy_data.dependent_variables[1].numeric_type == "complex64"
+    assert lazy_data.dependent_variables[1].quantity_type == "vector_2"
+    assert lazy_data.dependent_variables[1].subtype.is_deferred
+
+    components = lazy_data.dependent_variables[1].components
+    assert not lazy_data.dependent_variables[1].subtype.is_deferred
+    assert lazy_data.dependent_variables[0].subtype.is_deferred
+    assert components.shape == (2, 3, 4, 5)
+    assert np.allclose(components, data.dependent_variables[1].components)
+
+    expected = data.dependent_variables[0].components
+    assert np.allclose(lazy_data.dependent_variables[0].components, expected)
+
+
+def test_lazy_copy_and_slice(tmp_path):
+    data = make_dataset("base64")
+    filename = str(tmp_path / "lazy_copy.csdf")
+    data.save(filename)
+
+    lazy_data = cp.load(filename, lazy=True)
+    copy = lazy_data.copy()
+    assert copy.dependent_variables[0].subtype.is_deferred
+    assert np.allclose(
+        copy.dependent_variables[0].components, data.dependent_variables[0].components
+    )
+
+    sliced = lazy_data[1:3, 0]
+    assert np.allclose(
+        sliced.dependent_variables[0].components,
+        data.dependent_variables[0].components[:, :, 0, 1:3],
+    )
+
+
+def test_lazy_invalid_number_of_components():
+    error = "requires exactly 2 component"
+    with pytest.raises(Exception, match=".*{0}.*".format(error)):
+        cp.as_csdm(np.zeros(10)).add_dependent_variable(
+            type="internal",
+            components=["AAAA"],
+            numeric_type="float32",
+            quantity_type="vector_2",
+            lazy=True,
+        )
+
+
+@pytest.mark.parametrize("encoding", ["base64", "raw"])
+def test_load_header(tmp_path, encoding):
+    data = make_dataset(encoding)
+    filename = str(tmp_path / f"header_{encoding}.csdf")
+    filename += "e" if encoding == "raw" else ""
+    data.save(filename)
+
+    header = cp.load_header(filename)
+    assert header.shape == (5, 4, 3)
+    assert len(header.dependent_variables) == 2
+
+    variable = header.dependent_variables[1]
+    assert variable.numeric_type == "complex64"
+    assert variable.quantity_type == "vector_2"
+    assert variable.shape == (2, 3, 4, 5)
+    assert header.dependent_variables[0].shape == (1, 3, 4, 5)
+
+    error = "The components of the dependent variable were not loaded"
+    with pytest.raises(ValueError, match=".*{0}.*".format(error)):
+        _ = variable.components
+
+
+def test_load_header_does_not_read_external_file(tmp_path):
+    data = make_dataset("raw")
+    data.save(str(tmp_path / "header_missing.csdfe"))
+    os.remove(str(tmp_path / "header_missing_0.dat"))
+
+    header = cp.load(str(tmp_path / "header_missing.csdfe"), components=False)
+    assert header.dependent_variables[0].shape == (1, 3, 4, 5)
+
+
+@pytest.mark.parametrize("encoding", ["none", "base64", "raw"])
+def test_load_workers(tmp_path, encoding):
+    data = make_dataset(encoding)
+    for _ in range(4):
+        data.add_dependent_variable(data.dependent_variables[0].copy())
+    filename = str(tmp_path / f"workers_{encoding}.csdf")
+    filename += "e" if encoding == "raw" else ""
+    data.save(filename)
+
+    expected = cp.load(filename)
+    parallel = cp.load(filename, workers=4)
+    assert parallel == expected
+    for variable in parallel.dependent_variables:
+        assert not variable.subtype.is_deferred
+
+    # the json path with the python lists and strings.
+    if encoding != "raw":
+        assert cp.loads(data.dumps(), workers=4) == cp.loads(data.dumps())
+
+
+def test_lazy_local_section(tmp_path):
+    data = make_dataset("raw")
+    filename = str(tmp_path / "lazy_section.csdfe")
+    data.save(filename)
+
+    lazy_data = cp.load(filename, lazy=True)
+    for indices in [(slice(1, 3), slice(None), 2), (-1, 0), 4]:
+        sliced = lazy_data[indices]
+        for variable, expected in zip(sliced.y, data[indices].y):
+            assert np.array_equal(variable.components, expected.components)
+            # the section is a copy, independent of the file.
+            assert type(variable.components) is np.ndarray
+            assert variable.components.flags.owndata
+
+    # the full components arrays are not read.
+    for variable in lazy_data.dependent_variables:
+        assert variable.subtype.is_deferred
+
+    copy = pickle.loads(pickle.dumps(lazy_data))
+    assert np.array_equal(copy[1:3].y[1].components, data[1:3].y[1].components)
+
+
+def test_lazy_verify(tmp_path):
+    data = make_dataset("raw")
+    filename = str(tmp_path / "lazy_verify.csdfe")
+    data.save(filename)
+
+    # the size is verified before the sections are read.
+    lazy_data = cp.load(filename, lazy=True, verify="size")
+    assert np.array_equal(lazy_data[1:3].y[1].components, data[1:3].y[1].components)
+    assert lazy_data.y[1].subtype.is_deferred
+
+    # the checksum is verified on the complete file, read on the first slice.
+    lazy_data = cp.load(filename, lazy=True, verify="full")
+    assert np.array_equal(lazy_data[1:3].y[1].components, data[1:3].y[1].components)
+    assert not lazy_data.y[1].subtype.is_deferred
+
+    with open(str(tmp_path / "lazy_verify_1.dat"), "ab") as f:
+        f.write(b"\0" * 8)
+    for verify in ["size", "full"]:
+        lazy_data = cp.load(filename, lazy=True, verify=verify)
+        with pytest.raises(ValueError, match="is not equal to the recorded size"):
+            lazy_data[1:3]
+    lazy_data = cp.load(filename, lazy=True)
+    assert np.array_equal(lazy_data[1:3].y[1].components, data[1:3].y[1].components)
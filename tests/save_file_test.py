@@ -1,4 +1,10 @@
 # -*- coding: utf-8 -*-
+import json
+import os
+
+import numpy as np
+import pytest
+
 import csdmpy as cp
 
 
@@ -33,3 +39,106 @@ def test_csdfe():
     data = setup()
     data.dependent_variables[0].encoding = "raw"
     data.save("my_file_raw.csdfe")
+
+
+def test_csdfe_mmap(tmp_path):
+    data = setup()
+    data.dependent_variables[0].encoding = "raw"
+    filename = str(tmp_path / "my_file_mmap.csdfe")
+    data.save(filename)
+
+    new_data = cp.load(filename, mmap=True)
+    components = new_data.dependent_variables[0].components
+    assert np.allclose(components, data.dependent_variables[0].components)
+    assert not components.flags.writeable
+
+    base = components
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+
+
+def test_empty_memmap_backed(tmp_path):
+    dims = [cp.LinearDimension(count=n, increment="1") for n in (6, 5, 4)]
+    backing = str(tmp_path / "sim.dat")
+    data = cp.empty(dims, "complex64", "vector_2", backing=backing, name="sim")
+    assert data.shape == (6, 5, 4)
+    assert data.y[0].name == "sim"
+    assert data.y[0].numeric_type == "complex64"
+    assert data.y[0].encoding == "raw"
+    assert os.path.getsize(backing) == 2 * 6 * 5 * 4 * 8
+
+    # filled slice by slice through the memmap
+    for k in range(4):
+        data[:, :, k] = k + 1j
+    expected = np.zeros((2, 4, 5, 6), dtype=np.complex64)
+    expected[:] = (np.arange(4) + 1j)[:, np.newaxis, np.newaxis]
+    assert np.array_equal(data.y[0].components, expected)
+    mapped = np.memmap(backing, dtype=np.complex64, mode="r")
+    assert np.array_equal(mapped, expected.ravel())
+
+    # the .csdfe file refers to the backing file, without copies
+    (tmp_path / "out").mkdir()
+    filename = str(tmp_path / "out" / "sim.csdfe")
+    data.save(filename)
+    assert os.listdir(str(tmp_path / "out")) == ["sim.csdfe"]
+    with open(filename) as f:
+        url = json.load(f)["csdm"]["dependent_variables"][0]["components_url"]
+    assert url == os.path.join("file:.", "..", "sim.dat")
+    assert np.array_equal(cp.load(filename).y[0].components, expected)
+
+    # a slice of the memmap or a compressed file is written as a copy
+    data[:, :, 1:3].save(str(tmp_path / "slice.csdfe"))
+    assert os.path.exists(str(tmp_path / "slice_0.dat"))
+    data.save(str(tmp_path / "zip.csdfe"), compression="zlib")
+    zipped = cp.load(str(tmp_path / "zip.csdfe"))
+    assert np.array_equal(zipped.y[0].components, expected)
+
+
+def test_empty_in_memory():
+    data = cp.empty([cp.LinearDimension(count=10, increment="1")], dtype="int16")
+    assert data.y[0].numeric_type == "int16"
+    assert data.y[0].encoding == "base64"
+    assert not isinstance(data.y[0].components.base, np.memmap)
+
+
+def test_csdfe_verify(tmp_path):
+    data = setup()
+    data.dependent_variables[0].encoding = "raw"
+    filename = str(tmp_path / "verify.csdfe")
+    data.save(filename)
+    with open(filename) as f:
+        application = json.load(f)["csdm"]["dependent_variables"][0]["application"]
+    metadata = application["com.github.deepanshs.csdmpy"]
+    dat = str(tmp_path / "verify_0.dat")
+    assert metadata["size"] == os.path.getsize(dat)
+
+    for kwargs in [{}, {"mmap": True}, {"lazy": True}]:
+        for verify in ["none", "size", "full"]:
+            new_data = cp.load(filename, verify=verify, application=True, **kwargs)
+            assert new_data.y[0].application == {}
+            assert np.allclose(new_data.y[0].components, data.y[0].components)
+
+    # a corrupted file of the same size fails the full verification only
+    with open(dat, "r+b") as f:
+        f.write(b"\xff" * 4)
+    cp.load(filename, verify="size")
+    error = "does not match the recorded checksum"
+    for kwargs in [{}, {"mmap": True}]:
+        with pytest.raises(ValueError, match=error):
+            cp.load(filename, verify="full", **kwargs)
+
+    # a truncated file fails the size verification
+    with open(dat, "r+b") as f:
+        f.truncate(metadata["size"] - 8)
+    with pytest.raises(ValueError, match="is not equal to the recorded size"):
+        cp.load(filename, verify="size")
+
+    error = "is an invalid verify option"
+    with pytest.raises(ValueError, match=error):
+        cp.load(filename, verify="all")
+
+    # the chunked files are verified as written
+    data.save(filename, compression="zlib")
+    new_data = cp.load(filename, verify="full")
+    assert np.allclose(new_data.y[0].components, data.y[0].components)
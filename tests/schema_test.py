@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy.schema import validate_document
+
+
+def document():
+    return {
+        "csdm": {
+            "version": "1.0",
+            "timestamp": "2020-01-01T00:00:00Z",
+            "dimensions": [
+                {"type": "linear", "count": 4, "increment": "1 s"},
+                {"type": "labeled", "labels": ["a", "b"]},
+            ],
+            "dependent_variables": [
+                {
+                    "type": "internal",
+                    "quantity_type": "scalar",
+                    "numeric_type": "float64",
+                    "components": [list(range(8))],
+                },
+                {
+                    "type": "external",
+                    "quantity_type": "scalar",
+                    "numeric_type": "float64",
+                    "components_url": "file:missing.dat",
+                },
+            ],
+        }
+    }
+
+
+def invalid_documents():
+    """Yield the invalid documents with the expected error."""
+    doc = document()
+    doc["CSDM"] = doc.pop("csdm")
+    yield doc, KeyError, "'CSDM' is not a valid keyword for the CSD model."
+
+    doc = document()
+    doc["csdm"]["Version"] = doc["csdm"].pop("version")
+    yield doc, KeyError, "Version is an invalid key for the CSDM object."
+
+    doc = document()
+    doc["csdm"].pop("version")
+    yield doc, KeyError, "Missing a required `version` key from the CSDM object."
+
+    doc = document()
+    doc["csdm"]["timestamp"] = 1
+    yield doc, TypeError, "Expecting an instance of type `str` for timestamp"
+
+    doc = document()
+    doc["csdm"]["dimensions"][1].pop("type")
+    yield doc, KeyError, "Missing a required 'type' key from the Dimension object."
+
+    doc = document()
+    doc["csdm"]["dimensions"][1]["type"] = "sparse"
+    yield doc, ValueError, "The value, 'sparse', is invalid for the `type` attribute"
+
+    doc = document()
+    doc["csdm"]["dimensions"][1].pop("labels")
+    yield doc, KeyError, "`labels` key from the LabeledDimension object."
+
+    doc = document()
+    doc["csdm"]["dimensions"][0].pop("increment")
+    yield doc, KeyError, "`increment` key from the LinearDimension object."
+
+    doc = document()
+    doc["csdm"]["dimensions"][0]["count"] = "4"
+    yield doc, TypeError, "Expecting an instance of type `int` for count"
+
+    doc = document()
+    doc["csdm"]["dependent_variables"][0]["type"] = "sparse"
+    yield doc, ValueError, "The value, 'sparse', is an invalid `type`"
+
+    doc = document()
+    doc["csdm"]["dependent_variables"][1]["encoding"] = "raw"
+    yield doc, KeyError, "The `encoding` key is invalid for DependentVariable"
+
+    doc = document()
+    doc["csdm"]["dependent_variables"][1].pop("components_url")
+    yield doc, KeyError, "`components_url` key from the DependentVariable object"
+
+    doc = document()
+    doc["csdm"]["dependent_variables"][0]["sparse_sampling"] = {
+        "dimension_indexes": [0],
+        "sparse_grid_vertexes": [0, 1],
+        "unsigned_integer_type": "int8",
+    }
+    yield doc, ValueError, "int8 is an invalid `unsigned_integer_type` enumeration"
+
+
+def test_validate_document():
+    validate_document(document())
+
+    for doc, error, message in invalid_documents():
+        with pytest.raises(error, match=message):
+            validate_document(doc)
+        # the errors are the same as on parsing the document.
+        with pytest.raises(error, match=message):
+            cp.parse_dict(doc)
+
+
+def test_validate_object():
+    # the objects created outside of a document are checked on instantiation.
+    error = "Missing a required `labels` key from the LabeledDimension object."
+    with pytest.raises(KeyError, match=error):
+        cp.Dimension(type="labeled")
+
+    error = "Expecting an instance of type `int` for count"
+    with pytest.raises(TypeError, match=error):
+        cp.Dimension(type="linear", count=2.0, increment="1 s")
+
+    error = "key from the DependentVariable object of type, `internal`."
+    with pytest.raises(KeyError, match=error):
+        cp.DependentVariable(type="internal", quantity_type="scalar")
+
+    # the checks are not skipped from the public constructors.
+    with pytest.raises(KeyError, match="Missing a required `labels` key"):
+        cp.Dimension(type="labeled", validated=True)
+    with pytest.raises(KeyError, match=error):
+        cp.DependentVariable(type="internal", quantity_type="scalar", validated=True)
+
+
+def test_validate_file(tmp_path):
+    filename = str(tmp_path / "test.csdf")
+    with open(filename, "w") as f:
+        json.dump(document(), f)
+
+    # the missing components file of the external dependent variable is not read.
+    cp.validate_file(filename)
+    cp.validate_file(filename, json_backend="json")
+
+    for i, (doc, error, message) in enumerate(invalid_documents()):
+        filename = str(tmp_path / f"invalid_{i}.csdf")
+        with open(filename, "w") as f:
+            json.dump(doc, f)
+        with pytest.raises(error, match=message):
+            cp.validate_file(filename)
+
+    data = cp.as_csdm(np.arange(20.0).reshape(4, 5))
+    data.y[0].encoding = "raw"
+    for extension in [".csdf", ".csdfe", ".csdfb"]:
+        filename = str(tmp_path / f"data{extension}")
+        data.save(filename)
+        cp.validate_file(filename)
+
+    # the components of the `.csdfe` file are not read.
+    os.remove(str(tmp_path / "data_0.dat"))
+    cp.validate_file(str(tmp_path / "data.csdfe"))
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import zipfile
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+
+
+def make_files(tmp_path):
+    data = cp.as_csdm(np.arange(12.0).reshape(3, 4))
+    data.y[0].encoding = "raw"
+    data.save(str(tmp_path / "data.csdfe"))
+    data.save(str(tmp_path / "data.csdfb"))
+    data.y[0].encoding = "base64"
+    data.save(str(tmp_path / "data.csdf"))
+
+    for name, compression in [("stored", zipfile.ZIP_STORED), ("deflated", 8)]:
+        with zipfile.ZipFile(str(tmp_path / f"{name}.zip"), "w", compression) as f:
+            f.write(str(tmp_path / "data.csdfe"), "bundle/data.csdfe")
+            f.write(str(tmp_path / "data_0.dat"), "bundle/data_0.dat")
+            f.writestr("bundle/readme.txt", "a bundle")
+    return data
+
+
+def read(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def test_load_buffers(tmp_path):
+    data = make_files(tmp_path)
+    for extension in [".csdf", ".csdfb"]:
+        content = read(str(tmp_path / f"data{extension}"))
+        for source in [content, bytearray(content), io.BytesIO(content)]:
+            new = cp.load(source)
+            assert np.array_equal(new.y[0].components, data.y[0].components)
+            assert new.filename is None
+
+    content = read(str(tmp_path / "data.csdf"))
+    new = cp.load(io.StringIO(content.decode("utf-8")), lazy=True)
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+
+    header = cp.load(content, components=False)
+    assert header.y[0].shape == (1, 3, 4)
+    cp.validate_file(content)
+
+    error = "The `member` argument is only valid for the zip archives."
+    with pytest.raises(ValueError, match=error):
+        cp.load(content, member="data.csdf")
+
+    # the JSON documents in a memoryview are parsed without copies.
+    for extension in [".csdf", ".csdfb"]:
+        content = read(str(tmp_path / f"data{extension}"))
+        new = cp.load(memoryview(content)[:])
+        assert np.array_equal(new.y[0].components, data.y[0].components)
+    content = read(str(tmp_path / "data.csdf"))
+    new = cp.parse_dict(cp.streaming.parse_json(memoryview(content)))
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+
+    for source in [123, [content]]:
+        with pytest.raises(TypeError, match="is not supported"):
+            cp.load(source)
+    with pytest.raises(TypeError, match="A source of type `int` is not supported"):
+        cp.validate_file(123)
+
+
+def test_load_archives(tmp_path):
+    data = make_files(tmp_path)
+    for name in ["stored", "deflated"]:
+        filename = str(tmp_path / f"{name}.zip")
+        sources = [
+            lambda: filename,
+            lambda: read(filename),
+            lambda: io.BytesIO(read(filename)),
+            lambda: open(filename, "rb"),
+            lambda: zipfile.ZipFile(filename),
+        ]
+        for source in sources:
+            for kwargs in [{}, {"mmap": True}, {"lazy": True}, {"verify": "full"}]:
+                new = cp.load(source(), **kwargs)
+                assert np.array_equal(new.y[0].components, data.y[0].components)
+                assert str(new.filename).endswith("bundle/data.csdfe")
+        cp.validate_file(filename)
+
+    # the external components of the stored members are views of the archive.
+    content = bytearray(read(str(tmp_path / "stored.zip")))
+    components = cp.load(content).y[0].components
+    assert np.shares_memory(components, np.frombuffer(content, dtype=np.uint8))
+
+    new = cp.load(str(tmp_path / "stored.zip"), mmap=True)
+    base = new.y[0].components.base
+    while isinstance(base, np.ndarray) and base.base is not None:
+        base = base.base
+    assert isinstance(base.obj, np.memmap)
+
+
+def test_archive_members(tmp_path):
+    make_files(tmp_path)
+    filename = str(tmp_path / "many.zip")
+    with zipfile.ZipFile(filename, "w") as f:
+        f.write(str(tmp_path / "data.csdf"), "a/data.csdf")
+        f.write(str(tmp_path / "data.csdfe"), "b/data.csdfe")
+        f.write(str(tmp_path / "data.csdfe"), "c/data.csdfe")
+        f.write(str(tmp_path / "data_0.dat"), "b/data_0.dat")
+
+    error = "Found 3 .csdf/.csdfe/.csdfb files in the archive."
+    with pytest.raises(ValueError, match=error):
+        cp.load(filename)
+
+    assert cp.load(filename, member="a/data.csdf").y[0].shape == (1, 3, 4)
+    assert cp.load(filename, member="b/data.csdfe").y[0].shape == (1, 3, 4)
+
+    error = "The components file, `c/data_0.dat`, is not a member of the archive"
+    with pytest.raises(FileNotFoundError, match=error):
+        cp.load(filename, member="c/data.csdfe")
+
+    error = "`d/data.csdf` is not a member of the archive."
+    with pytest.raises(FileNotFoundError, match=error):
+        cp.load(filename, member="d/data.csdf")
+
+    os.remove(str(tmp_path / "data_0.dat"))
+    assert cp.load(filename, member="b/data.csdfe").y[0].shape == (1, 3, 4)
+
+
+def test_close_archives(tmp_path):
+    data = make_files(tmp_path)
+    filename = str(tmp_path / "stored.zip")
+
+    # the archives opened on load are closed once the components are read.
+    for kwargs in [{}, {"mmap": True}, {"components": False}]:
+        new = cp.load(filename, **kwargs)
+        assert new.filename.archive.fp is None
+    assert np.array_equal(new.y[0].shape, data.y[0].shape)
+
+    # the lazy components are read from the open archive later.
+    new = cp.load(filename, lazy=True)
+    assert new.filename.archive.fp is not None
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+
+    # the archives of the caller are not closed.
+    with zipfile.ZipFile(filename) as archive:
+        new = cp.load(archive)
+        assert archive.fp is not None
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
+import base64
+
 import numpy as np
 import pytest
 
+import csdmpy as cp
 from csdmpy.dependent_variables import check_sparse_sampling_key_value
+from csdmpy.dependent_variables.sparse import SparseComponents
 from csdmpy.dependent_variables.sparse import SparseSampling
 
 sparse_sampling = {
@@ -71,3 +75,136 @@ def test_06():
     sp2 = SparseSampling(**sparse_sampling)
 
     assert sp1 == sp2
+
+
+def sparse_2d():
+    # a 2D{2} dataset sampled along the dimensions 0 and 2 of a (6, 5, 4) grid.
+    vertexes = np.array([[0, 1], [3, 0], [5, 3]])
+    components = np.arange(2 * 3 * 5, dtype=np.float64).reshape(2, 15) + 1
+    csdm = cp.parse_dict(
+        {
+            "csdm": {
+                "version": "1.0",
+                "dimensions": [
+                    {"type": "linear", "count": n, "increment": "1"} for n in (6, 5, 4)
+                ],
+                "dependent_variables": [
+                    {
+                        "type": "internal",
+                        "numeric_type": "float64",
+                        "quantity_type": "vector_2",
+                        "components": components.tolist(),
+                        "sparse_sampling": {
+                            "dimension_indexes": [0, 2],
+                            "sparse_grid_vertexes": vertexes.ravel().tolist(),
+                        },
+                    }
+                ],
+            }
+        }
+    )
+
+    # the components fill the sampled vertexes of the grid in the numpy order of
+    # advanced indexing, with the axis of the vertexes first.
+    dense = np.zeros((2, 4, 5, 6))
+    dense[:, vertexes[:, 1], :, vertexes[:, 0]] = components.reshape(3, 2, 5)
+    return csdm, dense
+
+
+def test_sparse_components():
+    csdm, dense = sparse_2d()
+    components = csdm.y[0].components
+    assert isinstance(components, SparseComponents)
+    assert components.shape == dense.shape
+    assert components.nnz == 30
+    assert np.array_equal(components.todense(), dense)
+    assert np.array_equal(np.asarray(components), dense)
+
+    # the zero preserving operations keep the compact format
+    for item in [2 * components, components * np.arange(6), -abs(components)]:
+        assert isinstance(item, SparseComponents)
+    assert np.array_equal(np.asarray(components * np.arange(6)), dense * np.arange(6))
+    assert np.array_equal(components + 1, dense + 1)
+    components *= 2
+    assert np.array_equal(np.asarray(components), 2 * dense)
+    components /= 2
+
+    for axis in [None, 1, (1, 3), (2, 3), -1]:
+        for function in [np.sum, np.mean]:
+            result = np.asarray(function(components, axis=axis))
+            assert np.allclose(result, function(dense, axis=axis))
+    assert np.array_equal(np.asarray(components.T), dense.T)
+
+    for key in [(0,), (slice(None), 3), (1, slice(None, None, -1), 2, slice(1, 4))]:
+        assert np.array_equal(np.asarray(components[key]), dense[key])
+
+    with pytest.raises(TypeError, match="do not support item assignment"):
+        components[0, 0] = 1
+
+
+def test_sparse_csdm():
+    csdm, dense = sparse_2d()
+    new = 2 * csdm
+    assert isinstance(new.y[0].components, SparseComponents)
+    assert np.array_equal(np.asarray(new.y[0].components), 2 * dense)
+
+    new = csdm.sum(axis=0)
+    assert isinstance(new.y[0].components, SparseComponents)
+    assert np.array_equal(np.asarray(new.y[0].components), dense.sum(axis=-1))
+
+    new = csdm[1:4, :, 1]
+    assert np.array_equal(np.asarray(new.y[0].components), dense[:, 1, :, 1:4])
+    transpose = dense.transpose(0, 3, 2, 1)
+    assert np.array_equal(np.asarray(csdm.T.y[0].components), transpose)
+
+    # an assignment densifies the components
+    csdm[0] = 10
+    dense[..., 0] = 10
+    assert isinstance(csdm.y[0].components, np.ndarray)
+    assert np.array_equal(csdm.y[0].components, dense)
+
+
+def test_sparse_serialization(tmp_path):
+    csdm, dense = sparse_2d()
+    for encoding, extension in [
+        ("none", ".csdf"),
+        ("base64", ".csdf"),
+        ("raw", ".csdfe"),
+        ("raw", ".csdfb"),
+    ]:
+        csdm.y[0].encoding = encoding
+        filename = str(tmp_path / f"sparse_{encoding}{extension}")
+        csdm.save(filename)
+        for kwargs in [{}, {"lazy": True}]:
+            new = cp.load(filename, **kwargs)
+            assert isinstance(new.y[0].components, SparseComponents)
+            assert np.array_equal(new.y[0].components.todense(), dense)
+            assert new.y[0].subtype._sparse_sampling.dimension_indexes == [0, 2]
+
+    # only the sampled values are written
+    csdm.y[0].encoding = "none"
+    dictionary = csdm.y[0].subtype.dict()
+    assert np.array(dictionary["components"]).size == 30
+    assert dictionary["sparse_sampling"] == {
+        "dimension_indexes": [0, 2],
+        "sparse_grid_vertexes": [0, 1, 3, 0, 5, 3],
+    }
+
+    # the vertexes are encoded with the declared encoding and unsigned integer type
+    vertexes = np.array([1, 0, 0, 3, 3, 5], dtype="uint16")
+    csdm.y[0].subtype._sparse_sampling = SparseSampling(
+        dimension_indexes=[2, 0],
+        sparse_grid_vertexes=base64.b64encode(vertexes).decode(),
+        encoding="base64",
+        unsigned_integer_type="uint16",
+    )
+    sparse_sampling = csdm.y[0].subtype.dict()["sparse_sampling"]
+    assert sparse_sampling["dimension_indexes"] == [2, 0]
+    assert sparse_sampling["unsigned_integer_type"] == "uint16"
+    decoded = SparseSampling(**sparse_sampling).sparse_grid_vertexes.ravel()
+    assert np.array_equal(decoded, vertexes)
+
+    # a slice of the sparse dataset is written as sparse
+    filename = str(tmp_path / "slice.csdf")
+    csdm[2:].save(filename)
+    assert np.array_equal(cp.load(filename).y[0].components.todense(), dense[..., 2:])
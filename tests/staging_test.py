@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import os
+import stat
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+from csdmpy import csdm
+from csdmpy.staging import Staging
+
+
+def read(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+def test_staging(tmp_path):
+    filename = str(tmp_path / "file.txt")
+    with Staging() as staging:
+        with staging.open(filename, "w", encoding="utf8") as f:
+            f.write("new")
+        assert not os.path.exists(filename)
+    assert read(filename) == b"new"
+
+    os.chmod(filename, 0o640)
+    with pytest.raises(RuntimeError):
+        with Staging() as staging:
+            with staging.open(filename) as f:
+                f.write(b"partial")
+            raise RuntimeError
+    assert read(filename) == b"new"
+    assert os.listdir(str(tmp_path)) == ["file.txt"]
+
+    with Staging() as staging:
+        with staging.open(filename) as f:
+            f.write(b"newer")
+    assert read(filename) == b"newer"
+    assert stat.S_IMODE(os.stat(filename).st_mode) == 0o640
+
+
+def test_staging_permissions(tmp_path):
+    umask = os.umask(0o027)
+    try:
+        with Staging() as staging:
+            with staging.open(str(tmp_path / "new.dat")) as f:
+                f.write(b"new")
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat(str(tmp_path / "new.dat")).st_mode) == 0o640
+
+
+def test_staging_failed_commit(tmp_path, monkeypatch):
+    replace = os.replace
+
+    def fail(source, destination):
+        if destination.endswith("header.csdfe"):
+            raise OSError("rename failed")
+        replace(source, destination)
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError, match="rename failed"):
+        with Staging() as staging:
+            for name in ["data_0.dat", "data_1.dat", "header.csdfe"]:
+                with staging.open(str(tmp_path / name)) as f:
+                    f.write(b"new")
+
+    # the renamed files are kept and the staged files are removed.
+    assert sorted(os.listdir(str(tmp_path))) == ["data_0.dat", "data_1.dat"]
+
+
+@pytest.mark.parametrize(
+    "name, compression",
+    [("data.csdfe", None), ("data.csdfe", "zlib"), ("data.csdfb", None)],
+)
+def test_atomic_save(tmp_path, monkeypatch, name, compression):
+    filename = str(tmp_path / name)
+    data = cp.as_csdm(np.arange(12.0).reshape(3, 4))
+    data.y[0].encoding = "raw"
+    data.save(filename, compression=compression)
+    assert not [item for item in os.listdir(str(tmp_path)) if item.endswith(".part")]
+
+    new = cp.load(filename, verify="full")
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+
+    # a failed save leaves the previous files untouched, without temporary files.
+    files = {item: read(str(tmp_path / item)) for item in os.listdir(str(tmp_path))}
+    data.y[0].components *= 2
+
+    def fail(dictionary, dependent_variables, outfile, **kwargs):
+        outfile.write(b"{" if "b" in outfile.mode else "{")
+        raise OSError("No space left on device")
+
+    # the header fails after the binary files are written.
+    monkeypatch.setattr(csdm, "dump_json", fail)
+    monkeypatch.setattr(csdm, "dump_container", fail)
+    with pytest.raises(OSError, match="No space left on device"):
+        data.save(filename, compression=compression)
+    monkeypatch.undo()
+    current = {item: read(str(tmp_path / item)) for item in os.listdir(str(tmp_path))}
+    assert current == files
+
+    data.save(filename, compression=compression)
+    new = cp.load(filename, verify="full")
+    assert np.array_equal(new.y[0].components, data.y[0].components)
+    assert sorted(os.listdir(str(tmp_path))) == sorted(files)
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import json
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+import csdmpy.dependent_variables.decoder as decoder
+import csdmpy.streaming as streaming
+from csdmpy.streaming import load_json
+
+numeric_types = ["uint8", "int16", "int64", "float32", "float64", "complex128"]
+
+
+def make_dataset(numeric_type, quantity_type, p, encoding):
+    components = (np.arange(20 * p) * 1.5).astype(numeric_type).reshape(p, 20)
+    if components.dtype.kind == "c":
+        components += 1j * np.arange(20 * p).reshape(p, 20)
+    data = cp.new(description='"components": [[1, 2]]')
+    data.add_dimension(cp.LinearDimension(count=5, increment="1"))
+    data.add_dimension(cp.LinearDimension(count=4, increment="1"))
+    data.add_dependent_variable(
+        type="internal",
+        components=components,
+        quantity_type=quantity_type,
+        application={"com.example": {"components": [[0, 1], [2, 3]]}},
+    )
+    data.dependent_variables[0].encoding = encoding
+    return data, components
+
+
+@pytest.mark.parametrize("numeric_type", numeric_types)
+@pytest.mark.parametrize("encoding", ["none", "base64"])
+@pytest.mark.parametrize("quantity_type, p", [("scalar", 1), ("vector_3", 3)])
+def test_load_json(tmp_path, numeric_type, encoding, quantity_type, p):
+    data, components = make_dataset(numeric_type, quantity_type, p, encoding)
+    filename = str(tmp_path / "stream.csdf")
+    data.save(filename, indent=2)
+
+    dictionary = load_json(filename)
+    with open(filename, "rb") as f:
+        expected = json.loads(f.read())
+
+    variable = dictionary["csdm"]["dependent_variables"][0]
+    expected_variable = expected["csdm"]["dependent_variables"][0]
+    assert isinstance(variable["components"], np.ndarray)
+    assert variable["components"].dtype == components.dtype
+    assert np.array_equal(variable["components"], components)
+
+    del variable["components"], expected_variable["components"]
+    assert dictionary == expected
+
+    new_data = cp.load(filename)
+    assert np.array_equal(
+        new_data.dependent_variables[0].components, components.reshape(p, 4, 5)
+    )
+
+
+@pytest.mark.parametrize("encoding", ["none", "base64"])
+def test_load_json_small_chunks(tmp_path, encoding, monkeypatch):
+    filename = str(tmp_path / "stream_chunks.csdf")
+    monkeypatch.setattr(streaming, "CHUNK_SIZE", 7)
+    monkeypatch.setattr(decoder, "CHUNK_SIZE", 8)
+    data, components = make_dataset("float64", "vector_3", 3, encoding)
+    data.save(filename)
+
+    dictionary = load_json(filename)
+    variable = dictionary["csdm"]["dependent_variables"][0]
+    assert np.array_equal(variable["components"], components)
+
+
+def test_load_json_fallback(tmp_path):
+    filename = str(tmp_path / "stream_fallback.csdf")
+    dictionary = {
+        "csdm": {
+            "version": "1.0",
+            "dimensions": [{"type": "linear", "count": 3, "increment": "1"}],
+            "dependent_variables": [
+                {
+                    "type": "internal",
+                    "numeric_type": "int32",
+                    "quantity_type": "scalar",
+                    "components": [[1.0, 2.0, 3.0]],
+                }
+            ],
+        }
+    }
+    with open(filename, "w") as f:
+        json.dump(dictionary, f)
+
+    data = cp.load(filename)
+    assert data.dependent_variables[0].numeric_type == "int32"
+    assert np.array_equal(data.dependent_variables[0].components, [[1, 2, 3]])
+
+    # the number of components is validated by the DependentVariable object.
+    dictionary["csdm"]["dependent_variables"][0]["quantity_type"] = "vector_2"
+    with open(filename, "w") as f:
+        json.dump(dictionary, f)
+
+    error = "requires exactly 2 component"
+    with pytest.raises(Exception, match=".*{0}.*".format(error)):
+        cp.load(filename)
+
+
+def test_load_json_without_components(tmp_path):
+    filename = str(tmp_path / "stream_skip.csdf")
+    data, _ = make_dataset("float32", "vector_3", 3, "base64")
+    data.save(filename)
+
+    dictionary = load_json(filename, components=False)
+    variable = dictionary["csdm"]["dependent_variables"][0]
+    assert variable["components"] == [None, None, None]
+
+
+@pytest.mark.parametrize("numeric_type", numeric_types)
+@pytest.mark.parametrize("encoding", ["none", "base64"])
+@pytest.mark.parametrize("indent", [0, 2])
+def test_dump_json(tmp_path, numeric_type, encoding, indent, monkeypatch):
+    filename = str(tmp_path / "stream_dump.csdfe")
+    monkeypatch.setattr(streaming, "WRITE_CHUNK_SIZE", 6)
+    data, _ = make_dataset(numeric_type, "vector_3", 3, encoding)
+    data.add_dependent_variable(
+        type="internal", components=np.arange(20.0), quantity_type="scalar"
+    )
+    data.dependent_variables[1].encoding = "raw"
+    data.save(filename, indent=indent)
+
+    with open(filename, "rb") as f:
+        saved = json.loads(f.read())
+    expected = data._dict(filename=filename)
+    del saved["csdm"]["timestamp"]
+    expected["csdm"]["dependent_variables"][1] = saved["csdm"]["dependent_variables"][1]
+    assert saved == expected
+
+
+def test_dump_json_not_finite(tmp_path):
+    filename = str(tmp_path / "stream_nan.csdf")
+    data = cp.as_csdm(np.asarray([1.0, np.nan, 2.0]))
+    data.dependent_variables[0].encoding = "none"
+    error = "Out of range float values are not JSON compliant"
+    with pytest.raises(ValueError, match=".*{0}.*".format(error)):
+        data.save(filename)
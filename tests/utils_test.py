@@ -4,6 +4,7 @@ import pytest
 from csdmpy.utils import check_and_assign_bool
 from csdmpy.utils import check_encoding
 from csdmpy.utils import NumericType
+from csdmpy.utils import parallel_map
 from csdmpy.utils import QuantityType
 
 
@@ -84,3 +85,17 @@ def test_boolean():
     error = "Expecting an instance of type"
     with pytest.raises(TypeError, match=".*{0}.*".format(error)):
         check_and_assign_bool("True")
+
+
+def test_parallel_map():
+    items = list(range(20))
+    assert parallel_map(lambda x: x ** 2, items) == [x ** 2 for x in items]
+    assert parallel_map(lambda x: x ** 2, items, 4) == [x ** 2 for x in items]
+
+    error = "The number of workers must be at least 1"
+    with pytest.raises(ValueError, match=".*{0}.*".format(error)):
+        parallel_map(abs, items, 0)
+
+    error = "Expecting an instance of type `int` for workers"
+    with pytest.raises(TypeError, match=".*{0}.*".format(error)):
+        parallel_map(abs, items, 2.0)
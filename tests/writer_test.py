@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import os
+
+import numpy as np
+import pytest
+
+import csdmpy as cp
+
+
+def make_writer(filename):
+    inner = cp.LinearDimension(count=16, increment="0.5")
+    outer = {"type": "linear", "count": 100, "increment": "2", "label": "time"}
+    variables = [
+        {"quantity_type": "scalar", "numeric_type": "float32", "name": "real"},
+        cp.DependentVariable(
+            type="internal",
+            quantity_type="scalar",
+            numeric_type="complex64",
+            components=np.zeros(3),
+        ),
+    ]
+    return cp.CSDMWriter(filename, [inner, outer], variables, description="live")
+
+
+def test_append_and_load_in_progress(tmp_path):
+    filename = str(tmp_path / "live.csdfe")
+    frames = np.arange(5 * 16).reshape(5, 16)
+    with make_writer(filename) as writer:
+        # the header with no frames is written before the data files.
+        assert cp.load(filename, mmap=True).shape == (16, 0)
+        for i, frame in enumerate(frames):
+            writer.append(frame, frame * 1j)
+
+            # the file holds the frames appended so far
+            data = cp.load(filename)
+            assert data.shape == (16, i + 1)
+            assert data.x[1].label == "time"
+            assert np.array_equal(data.y[0].components[0], frames[: i + 1])
+            assert np.array_equal(data.y[1].components[0], frames[: i + 1] * 1j)
+
+        # a partially written frame is ignored while the file is in progress.
+        file = writer._files[0].file
+        file.write(b"\x00\x01")
+        file.flush()
+        for kwargs in [{}, {"mmap": True}, {"verify": "full"}]:
+            assert cp.load(filename, **kwargs).shape == (16, 5)
+        file.truncate(5 * 16 * 4)
+        file.seek(0, os.SEEK_END)
+
+    assert writer.closed
+    data = cp.load(filename, verify="full")
+    assert data.description == "live"
+    assert data.y[0].name == "real"
+    assert data.y[0].numeric_type == "float32"
+    assert np.array_equal(data.y[1].components[0], frames * 1j)
+    assert sorted(os.listdir(tmp_path)) == ["live.csdfe", "live_0.dat", "live_1.dat"]
+
+    lazy = cp.load(filename, lazy=True)
+    assert np.array_equal(lazy[:, 3].y[0].components[0], frames[3])
+
+    with pytest.raises(ValueError, match="closed"):
+        writer.append(frames[0], frames[0])
+
+    # a truncated data file of a complete file is an error.
+    with open(str(tmp_path / "live_0.dat"), "r+b") as f:
+        f.truncate(5 * 16 * 4 - 2)
+    with pytest.raises(ValueError, match="multiple of element size"):
+        cp.load(filename)
+    with pytest.raises(ValueError, match="is not equal to the recorded size"):
+        cp.load(filename, verify="size")
+
+
+def test_rewrite(tmp_path):
+    filename = str(tmp_path / "live.csdfe")
+    with make_writer(filename) as writer:
+        for _ in range(3):
+            writer.append(np.ones(16), np.ones(16))
+
+    # the previous file is replaced by the header with no frames, before the data
+    # files are truncated.
+    with make_writer(filename) as writer:
+        assert cp.load(filename).shape == (16, 0)
+        writer.append(np.zeros(16), np.zeros(16))
+    data = cp.load(filename, verify="full")
+    assert np.array_equal(data.y[0].components, np.zeros((1, 1, 16)))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+
+def test_invalid_arguments(tmp_path):
+    filename = str(tmp_path / "live.csdfe")
+    with make_writer(filename) as writer:
+        with pytest.raises(ValueError, match="Expecting 2 arrays"):
+            writer.append(np.zeros(16))
+        with pytest.raises(ValueError, match="size of the frame"):
+            writer.append(np.zeros(16), np.zeros(15))
+        assert writer.count == 0
+
+    labeled = cp.as_dimension(["a", "b"])
+    with pytest.raises(ValueError, match="linear dimension"):
+        cp.CSDMWriter(filename, [labeled], [{"quantity_type": "scalar"}])
+
+    variable = {"quantity_type": "vector_2", "numeric_type": "float32"}
+    outer = cp.LinearDimension(count=1, increment="1")
+    with pytest.raises(ValueError, match="one component"):
+        cp.CSDMWriter(str(tmp_path / "vector.csdfe"), [outer], [variable])
+    assert not os.path.exists(str(tmp_path / "vector_0.dat"))